@@ -0,0 +1,20 @@
+"""Service notifications to users through the bot."""
+
+from aiogram.exceptions import TelegramAPIError
+from loguru import logger
+
+from app.publisher.telegram_bot import get_publish_bot
+
+
+async def notify_user(telegram_id: int, text: str) -> bool:
+    """Send a notification to a user's private chat with the bot.
+
+    Returns:
+        True if the message was delivered
+    """
+    try:
+        await get_publish_bot().send_message(chat_id=telegram_id, text=text)
+        return True
+    except TelegramAPIError as e:
+        logger.warning(f"Failed to notify user {telegram_id}: {e}")
+        return False
@@ -3,7 +3,7 @@
 from typing import Optional
 
 from aiogram import Router, F
-from aiogram.filters import Command, StateFilter
+from aiogram.filters import Command, CommandObject, StateFilter
 from aiogram.fsm.context import FSMContext
 from aiogram.types import Message, CallbackQuery
 from loguru import logger
@@ -14,7 +14,14 @@ from app.adminbot.states import (
     AddSourceStates,
     BindingStates,
 )
-from app.db.models import User, SourceType
+from app.config import get_settings
+from app.connectors.telegram_gateway import (
+    ERROR_UNAVAILABLE,
+    TelegramGatewayError,
+    TelegramGatewayUnavailable,
+    get_telegram_gateway,
+)
+from app.db.models import CircuitState, User, SourceType
 from app.db.repo import Repository
 from app.utils.text import extract_channel_username, format_interval, truncate_text
 from app.utils.time import format_datetime, parse_interval
@@ -42,6 +49,40 @@ async def cmd_start(message: Message, current_user: User):
     )
 
 
+@router.message(Command("backfill"))
+async def cmd_backfill(
+    message: Message, command: CommandObject, current_user: User, repo: Repository
+):
+    """Queue historical backfill: /backfill <source_id> [max_items]."""
+    args = (command.args or "").split()
+    if not args or not all(arg.isdigit() for arg in args[:2]):
+        await message.answer(
+            "Використання: /backfill <ID джерела> [максимум записів]"
+        )
+        return
+    
+    source = await repo.get_source(int(args[0]), current_user.id)
+    if not source:
+        await message.answer("❌ Джерело не знайдено")
+        return
+    if source.source_type not in (SourceType.TELEGRAM, SourceType.RSS):
+        await message.answer("❌ Завантаження архіву підтримується лише для Telegram та RSS")
+        return
+    
+    settings = get_settings()
+    max_items = int(args[1]) if len(args) > 1 else settings.backfill_max_items
+    job = await repo.create_backfill_job(
+        owner_user_id=current_user.id,
+        source_id=source.id,
+        max_items=min(max_items, settings.backfill_max_items),
+    )
+    await message.answer(
+        f"📚 Завантаження архіву поставлено в чергу (завдання {job.id}).\n\n"
+        f"Максимум записів: {job.max_items}\n"
+        "Архівні записи не переписуються і не публікуються."
+    )
+
+
 @router.callback_query(F.data == "menu:main")
 async def menu_main(callback: CallbackQuery):
     """Show main menu."""
@@ -363,13 +404,32 @@ async def source_add_handle(
         )
         return
     
+    # Check the channel through the worker's Telegram gateway when it is running
+    title = f"@{handle}"
+    telegram_id = None
+    try:
+        channel = await get_telegram_gateway().resolve(handle)
+        title = channel.get("title") or title
+        telegram_id = channel.get("telegram_id")
+    except TelegramGatewayUnavailable as e:
+        logger.warning(f"Cannot check @{handle}: {e}")
+    except TelegramGatewayError as e:
+        if e.kind == ERROR_UNAVAILABLE:
+            await message.answer(
+                f"❌ Канал @{handle} не знайдено. Перевірте username і спробуйте ще раз.",
+                reply_markup=kb.cancel_keyboard("menu:sources"),
+            )
+            return
+        logger.warning(f"Cannot check @{handle}: {e}")
+    
     try:
         # Create source
         source = await repo.create_source(
             owner_user_id=current_user.id,
             source_type=SourceType.TELEGRAM,
             handle=handle,
-            title=f"@{handle}",
+            title=truncate_text(title, 50),
+            telegram_id=telegram_id,
         )
         
         await message.answer(
@@ -478,6 +538,20 @@ async def source_view(callback: CallbackQuery, current_user: User, repo: Reposit
     type_emoji = {"telegram": "📱", "rss": "📡", "website": "🌐"}.get(
         source.source_type.value, "📄"
     )
+    if source.circuit_state == CircuitState.QUARANTINED:
+        status = "🚫 Вимкнено через помилки"
+    elif source.circuit_state == CircuitState.OPEN:
+        status += f" (⚠️ {source.failure_count} помилок поспіль)"
+    if source.failure_count and source.last_error:
+        # Legacy Markdown has no escaping; drop its control characters
+        error = truncate_text(source.last_error, 80).translate(str.maketrans("", "", "_*`["))
+        status += f"\n❗ Остання помилка: {error}"
+    adaptive = ""
+    if source.poll_interval_seconds:
+        adaptive = (
+            f"⚡ Адаптивний інтервал: "
+            f"{format_interval(max(1, round(source.poll_interval_seconds / 60)))}\n"
+        )
     
     text = f"""
 {type_emoji} **{source.title or 'Без назви'}**
@@ -488,7 +562,7 @@ async def source_view(callback: CallbackQuery, current_user: User, repo: Reposit
 
 🔄 Статус: {status}
 ⏱ Інтервал перевірки: {format_interval(source.check_interval_minutes)}
-📅 Остання перевірка: {format_datetime(source.last_checked_at)}
+{adaptive}📅 Остання перевірка: {format_datetime(source.last_checked_at)}
 
 🔗 Зв'язків з каналами: {len(bindings)}
 """
@@ -512,7 +586,18 @@ async def source_toggle(callback: CallbackQuery, current_user: User, repo: Repos
         return
     
     new_status = not source.is_active
-    await repo.update_source(source_id, current_user.id, is_active=new_status)
+    if new_status:
+        # Re-enabling (also after quarantine) starts with a clean failure record
+        await repo.update_source(
+            source_id,
+            current_user.id,
+            is_active=True,
+            circuit_state=CircuitState.CLOSED,
+            failure_count=0,
+            next_retry_at=None,
+        )
+    else:
+        await repo.update_source(source_id, current_user.id, is_active=False)
     
     status_text = "увімкнено ✅" if new_status else "вимкнено ⏸️"
     await callback.answer(f"Джерело {status_text}")
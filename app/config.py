@@ -53,6 +53,271 @@ class Settings(BaseSettings):
     rq_queue_rewrite: str = Field(default="rewrite", description="RQ queue name for rewriting")
     rq_queue_publish: str = Field(default="publish", description="RQ queue name for publishing")
 
+    # Ingestion Configuration
+    ingest_rss_concurrency: int = Field(
+        default=20,
+        description="Maximum number of RSS/website sources ingested in parallel"
+    )
+    ingest_telegram_concurrency: int = Field(
+        default=3,
+        description="Maximum number of Telegram sources ingested in parallel"
+    )
+    ingest_source_timeout_seconds: float = Field(
+        default=120.0,
+        description="Hard time limit for ingesting a single source"
+    )
+    rss_streaming_enabled: bool = Field(
+        default=True,
+        description="Parse feeds incrementally and stop at the last known entry"
+    )
+    rss_stream_known_ids: int = Field(
+        default=100,
+        description="How many recent entry IDs the streaming parser compares against"
+    )
+    rss_stream_max_entries: int = Field(
+        default=200,
+        description="Maximum new entries taken from one feed fetch"
+    )
+    website_fetch_concurrency: int = Field(
+        default=4,
+        description="Parallel page fetches per website source"
+    )
+    website_max_pages_per_tick: int = Field(
+        default=20,
+        description="Maximum article pages fetched from one website per tick"
+    )
+    website_max_page_kb: int = Field(
+        default=2048,
+        description="Article pages larger than this are skipped"
+    )
+    website_max_sitemaps: int = Field(
+        default=5,
+        description="Maximum child sitemaps of a sitemap index read per tick"
+    )
+    website_seen_urls: int = Field(
+        default=5000,
+        description="How many already seen article URLs the crawl frontier remembers"
+    )
+    website_tracked_sitemaps: int = Field(
+        default=1000,
+        description="How many child sitemaps (lastmod and HTTP validators) the crawl state remembers"
+    )
+    website_rediscover_hours: int = Field(
+        default=24,
+        description="How often robots.txt and sitemap locations are re-checked"
+    )
+    tg_pool_session_paths: str = Field(
+        default="",
+        description="Comma-separated session files of extra Telegram accounts that share polling"
+    )
+    tg_account_ring_replicas: int = Field(
+        default=64,
+        description="Virtual nodes per Telegram account on the source assignment hash ring"
+    )
+    tg_gateway_enabled: bool = Field(
+        default=True,
+        description="Serve Telegram requests of other processes from the worker"
+    )
+    tg_gateway_socket: str = Field(
+        default=".tg_session/gateway.sock",
+        description="Unix socket of the Telegram gateway (shared with the bot container)"
+    )
+    tg_gateway_timeout_seconds: float = Field(
+        default=120,
+        description="How long gateway clients wait for a response"
+    )
+    tg_catchup_max_messages: int = Field(
+        default=500,
+        description="Maximum Telegram messages read per source per tick when catching up"
+    )
+    tg_push_enabled: bool = Field(
+        default=True,
+        description="Ingest joined Telegram channels through update events"
+    )
+    tg_push_refresh_minutes: int = Field(
+        default=15,
+        description="How often the set of push-ingested channels is refreshed"
+    )
+    tg_push_safety_poll_minutes: int = Field(
+        default=360,
+        description="Polling interval kept as a safety net for push-ingested channels"
+    )
+    tg_resolve_requests_per_minute: float = Field(
+        default=20,
+        description="Rate limit of Telegram entity resolution and dialog requests"
+    )
+    tg_history_requests_per_minute: float = Field(
+        default=60,
+        description="Rate limit of Telegram history requests (100 messages each)"
+    )
+    tg_media_requests_per_minute: float = Field(
+        default=30,
+        description="Rate limit of Telegram media downloads"
+    )
+    tg_request_burst: int = Field(
+        default=5,
+        description="Telegram requests of one kind allowed at once after being idle"
+    )
+    tg_flood_auto_wait_seconds: int = Field(
+        default=60,
+        description="Longest Telegram FloodWait that is waited out and retried"
+    )
+    ingest_tick_seconds: int = Field(
+        default=60,
+        description="How often the ingestion scheduler checks for due sources"
+    )
+    ingest_full_resync_minutes: int = Field(
+        default=60,
+        description="How often the ingestion scheduler is fully rebuilt from the database"
+    )
+    ingest_sync_overlap_seconds: int = Field(
+        default=300,
+        description="How far back each incremental scheduler sync re-reads updated sources, "
+        "so edits committed by slow transactions are not missed"
+    )
+    source_backoff_max_minutes: int = Field(
+        default=720,
+        description="Upper bound of the retry delay of a failing source"
+    )
+    source_circuit_open_failures: int = Field(
+        default=3,
+        description="Consecutive failures after which a source's circuit is open"
+    )
+    source_quarantine_failures: int = Field(
+        default=10,
+        description="Consecutive failures after which a source is deactivated"
+    )
+    backfill_max_items: int = Field(
+        default=5000,
+        description="Maximum items one backfill job stores"
+    )
+    backfill_batch_size: int = Field(
+        default=200,
+        description="Messages or feed entries stored per backfill batch"
+    )
+    backfill_request_delay_seconds: float = Field(
+        default=1.5,
+        description="Pause between backfill API requests and batches"
+    )
+    backfill_run_budget_seconds: int = Field(
+        default=240,
+        description="Time a backfill job runs before yielding until the next run"
+    )
+    backfill_download_media: bool = Field(
+        default=False,
+        description="Download media of backfilled Telegram messages"
+    )
+    dedup_index_path: str = Field(
+        default="media_storage/.dedup_index",
+        description="Memory-mapped file of the recent content hash index"
+    )
+    dedup_index_capacity: int = Field(
+        default=200000,
+        description="Content hashes per index generation (two generations are kept)"
+    )
+    dedup_index_error_rate: float = Field(
+        default=0.001,
+        description="False positive rate of the content hash index (hits are confirmed in the DB)"
+    )
+    dedup_warmup_days: int = Field(
+        default=7,
+        description="Days of content hashes loaded when the index file is created"
+    )
+    dedup_lookback_days: int = Field(
+        default=30,
+        description="Only messages stored within this many days count as earlier duplicates"
+    )
+    near_dup_enabled: bool = Field(
+        default=True,
+        description="Skip messages that nearly repeat a recent message of the same owner"
+    )
+    near_dup_threshold: float = Field(
+        default=0.8,
+        description="Estimated Jaccard similarity at which a message is a near duplicate"
+    )
+    near_dup_window_hours: int = Field(
+        default=48,
+        description="How long processed messages stay in the near-duplicate index"
+    )
+    near_dup_num_perm: int = Field(
+        default=64,
+        description="MinHash signature length (a multiple of near_dup_bands)"
+    )
+    near_dup_bands: int = Field(
+        default=16,
+        description="LSH bands of a MinHash signature"
+    )
+    near_dup_warmup_limit: int = Field(
+        default=5000,
+        description="Most messages per owner loaded into the near-duplicate index on start"
+    )
+    lang_detect_languages: str = Field(
+        default="uk,ru,en,pl,de,fr,es,it",
+        description="Comma-separated languages the language detector chooses from"
+    )
+    lang_cache_size: int = Field(
+        default=20000,
+        description="Detected languages kept in memory, keyed by content hash"
+    )
+    adaptive_polling_enabled: bool = Field(
+        default=True,
+        description="Adapt each source's check interval to its observed posting rate"
+    )
+    adaptive_poll_min_minutes: int = Field(
+        default=5,
+        description="Shortest adaptive check interval (busy sources)"
+    )
+    adaptive_poll_max_minutes: int = Field(
+        default=120,
+        description="Longest adaptive check interval (quiet sources)"
+    )
+    adaptive_poll_history: int = Field(
+        default=50,
+        description="How many recent publish times the posting rate is learned from"
+    )
+    adaptive_poll_alpha: float = Field(
+        default=0.3,
+        description="EWMA weight of the newest inter-arrival gap"
+    )
+    adaptive_polls_per_gap: float = Field(
+        default=2.0,
+        description="Checks per expected gap between two posts"
+    )
+
+    # HTTP Client Configuration
+    http_pool_limit: int = Field(default=100, description="Total HTTP connection pool size")
+    http_pool_limit_per_host: int = Field(
+        default=8,
+        description="Maximum simultaneous HTTP connections per host"
+    )
+    http_dns_cache_ttl_seconds: int = Field(default=300, description="DNS cache TTL")
+    http_keepalive_timeout_seconds: float = Field(
+        default=60.0,
+        description="How long idle HTTP connections are kept open"
+    )
+    http_default_timeout_seconds: float = Field(
+        default=300.0,
+        description="Default total timeout for HTTP requests"
+    )
+    llm_http_pool_limit: int = Field(
+        default=16,
+        description="Simultaneous connections to the LLM API (separate from the feed pool)"
+    )
+
+    # CPU Executor Configuration
+    cpu_executor_kind: str = Field(
+        default="thread",
+        description="Executor for CPU-bound work: 'thread' or 'process'"
+    )
+    cpu_executor_workers: int = Field(
+        default=0,
+        description="Number of CPU executor workers (0 = automatic)"
+    )
+    loop_lag_warn_ms: int = Field(
+        default=200,
+        description="Log a warning when the event loop is blocked longer than this"
+    )
+
     # Publishing Configuration
     default_publish_interval_minutes: int = Field(
         default=60,
@@ -66,6 +331,19 @@ class Settings(BaseSettings):
         description="Path to media storage directory"
     )
 
+    media_download_concurrency: int = Field(
+        default=4,
+        description="Maximum number of parallel Telegram media downloads"
+    )
+    media_max_file_mb: int = Field(
+        default=50,
+        description="Media larger than this is not downloaded (Bot API upload limit)"
+    )
+    media_photo_target_px: int = Field(
+        default=1280,
+        description="Smallest photo side length (px) considered adequate for publishing"
+    )
+
     @property
     def media_storage_dir(self) -> Path:
         """Get media storage directory as Path object."""
@@ -76,6 +354,21 @@ class Settings(BaseSettings):
         """Get Telegram session directory as Path object."""
         return Path(self.tg_session_path).parent
 
+    @property
+    def tg_gateway_socket_path(self) -> Path:
+        """Get Telegram gateway socket as Path object."""
+        return Path(self.tg_gateway_socket)
+
+    @property
+    def lang_detect_language_codes(self) -> list[str]:
+        """Get languages of the language detector."""
+        return [code.strip() for code in self.lang_detect_languages.split(",") if code.strip()]
+
+    @property
+    def tg_pool_sessions(self) -> list[Path]:
+        """Get session files of extra Telegram accounts."""
+        return [Path(path.strip()) for path in self.tg_pool_session_paths.split(",") if path.strip()]
+
     def __init__(self, **kwargs):
         """Initialize settings and create necessary directories."""
         super().__init__(**kwargs)
@@ -1,2 +1,12 @@
 """Content connectors module."""
 
+
+class SourceUnavailableError(Exception):
+    """Raised when a source cannot be fetched (dead URL, unknown handle, HTTP error)."""
+
+
+class AccountsUnavailableError(SourceUnavailableError):
+    """Raised when no Telegram account can read right now (all rate-limited or disabled).
+
+    Says nothing about the source itself, so it does not count as a source failure.
+    """
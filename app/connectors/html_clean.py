@@ -1,68 +1,198 @@
 """HTML cleaning and text extraction."""
 
-from bs4 import BeautifulSoup
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
 
+from lxml import etree
+from lxml import html as lxml_html
 
-def extract_text_from_html(html: str) -> str:
-    """Extract clean text from HTML."""
-    if not html:
-        return ""
-    
-    soup = BeautifulSoup(html, "lxml")
-    
-    # Remove script and style elements
-    for script in soup(["script", "style", "meta", "link"]):
-        script.decompose()
-    
-    # Get text
-    text = soup.get_text(separator="\n")
-    
-    # Clean up whitespace
+
+# Elements whose content is never text (BeautifulSoup's get_text skips them too)
+_NON_TEXT_TAGS = frozenset({"script", "style", "template"})
+
+# Elements whose content is never part of the readable text
+_SKIP_TAGS = _NON_TEXT_TAGS | {"meta", "link"}
+
+# Page chrome removed before extracting article text
+_CHROME_TAGS = frozenset({"nav", "header", "footer", "aside", "form", "noscript", "iframe", "svg"})
+
+
+@dataclass
+class HtmlExtract:
+    """Text, links and images extracted from one HTML document."""
+
+    text: str = ""
+    links: list[str] = field(default_factory=list)
+    images: list[str] = field(default_factory=list)
+
+
+@dataclass
+class ArticleExtract:
+    """Main content and metadata of an article page."""
+
+    title: str = ""
+    text: str = ""
+    image: Optional[str] = None
+    published: Optional[str] = None  # Raw article:published_time value
+    links: list[str] = field(default_factory=list)
+
+
+def _parse(html: str):
+    """Parse HTML fragment or document into an lxml tree (None if empty)."""
+    try:
+        return lxml_html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        # Empty/whitespace-only input or unsupported encoding declaration
+        try:
+            return lxml_html.document_fromstring(html.encode("utf-8"))
+        except (etree.ParserError, ValueError):
+            return None
+
+
+def _absolute_urls(elements, attribute: str) -> list[str]:
+    """Collect http(s) URLs from an attribute of the given elements."""
+    urls = []
+    for element in elements:
+        value = element.get(attribute)
+        if value and value.startswith(("http://", "https://")):
+            urls.append(value)
+    return urls
+
+
+def _text_nodes(element, skip: frozenset) -> Iterator[str]:
+    """Yield text nodes of a tree in document order, like BeautifulSoup's strings.
+
+    Comments, processing instructions and the content of `skip` elements are
+    left out; the text after them stays a separate node instead of being
+    glued to the text before them.
+    """
+    if not isinstance(element.tag, str) or element.tag in skip:
+        return
+    if element.text:
+        yield element.text
+    for child in element:
+        yield from _text_nodes(child, skip)
+        if child.tail:
+            yield child.tail
+
+
+def _normalize_lines(text: str) -> str:
+    """Strip lines, split on double spaces and drop empty chunks."""
     lines = (line.strip() for line in text.splitlines())
     chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-    text = "\n".join(chunk for chunk in chunks if chunk)
-    
-    return text
+    return "\n".join(chunk for chunk in chunks if chunk)
+
+
+def extract_html(html: str) -> HtmlExtract:
+    """Extract text, links and images from HTML in a single parse."""
+    if not html:
+        return HtmlExtract()
+
+    root = _parse(html)
+    if root is None:
+        return HtmlExtract()
+
+    links = _absolute_urls(root.iter("a"), "href")
+    images = _absolute_urls(root.iter("img"), "src")
+
+    text = _normalize_lines("\n".join(_text_nodes(root, _SKIP_TAGS)))
+    return HtmlExtract(text=text, links=links, images=images)
+
+
+def _meta(root, *names: str) -> Optional[str]:
+    """Get content of the first matching <meta property|name=...> tag."""
+    for name in names:
+        for attribute in ("property", "name"):
+            values = root.xpath(f"//meta[@{attribute}=$name]/@content", name=name)
+            if values and values[0].strip():
+                return values[0].strip()
+    return None
+
+
+def extract_article(html: str, base_url: Optional[str] = None) -> ArticleExtract:
+    """Extract title, main text, lead image and links of an article page.
+
+    Main content is taken from <article>, then <main>, then <body>, with
+    navigation, headers, footers and sidebars removed. Links are made
+    absolute when `base_url` is given.
+    """
+    if not html:
+        return ArticleExtract()
+
+    root = _parse(html)
+    if root is None:
+        return ArticleExtract()
+
+    if base_url:
+        root.make_links_absolute(base_url, resolve_base_href=True)
+
+    title = _meta(root, "og:title", "twitter:title")
+    if not title:
+        title_element = root.find(".//title")
+        title = (title_element.text_content() if title_element is not None else "").strip()
+
+    image = _meta(root, "og:image", "twitter:image")
+    published = _meta(root, "article:published_time", "datePublished", "date")
+    links = _absolute_urls(root.iter("a"), "href")
+
+    skip = _SKIP_TAGS | _CHROME_TAGS
+
+    def text_length(element) -> int:
+        return sum(len(node) for node in _text_nodes(element, skip))
+
+    container = None
+    for tag in ("article", "main", "body"):
+        candidates = [
+            element for element in root.iter(tag)
+            if not any(ancestor.tag in _CHROME_TAGS for ancestor in element.iterancestors())
+        ]
+        if candidates:
+            # Largest candidate wins (teasers are also <article>)
+            container = max(candidates, key=text_length)
+            break
+    if container is None:
+        container = root
+
+    text = _normalize_lines("\n".join(_text_nodes(container, skip)))
+    if image and not image.startswith(("http://", "https://")):
+        image = None
+
+    return ArticleExtract(title=title, text=text, image=image, published=published, links=links)
+
+
+def extract_text_from_html(html: str) -> str:
+    """Extract clean text from HTML."""
+    return extract_html(html).text
 
 
 def clean_html_tags(text: str) -> str:
     """Remove all HTML tags from text."""
     if not text:
         return ""
-    
-    soup = BeautifulSoup(text, "lxml")
-    return soup.get_text()
 
+    root = _parse(text)
+    if root is None:
+        return ""
 
-def extract_links(html: str) -> list[str]:
-    """Extract all links from HTML."""
-    if not html:
+    return "".join(_text_nodes(root, _NON_TEXT_TAGS))
+
+
+def extract_links(html: str, base_url: Optional[str] = None) -> list[str]:
+    """Extract all links from HTML.
+
+    Relative links are resolved against `base_url` when given and dropped
+    otherwise.
+    """
+    if base_url is None:
+        return extract_html(html).links
+
+    root = _parse(html) if html else None
+    if root is None:
         return []
-    
-    soup = BeautifulSoup(html, "lxml")
-    links = []
-    
-    for link in soup.find_all("a"):
-        href = link.get("href")
-        if href and href.startswith(("http://", "https://")):
-            links.append(href)
-    
-    return links
+    root.make_links_absolute(base_url, resolve_base_href=True)
+    return _absolute_urls(root.iter("a"), "href")
 
 
 def extract_images(html: str) -> list[str]:
     """Extract all image URLs from HTML."""
-    if not html:
-        return []
-    
-    soup = BeautifulSoup(html, "lxml")
-    images = []
-    
-    for img in soup.find_all("img"):
-        src = img.get("src")
-        if src and src.startswith(("http://", "https://")):
-            images.append(src)
-    
-    return images
-
+    return extract_html(html).images
@@ -1,36 +1,110 @@
 """RSS feed ingestion."""
 
+import hashlib
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
-import hashlib
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
 
 import aiohttp
 import feedparser
 from loguru import logger
 
-from app.connectors.html_clean import extract_text_from_html
+from app.config import get_settings
+from app.connectors import SourceUnavailableError
+from app.connectors.feed_stream import StreamingFeedParser, UnsupportedFeedFormat, parse_json_feed
+from app.connectors.html_clean import extract_html
 from app.db.repo import Repository
 from app.db.models import Source
-from app.utils.hash import compute_content_hash
+from app.utils.executor import run_cpu
+from app.utils.hash import compute_bytes_hash, compute_content_fingerprint, compute_content_hash
+from app.utils.http import get_http_session
+
+
+# Bodies at least this large are hashed off the event loop
+LARGE_BODY_BYTES = 256 * 1024
+
+# Read size of the streaming feed parser
+STREAM_CHUNK_BYTES = 16 * 1024
+
+
+@dataclass
+class FeedFetchResult:
+    """Result of a (conditional) feed fetch."""
 
+    feed: Optional[feedparser.FeedParserDict] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    body_hash: Optional[str] = None
+    not_modified: bool = False  # 304 or body identical to previous fetch
 
-async def fetch_rss_feed(url: str) -> Optional[feedparser.FeedParserDict]:
-    """Fetch and parse RSS feed."""
+
+async def fetch_rss_feed(
+    url: str,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+    previous_hash: Optional[str] = None,
+    session: Optional[aiohttp.ClientSession] = None,
+) -> Optional[FeedFetchResult]:
+    """Fetch and parse RSS feed.
+    
+    Sends If-None-Match/If-Modified-Since when validators are known and skips
+    parsing entirely when the server answers 304 or the body hash matches
+    `previous_hash`. Uses the shared HTTP session unless `session` is given.
+    
+    Returns:
+        Fetch result or None on error
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                if response.status != 200:
-                    logger.error(f"RSS feed error: {response.status} for {url}")
-                    return None
-                
-                content = await response.text()
-                feed = feedparser.parse(content)
-                
-                if feed.bozo:
-                    logger.warning(f"RSS feed parse warning for {url}: {feed.bozo_exception}")
-                
-                return feed
-                
+        session = session or get_http_session()
+        async with session.get(
+            url, headers=headers, timeout=aiohttp.ClientTimeout(total=30)
+        ) as response:
+            if response.status == 304:
+                logger.debug(f"RSS feed not modified (304): {url}")
+                return FeedFetchResult(
+                    etag=response.headers.get("ETag", etag),
+                    last_modified=response.headers.get("Last-Modified", last_modified),
+                    body_hash=previous_hash,
+                    not_modified=True,
+                )
+            
+            if response.status != 200:
+                logger.error(f"RSS feed error: {response.status} for {url}")
+                return None
+            
+            body = await response.read()
+            result = FeedFetchResult(
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+        
+        if len(body) >= LARGE_BODY_BYTES:
+            result.body_hash = await run_cpu(compute_bytes_hash, body)
+        else:
+            result.body_hash = compute_bytes_hash(body)
+        
+        # Connection is back in the pool before hashing and parsing
+        if previous_hash and result.body_hash == previous_hash:
+            logger.debug(f"RSS feed body unchanged: {url}")
+            result.not_modified = True
+            return result
+        
+        # Pass raw bytes so feedparser honors the XML encoding declaration
+        feed = await run_cpu(feedparser.parse, body)
+        
+        if feed.bozo:
+            logger.warning(f"RSS feed parse warning for {url}: {feed.bozo_exception}")
+        
+        result.feed = feed
+        return result
+        
     except aiohttp.ClientError as e:
         logger.error(f"HTTP error fetching RSS {url}: {e}")
         return None
@@ -39,93 +113,305 @@ async def fetch_rss_feed(url: str) -> Optional[feedparser.FeedParserDict]:
         return None
 
 
-async def ingest_rss_source(source: Source, repo: Repository) -> int:
-    """Ingest messages from RSS feed.
+async def stream_rss_feed(
+    url: str,
+    known_ids: set[str],
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+    max_entries: int = 200,
+    previous_hash: Optional[str] = None,
+    session: Optional[aiohttp.ClientSession] = None,
+) -> Optional[FeedFetchResult]:
+    """Fetch feed incrementally, skipping already known entries.
+    
+    RSS/Atom bodies are read in chunks and parsed entry by entry; in
+    newest-first feeds the download is abandoned once known entries are
+    reached. JSON Feed is read whole. Raises UnsupportedFeedFormat when the
+    fast path cannot handle the feed, so the caller can fall back to
+    `fetch_rss_feed`.
+    
+    The body hash is computed while streaming; it is only known (and
+    compared with `previous_hash`) when the whole body was read, otherwise
+    `body_hash` is None.
     
     Returns:
-        Number of new messages ingested
+        Fetch result with only new entries, or None on HTTP error
     """
-    if not source.url:
-        logger.error(f"RSS source {source.id} has no URL")
-        return 0
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
     
-    logger.info(f"Ingesting RSS source {source.id}: {source.url}")
+    try:
+        session = session or get_http_session()
+        async with session.get(
+            url, headers=headers, timeout=aiohttp.ClientTimeout(total=30)
+        ) as response:
+            if response.status == 304:
+                logger.debug(f"RSS feed not modified (304): {url}")
+                return FeedFetchResult(
+                    etag=response.headers.get("ETag", etag),
+                    last_modified=response.headers.get("Last-Modified", last_modified),
+                    body_hash=previous_hash,
+                    not_modified=True,
+                )
+            
+            if response.status != 200:
+                logger.error(f"RSS feed error: {response.status} for {url}")
+                return None
+            
+            result = FeedFetchResult(
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+            
+            if "json" in response.content_type:
+                body = await response.read()
+                result.body_hash = compute_bytes_hash(body)
+                if previous_hash and result.body_hash == previous_hash:
+                    logger.debug(f"RSS feed body unchanged: {url}")
+                    result.not_modified = True
+                    return result
+                entries, stopped = parse_json_feed(body, known_ids, max_entries)
+                result.feed = feedparser.FeedParserDict(entries=entries, bozo=0)
+                return result
+            
+            parser = StreamingFeedParser(known_ids, max_entries=max_entries)
+            digest = hashlib.sha256()
+            received = 0
+            async for chunk in response.content.iter_chunked(STREAM_CHUNK_BYTES):
+                received += len(chunk)
+                digest.update(chunk)
+                parser.feed(chunk)
+                if parser.stopped:
+                    # Rest of the body is not needed; drop the connection
+                    response.close()
+                    break
+            else:
+                parser.close()
+                # Same digest as compute_bytes_hash over the whole body
+                result.body_hash = digest.hexdigest()
+            
+            logger.debug(
+                f"Streamed {received // 1024} KiB of {url} ({parser.format}), "
+                f"{len(parser.entries)} new entries"
+                f"{', stopped at known entry' if parser.stopped else ''}"
+            )
+            if previous_hash and result.body_hash == previous_hash:
+                logger.debug(f"RSS feed body unchanged: {url}")
+                result.not_modified = True
+                return result
+            
+            result.feed = feedparser.FeedParserDict(entries=parser.entries, bozo=0)
+            return result
     
-    feed = await fetch_rss_feed(source.url)
-    if not feed or not hasattr(feed, "entries"):
-        logger.error(f"Failed to fetch RSS feed for source {source.id}")
-        return 0
+    except aiohttp.ClientError as e:
+        logger.error(f"HTTP error fetching RSS {url}: {e}")
+        return None
+
+
+def next_feed_page(feed, page_url: str) -> Optional[str]:
+    """Get URL of the next older page of a feed archive.
+    
+    Follows RFC 5005 archive links (`prev-archive`) and paged feeds
+    (`next`). Feeds without such links are probed the WordPress way with
+    `?paged=N`; the caller stops when a probed page fails or holds nothing new.
+    """
+    links = feed.get("feed", {}).get("links", [])
+    for rel in ("prev-archive", "next"):
+        for link in links:
+            if link.get("rel") == rel and link.get("href"):
+                return urljoin(page_url, link["href"])
     
-    new_count = 0
+    parts = urlsplit(page_url)
+    query = dict(parse_qsl(parts.query, keep_blank_values=True))
+    try:
+        page = int(query.get("paged", "1"))
+    except ValueError:
+        return None
+    query["paged"] = str(page + 1)
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def is_probed_feed_page(url: str) -> bool:
+    """Whether a page URL was guessed by `next_feed_page` (WordPress paging)."""
+    return "paged" in dict(parse_qsl(urlsplit(url).query))
+
+
+def entry_external_id(entry) -> Optional[str]:
+    """Get stable external ID of a feed entry (entry ID or link)."""
+    return entry.get("id") or entry.get("link") or None
+
+
+def build_entry_text(entry) -> str:
+    """Build message text from feed entry (title, body, link)."""
+    # Collect HTML fragments; feedparser often repeats content as summary
+    fragments = []
+    if hasattr(entry, "summary"):
+        fragments.append(entry.summary)
+    elif hasattr(entry, "description"):
+        fragments.append(entry.description)
     
-    for entry in feed.entries:
+    if hasattr(entry, "content"):
+        for content in entry.content:
+            if content.value not in fragments:
+                fragments.append(content.value)
+    
+    # Extract content (one parse per distinct fragment)
+    text = "\n\n".join(extract_html(fragment).text for fragment in fragments)
+    
+    if not text.strip():
+        return ""
+    
+    # Add title
+    if hasattr(entry, "title"):
+        text = f"{entry.title}\n\n{text}"
+    
+    # Add link
+    link = entry.get("link", "")
+    if link:
+        text += f"\n\n🔗 {link}"
+    
+    return text
+
+
+def build_entry_rows(entries: list, known_ids: set[str]) -> list[dict]:
+    """Build raw message rows for feed entries not in `known_ids`.
+    
+    CPU-bound (HTML extraction, hashing); meant to run via `run_cpu`.
+    """
+    rows = []
+    
+    for entry in entries:
         try:
-            # Extract content
-            text = ""
-            if hasattr(entry, "summary"):
-                text = extract_text_from_html(entry.summary)
-            elif hasattr(entry, "description"):
-                text = extract_text_from_html(entry.description)
-            
-            if hasattr(entry, "content"):
-                for content in entry.content:
-                    text += "\n\n" + extract_text_from_html(content.value)
-            
-            if not text.strip():
+            # Use entry ID or link as external_id
+            external_id = entry_external_id(entry)
+            if external_id and external_id in known_ids:
                 continue
             
-            # Add title
-            if hasattr(entry, "title"):
-                text = f"{entry.title}\n\n{text}"
+            text = build_entry_text(entry)
+            if not text:
+                continue
             
-            # Add link
-            link = entry.get("link", "")
-            if link:
-                text += f"\n\n🔗 {link}"
+            if not external_id:
+                external_id = compute_content_hash(text)
             
             # Get published date
             published_at = None
             if hasattr(entry, "published_parsed") and entry.published_parsed:
                 published_at = datetime(*entry.published_parsed[:6])
             
-            # Use entry ID or link as external_id
-            external_id = entry.get("id") or entry.get("link") or compute_content_hash(text)
-            
-            # Check if already exists
-            exists = await repo.check_message_exists(
-                source_id=source.id,
-                external_id=external_id,
-                owner_user_id=source.owner_user_id,
-            )
-            
-            if exists:
-                continue
-            
-            # Create raw message
-            content_hash = compute_content_hash(text)
-            
-            await repo.create_raw_message(
-                owner_user_id=source.owner_user_id,
-                source_id=source.id,
-                external_id=external_id,
-                text=text,
-                content_hash=content_hash,
-                published_at_source=published_at,
+            rows.append(
+                {
+                    "external_id": external_id,
+                    "text": text,
+                    "content_hash": compute_content_hash(text),
+                    "content_fingerprint": compute_content_fingerprint(text),
+                    "published_at_source": published_at,
+                }
             )
             
-            new_count += 1
-            logger.debug(f"Ingested RSS entry: {entry.get('title', 'No title')}")
-            
         except Exception as e:
             logger.error(f"Error processing RSS entry: {e}", exc_info=True)
             continue
     
-    # Update source last_checked_at
-    await repo.update_source(
-        source.id,
-        source.owner_user_id,
-        last_checked_at=datetime.utcnow(),
+    return rows
+
+
+async def ingest_rss_source(source: Source, repo: Repository) -> int:
+    """Ingest messages from RSS feed.
+    
+    Returns:
+        Number of new messages ingested
+    
+    Raises:
+        SourceUnavailableError: Feed could not be fetched or parsed
+    """
+    if not source.url:
+        raise SourceUnavailableError(f"RSS source {source.id} has no URL")
+    
+    logger.info(f"Ingesting RSS source {source.id}: {source.url}")
+    
+    settings = get_settings()
+    fetched = None
+    use_feedparser = not settings.rss_streaming_enabled
+    
+    if settings.rss_streaming_enabled:
+        recent_ids = await repo.get_recent_external_ids(
+            source_id=source.id,
+            owner_user_id=source.owner_user_id,
+            limit=settings.rss_stream_known_ids,
+        )
+        try:
+            fetched = await stream_rss_feed(
+                source.url,
+                known_ids=recent_ids,
+                etag=source.http_etag,
+                last_modified=source.http_last_modified,
+                max_entries=settings.rss_stream_max_entries,
+                previous_hash=source.feed_body_hash,
+            )
+        except UnsupportedFeedFormat as e:
+            logger.debug(f"Streaming parser unavailable for {source.url} ({e}), using feedparser")
+            use_feedparser = True
+    
+    if use_feedparser:
+        fetched = await fetch_rss_feed(
+            source.url,
+            etag=source.http_etag,
+            last_modified=source.http_last_modified,
+            previous_hash=source.feed_body_hash,
+        )
+    
+    if fetched is None:
+        raise SourceUnavailableError(f"Failed to fetch RSS feed {source.url}")
+    
+    if fetched.not_modified:
+        await repo.update_source(
+            source.id,
+            source.owner_user_id,
+            touch=False,
+            last_checked_at=datetime.utcnow(),
+            http_etag=fetched.etag,
+            http_last_modified=fetched.last_modified,
+        )
+        logger.info(f"RSS source {source.id} not modified, skipping")
+        return 0
+    
+    feed = fetched.feed
+    if not feed or not hasattr(feed, "entries"):
+        raise SourceUnavailableError(f"Failed to parse RSS feed {source.url}")
+    
+    # Look up all known entry IDs in one query
+    entries = list(feed.entries)
+    known_ids = await repo.get_existing_external_ids(
+        source_id=source.id,
+        owner_user_id=source.owner_user_id,
+        external_ids=(entry_external_id(entry) for entry in entries),
+    )
+    
+    # HTML extraction and hashing run on the shared CPU executor
+    rows = await run_cpu(build_entry_rows, entries, known_ids)
+    
+    # Insert all new entries in one statement
+    inserted_ids = await repo.bulk_create_raw_messages(
+        owner_user_id=source.owner_user_id,
+        source_id=source.id,
+        rows=rows,
     )
+    new_count = len(inserted_ids)
+    
+    # Update source last_checked_at and HTTP cache validators; a streamed
+    # fetch that stopped early has no body hash and keeps the stored one
+    values = {
+        "last_checked_at": datetime.utcnow(),
+        "http_etag": fetched.etag,
+        "http_last_modified": fetched.last_modified,
+    }
+    if fetched.body_hash is not None:
+        values["feed_body_hash"] = fetched.body_hash
+    await repo.update_source(source.id, source.owner_user_id, touch=False, **values)
     
     logger.info(f"RSS ingestion complete for source {source.id}: {new_count} new messages")
     return new_count
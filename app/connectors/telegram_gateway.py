@@ -0,0 +1,121 @@
+"""Client of the Telegram gateway.
+
+The worker process is the only owner of the Telethon sessions and serves
+channel resolution and account stats to other processes over a Unix socket (see `app.worker.gateway_server`). This module does not
+import Telethon, so processes that only talk to the gateway (the admin bot)
+never open the session files.
+
+Protocol: one JSON object per line. A request is
+`{"method": ..., "params": {...}}`, a response is `{"result": ...}` or
+`{"error": {"kind": ..., "message": ..., "seconds": ...}}`.
+"""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, Optional
+
+from app.config import get_settings
+
+# Largest line read from the socket
+MAX_LINE_BYTES = 16 * 1024 * 1024
+
+# Error kinds sent by the gateway
+ERROR_FLOOD_WAIT = "flood_wait"
+ERROR_UNAVAILABLE = "unavailable"
+ERROR_INTERNAL = "error"
+
+
+class TelegramGatewayError(Exception):
+    """Raised when the gateway answers a request with an error."""
+
+    def __init__(self, message: str, kind: str = ERROR_INTERNAL, seconds: int = 0):
+        super().__init__(message)
+        self.kind = kind
+        self.seconds = seconds
+
+
+class TelegramGatewayUnavailable(TelegramGatewayError):
+    """Raised when the gateway socket cannot be reached (worker not running)."""
+
+
+def encode_message(payload: dict) -> bytes:
+    """Encode one protocol message."""
+    return json.dumps(payload, ensure_ascii=False, default=str).encode() + b"\n"
+
+
+class TelegramGatewayClient:
+    """Calls the gateway with one short-lived connection per request."""
+
+    def __init__(self, socket_path: Optional[Path] = None, timeout: Optional[float] = None):
+        """Initialize client.
+
+        Args:
+            socket_path: Gateway socket (default from settings)
+            timeout: Seconds to wait for a response (default from settings)
+        """
+        if socket_path is None or timeout is None:
+            settings = get_settings()
+            socket_path = socket_path or settings.tg_gateway_socket_path
+            timeout = settings.tg_gateway_timeout_seconds if timeout is None else timeout
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    async def call(self, method: str, **params: Any) -> Any:
+        """Call a gateway method.
+
+        Raises:
+            TelegramGatewayUnavailable: Gateway is not running or timed out
+            TelegramGatewayError: Gateway reported an error
+        """
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_unix_connection(str(self.socket_path), limit=MAX_LINE_BYTES),
+                self.timeout,
+            )
+        except (OSError, asyncio.TimeoutError) as e:
+            raise TelegramGatewayUnavailable(
+                f"Telegram gateway at {self.socket_path} is unavailable: {e}"
+            ) from e
+
+        try:
+            writer.write(encode_message({"method": method, "params": params}))
+            await writer.drain()
+            line = await asyncio.wait_for(reader.readline(), self.timeout)
+        except (OSError, asyncio.TimeoutError) as e:
+            raise TelegramGatewayUnavailable(f"Telegram gateway call {method} failed: {e}") from e
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+        if not line:
+            raise TelegramGatewayUnavailable(f"Telegram gateway closed the connection ({method})")
+
+        response = json.loads(line)
+        error = response.get("error")
+        if error:
+            raise TelegramGatewayError(
+                error.get("message", "Unknown error"),
+                kind=error.get("kind", ERROR_INTERNAL),
+                seconds=error.get("seconds", 0),
+            )
+        return response.get("result")
+
+    async def resolve(self, handle: str) -> dict:
+        """Resolve a channel handle to `{"telegram_id", "title", "username"}`."""
+        return await self.call("resolve", handle=handle)
+
+
+# Global client instance
+_gateway_client: Optional[TelegramGatewayClient] = None
+
+
+def get_telegram_gateway() -> TelegramGatewayClient:
+    """Get or create global gateway client."""
+    global _gateway_client
+    if _gateway_client is None:
+        _gateway_client = TelegramGatewayClient()
+    return _gateway_client
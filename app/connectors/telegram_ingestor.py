@@ -1,192 +1,635 @@
-"""Telegram channel ingestion using Telethon."""
+"""Telegram channel ingestion using Telethon.
 
+Polling is spread over the account pool (see `telegram_pool`); push updates
+are received by the primary account for the channels it has joined.
+"""
+
+import asyncio
 import json
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
 from loguru import logger
-from telethon import TelegramClient
-from telethon.tl.types import Message as TelethonMessage
+from sqlalchemy import and_, select
+from telethon import TelegramClient, events, utils
+from telethon.errors import ChannelInvalidError, FloodWaitError, PeerIdInvalidError
+from telethon.tl.types import InputPeerChannel, Message as TelethonMessage
 
 from app.config import get_settings
-from app.db.models import Source
+from app.connectors import AccountsUnavailableError, SourceUnavailableError
+from app.connectors.telegram_pool import (
+    ACCOUNT_LOST_ERRORS,
+    TelegramAccount,
+    get_account_pool,
+)
+from app.connectors.telegram_requests import (
+    RequestKind,
+    get_telegram_request_scheduler,
+    history_cost,
+)
+from app.db.base import get_session
+from app.db.models import Source, SourceType
 from app.db.repo import Repository
-from app.utils.hash import compute_content_hash
+from app.media.telegram_download import get_media_downloader
+from app.utils.hash import compute_content_fingerprint, compute_content_hash
 
 
-# Global Telethon client
-_telethon_client: Optional[TelegramClient] = None
+def get_telethon_client() -> TelegramClient:
+    """Get Telethon client of the primary account."""
+    return get_account_pool().primary.client
 
 
-def get_telethon_client() -> TelegramClient:
-    """Get or create Telethon client."""
-    global _telethon_client
+async def start_telethon_client():
+    """Start Telethon clients of all pool accounts."""
+    await get_account_pool().start()
+
+
+async def stop_telethon_client():
+    """Stop Telethon clients of all pool accounts."""
+    await get_account_pool().stop()
+
+
+# Errors meaning a locally built input peer is no longer accepted
+PEER_REJECTED_ERRORS = (ChannelInvalidError, PeerIdInvalidError, ValueError)
+
+# (account name, Telegram channel ID) -> input peer (channel ID plus access hash)
+_peer_cache: dict[tuple[str, int], InputPeerChannel] = {}
+
+
+async def resolve_source_peer(
+    account: TelegramAccount, source: Source, repo: Repository, refresh: bool = False
+) -> InputPeerChannel:
+    """Get input peer for a source without a network round trip when possible.
     
-    if _telethon_client is None:
-        settings = get_settings()
-        
-        session_path = Path(settings.tg_session_path)
-        session_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        _telethon_client = TelegramClient(
-            str(session_path),
-            settings.tg_api_id,
-            settings.tg_api_hash,
+    The peer is built from the in-process cache, from `telegram_id` and
+    `telegram_access_hash` stored on the source (primary account only, since
+    access hashes are per account) or from the account's session entity
+    cache. Only when none is known (or `refresh` is set) the handle is
+    resolved over the network and the result persisted.
+    """
+    client = account.client
+    
+    if not refresh and source.telegram_id:
+        peer = _peer_cache.get((account.name, source.telegram_id))
+        if peer is not None:
+            return peer
+        if account.is_primary and source.telegram_access_hash is not None:
+            peer = InputPeerChannel(source.telegram_id, source.telegram_access_hash)
+            _peer_cache[(account.name, source.telegram_id)] = peer
+            return peer
+    
+    if source.telegram_id:
+        _peer_cache.pop((account.name, source.telegram_id), None)
+    
+    if refresh:
+        entity = await account.requests.call(RequestKind.RESOLVE, client.get_entity, source.handle)
+        peer = utils.get_input_peer(entity)
+    else:
+        peer = await account.requests.call(
+            RequestKind.RESOLVE, client.get_input_entity, source.handle
         )
+    if not isinstance(peer, InputPeerChannel):
+        raise ValueError(f"@{source.handle} is not a channel")
+    
+    _peer_cache[(account.name, peer.channel_id)] = peer
+    
+    if source.telegram_id != peer.channel_id or (
+        account.is_primary and source.telegram_access_hash != peer.access_hash
+    ):
+        values = {"telegram_id": peer.channel_id}
+        if account.is_primary:
+            values["telegram_access_hash"] = peer.access_hash
+        await repo.update_source(source.id, source.owner_user_id, touch=False, **values)
     
-    return _telethon_client
+    return peer
 
 
-async def start_telethon_client():
-    """Start Telethon client."""
-    client = get_telethon_client()
+def group_albums(messages: Iterable[TelethonMessage]) -> list[list[TelethonMessage]]:
+    """Group album parts (messages sharing `grouped_id`) together.
     
-    if not client.is_connected():
-        await client.start()
-        logger.info("Telethon client started")
+    Groups keep the order in which their first message appears; parts of an
+    album are sorted by ID. Messages outside an album form one-item groups.
+    """
+    groups: list[list[TelethonMessage]] = []
+    albums: dict[int, list[TelethonMessage]] = {}
+    
+    for message in messages:
+        grouped_id = getattr(message, "grouped_id", None)
+        if grouped_id is None:
+            groups.append([message])
+            continue
+        album = albums.get(grouped_id)
+        if album is None:
+            album = albums[grouped_id] = []
+            groups.append(album)
+        album.append(message)
+    
+    for album in albums.values():
+        album.sort(key=lambda message: message.id)
+    return groups
 
 
-async def stop_telethon_client():
-    """Stop Telethon client."""
-    global _telethon_client
+def has_text(group: list[TelethonMessage]) -> bool:
+    """Whether a message group is a post worth ingesting (has text or a caption)."""
+    return any(isinstance(message, TelethonMessage) and message.text for message in group)
+
+
+def album_to_row(
+    messages: list[TelethonMessage], media_paths: dict[int, Optional[str]]
+) -> dict:
+    """Build one raw message row from an album (or a single message).
     
-    if _telethon_client and _telethon_client.is_connected():
-        await _telethon_client.disconnect()
-        logger.info("Telethon client stopped")
+    The album is keyed by its first message ID and carries the caption and
+    the downloaded media of all its parts, in order.
+    """
+    first = messages[0]
+    text = next((message.text for message in messages if message.text), "")
+    paths = [media_paths[message.id] for message in messages if media_paths.get(message.id)]
+    
+    return {
+        "external_id": str(first.id),
+        "text": text,
+        "media_paths": json.dumps(paths) if paths else None,
+        "content_hash": compute_content_hash(text),
+        "content_fingerprint": compute_content_fingerprint(text),
+        "published_at_source": first.date,
+    }
+
+
+def message_to_row(message: TelethonMessage, media_path: Optional[str] = None) -> dict:
+    """Build raw message row from Telegram message and its downloaded media."""
+    return album_to_row([message], {message.id: media_path})
+
+
+async def build_album_row(messages: list[TelethonMessage], media_storage: Path) -> dict:
+    """Build raw message row from an album, downloading the media of all parts."""
+    media_paths = await get_media_downloader().download_many(messages, media_storage)
+    return album_to_row(messages, media_paths)
 
 
-async def download_media(message: TelethonMessage, storage_path: Path) -> Optional[str]:
-    """Download media from message and return local path."""
-    if not message.media:
-        return None
+def hold_back_partial_album(
+    messages: list[TelethonMessage],
+) -> tuple[list[TelethonMessage], list[TelethonMessage]]:
+    """Split off an album that may continue past the end of a fetched page.
     
-    try:
-        # Create unique filename
-        filename = f"tg_{message.chat_id}_{message.id}_{datetime.utcnow().timestamp()}"
-        
-        # Download
-        path = await message.download_media(file=str(storage_path / filename))
-        
-        if path:
-            logger.debug(f"Downloaded media to {path}")
-            return str(path)
-        
-        return None
+    Returns:
+        (messages to ingest now, trailing album parts to fetch again)
+    """
+    if not messages:
+        return messages, []
+    grouped_id = getattr(messages[-1], "grouped_id", None)
+    if grouped_id is None:
+        return messages, []
+    
+    cut = len(messages)
+    while cut > 0 and getattr(messages[cut - 1], "grouped_id", None) == grouped_id:
+        cut -= 1
+    if cut == 0:
+        return messages, []  # Page holds nothing else; take the album as is
+    return messages[:cut], messages[cut:]
+
+
+async def _read_messages(client: TelegramClient, entity, **kwargs) -> list[TelethonMessage]:
+    return [message async for message in client.iter_messages(entity, **kwargs)]
+
+
+async def _read_dialogs(client: TelegramClient) -> list:
+    return [dialog async for dialog in client.iter_dialogs()]
+
+
+async def read_messages(client: TelegramClient, entity, **kwargs) -> list[TelethonMessage]:
+    """Read messages with `iter_messages` as scheduled history requests."""
+    return await get_telegram_request_scheduler(client).call(
+        RequestKind.HISTORY,
+        _read_messages,
+        client,
+        entity,
+        cost=history_cost(kwargs.get("limit")),
+        **kwargs,
+    )
+
+
+async def fetch_new_messages(
+    client: TelegramClient,
+    entity,
+    last_message_id: Optional[int],
+    limit: int = 50,
+    max_catchup: int = 500,
+) -> tuple[list[TelethonMessage], Optional[int]]:
+    """Fetch messages newer than the stored watermark.
+    
+    Without a watermark only the latest `limit` messages are read. With a
+    watermark, history is paged oldest-first from `min_id`, so a quiet
+    channel costs one small request and a busy one is caught up over
+    consecutive ticks instead of losing everything past `limit`.
+    
+    Returns:
+        (messages oldest first, highest seen message ID)
+    """
+    if last_message_id:
+        fetched = await read_messages(
+            client, entity, min_id=last_message_id, reverse=True, limit=max_catchup
+        )
         
+        if len(fetched) >= max_catchup:
+            # The last album may continue past the limit; read it whole next time
+            fetched, _ = hold_back_partial_album(fetched)
+            logger.info(
+                f"Telegram catch-up limit ({max_catchup}) reached for "
+                f"{utils.get_peer_id(entity)}, "
+                f"continuing after message {fetched[-1].id} next time"
+            )
+    else:
+        fetched = await read_messages(client, entity, limit=limit)
+        fetched.reverse()
+    
+    # Watermark covers every fetched message, including ones we skip
+    max_id = max((message.id for message in fetched), default=last_message_id)
+    return fetched, max_id
+
+
+async def fetch_history_page(
+    client: TelegramClient,
+    entity,
+    offset_id: int,
+    limit: int,
+    wait_time: Optional[float] = None,
+) -> list[TelethonMessage]:
+    """Fetch up to `limit` messages older than `offset_id`, newest first.
+    
+    `wait_time` is the pause between the underlying history requests
+    (100 messages each), used by backfill to stay under API limits.
+    """
+    return await read_messages(
+        client, entity, offset_id=offset_id, limit=limit, wait_time=wait_time
+    )
+
+
+async def _fetch_source_messages(
+    account: TelegramAccount,
+    source: Source,
+    repo: Repository,
+    limit: int,
+    max_catchup: int,
+) -> tuple[list[TelethonMessage], Optional[int]]:
+    """Fetch messages of a source newer than its watermark with one account."""
+    # Ensure client is started
+    if not account.client.is_connected():
+        await get_account_pool().start()
+    
+    # Get channel peer (cached locally, resolved over network only if needed)
+    try:
+        peer = await resolve_source_peer(account, source, repo)
+    except (FloodWaitError, *ACCOUNT_LOST_ERRORS):
+        raise
     except Exception as e:
-        logger.error(f"Error downloading media: {e}", exc_info=True)
-        return None
+        raise SourceUnavailableError(
+            f"Failed to get Telegram entity @{source.handle}: {e}"
+        ) from e
+    
+    # Get messages newer than the watermark
+    try:
+        return await fetch_new_messages(
+            account.client,
+            peer,
+            last_message_id=source.last_message_id,
+            limit=limit,
+            max_catchup=max_catchup,
+        )
+    except PEER_REJECTED_ERRORS as e:
+        # Cached peer is stale (e.g. access hash revoked); resolve once more
+        logger.warning(f"Cached peer for @{source.handle} rejected ({e}), resolving")
+        peer = await resolve_source_peer(account, source, repo, refresh=True)
+        return await fetch_new_messages(
+            account.client,
+            peer,
+            last_message_id=source.last_message_id,
+            limit=limit,
+            max_catchup=max_catchup,
+        )
 
 
-async def ingest_telegram_source(source: Source, repo: Repository, limit: int = 50) -> int:
+async def ingest_telegram_source(
+    source: Source, repo: Repository, limit: int = 50, force: bool = False
+) -> int:
     """Ingest messages from Telegram channel.
     
     Args:
         source: Source object with Telegram handle
         repo: Database repository
-        limit: Maximum number of messages to fetch
+        limit: Maximum number of messages to fetch on the first run
+        force: Poll even if the channel is push-ingested
     
     Returns:
         Number of new messages ingested
+    
+    Raises:
+        SourceUnavailableError: Channel handle cannot be resolved
+        AccountsUnavailableError: Every account is rate-limited or disabled
     """
     if not source.handle:
-        logger.error(f"Telegram source {source.id} has no handle")
+        raise SourceUnavailableError(f"Telegram source {source.id} has no handle")
+    
+    if not force and is_push_source(source.telegram_id) and not _safety_poll_due(source):
+        logger.debug(f"Telegram source {source.id} is push-ingested, skipping poll")
         return 0
     
     logger.info(f"Ingesting Telegram source {source.id}: @{source.handle}")
     
-    client = get_telethon_client()
+    settings = get_settings()
+    pool = get_account_pool()
     
-    try:
-        # Ensure client is started
-        if not client.is_connected():
-            await start_telethon_client()
-        
-        # Get channel entity
+    # Channel's account first; the next ones on the ring take over on failure
+    for account in pool.candidates(source.handle):
         try:
-            entity = await client.get_entity(source.handle)
+            fetched, last_message_id = await _fetch_source_messages(
+                account, source, repo, limit, settings.tg_catchup_max_messages
+            )
+        except FloodWaitError as e:
+            account.failures += 1
+            pool.mark_limited(account, e.seconds)
+            continue
+        except ACCOUNT_LOST_ERRORS as e:
+            account.failures += 1
+            pool.mark_disabled(account, e.__class__.__name__)
+            continue
+        account.ingests += 1
+        account.messages += len(fetched)
+        break
+    else:
+        raise AccountsUnavailableError(f"No Telegram account could read @{source.handle}")
+    
+    # Album parts arrive as separate messages; each album becomes one row
+    groups = [group for group in group_albums(fetched) if has_text(group)]
+    
+    media_storage = settings.media_storage_dir
+    media_storage.mkdir(parents=True, exist_ok=True)
+    
+    # Look up all known message IDs in one query
+    known_ids = await repo.get_existing_external_ids(
+        source_id=source.id,
+        owner_user_id=source.owner_user_id,
+        external_ids=(str(group[0].id) for group in groups),
+    )
+    
+    new_groups = [group for group in groups if str(group[0].id) not in known_ids]
+    
+    # Download media of all new messages in parallel
+    media_paths = await get_media_downloader().download_many(
+        (message for group in new_groups for message in group), media_storage
+    )
+    
+    rows = []
+    
+    for group in new_groups:  # Oldest first
+        try:
+            rows.append(album_to_row(group, media_paths))
         except Exception as e:
-            logger.error(f"Failed to get Telegram entity @{source.handle}: {e}")
-            return 0
-        
-        # Update source telegram_id if not set
-        if not source.telegram_id:
-            await repo.update_source(
-                source.id,
-                source.owner_user_id,
-                telegram_id=entity.id,
+            logger.error(f"Error processing Telegram message: {e}", exc_info=True)
+            continue
+    
+    # Insert all new messages in one statement
+    inserted_ids = await repo.bulk_create_raw_messages(
+        owner_user_id=source.owner_user_id,
+        source_id=source.id,
+        rows=rows,
+    )
+    new_count = len(inserted_ids)
+    
+    # Update source last_checked_at and last_message_id
+    await repo.update_source(
+        source.id, source.owner_user_id, touch=False, last_checked_at=datetime.utcnow()
+    )
+    await repo.advance_source_watermark(source.id, source.owner_user_id, last_message_id)
+    
+    logger.info(
+        f"Telegram ingestion complete for source {source.id}: {new_count} new messages"
+    )
+    return new_count
+
+
+# ==================== Push Ingestion ====================
+
+# Joined channel ID -> [(source_id, owner_user_id)] handled by update events
+_push_sources: dict[int, list[tuple[int, int]]] = {}
+_push_handler_registered = False
+_catch_up_task: Optional[asyncio.Task] = None
+
+# Push sources whose history was read up to the channel head since start;
+# only their watermark follows pushed messages
+_caught_up: set[int] = set()
+
+
+def is_push_source(telegram_id: Optional[int]) -> bool:
+    """Check if a Telegram channel is ingested through update events."""
+    return telegram_id is not None and telegram_id in _push_sources
+
+
+def _safety_poll_due(source: Source) -> bool:
+    """Whether a push-ingested source should still be polled as a safety net."""
+    if source.last_checked_at is None:
+        return True
+    settings = get_settings()
+    last_checked = source.last_checked_at
+    if last_checked.tzinfo is not None:
+        last_checked = last_checked.astimezone(timezone.utc).replace(tzinfo=None)
+    age = datetime.utcnow() - last_checked
+    return age >= timedelta(minutes=settings.tg_push_safety_poll_minutes)
+
+
+async def get_joined_channel_ids(client: TelegramClient) -> set[int]:
+    """Get IDs of all channels the account has joined."""
+    dialogs = await get_telegram_request_scheduler(client).call(
+        RequestKind.RESOLVE, _read_dialogs, client
+    )
+    return {dialog.entity.id for dialog in dialogs if dialog.is_channel}
+
+
+async def refresh_push_sources() -> int:
+    """Rebuild the map of sources ingested through update events.
+    
+    Only channels the account has joined deliver updates; all other
+    Telegram sources stay on polling.
+    
+    Returns:
+        Number of push-ingested sources
+    """
+    global _push_sources
+    
+    client = get_telethon_client()
+    if not client.is_connected():
+        return 0
+    
+    joined = await get_joined_channel_ids(client)
+    
+    async with get_session() as session:
+        stmt = select(Source.id, Source.owner_user_id, Source.telegram_id).where(
+            and_(
+                Source.source_type == SourceType.TELEGRAM,
+                Source.is_active == True,
+                Source.telegram_id.isnot(None),
             )
-        
-        # Get messages
-        messages = []
-        async for message in client.iter_messages(entity, limit=limit):
-            if isinstance(message, TelethonMessage) and message.text:
-                messages.append(message)
-        
-        new_count = 0
-        settings = get_settings()
-        media_storage = settings.media_storage_dir
-        media_storage.mkdir(parents=True, exist_ok=True)
-        
-        for message in reversed(messages):  # Process oldest first
-            try:
-                # Check if already exists
-                external_id = str(message.id)
-                exists = await repo.check_message_exists(
-                    source_id=source.id,
-                    external_id=external_id,
-                    owner_user_id=source.owner_user_id,
-                )
-                
-                if exists:
-                    continue
-                
-                # Extract text
-                text = message.text or ""
-                
-                # Download media if present
-                media_paths = []
-                if message.media:
-                    media_path = await download_media(message, media_storage)
-                    if media_path:
-                        media_paths.append(media_path)
-                
-                # Create raw message
-                content_hash = compute_content_hash(text)
-                
-                await repo.create_raw_message(
-                    owner_user_id=source.owner_user_id,
-                    source_id=source.id,
-                    external_id=external_id,
-                    text=text,
-                    media_paths=json.dumps(media_paths) if media_paths else None,
-                    content_hash=content_hash,
-                    published_at_source=message.date,
-                )
-                
-                new_count += 1
-                logger.debug(f"Ingested Telegram message {message.id}")
-                
-            except Exception as e:
-                logger.error(f"Error processing Telegram message: {e}", exc_info=True)
-                continue
-        
-        # Update source last_checked_at and last_message_id
-        last_message_id = messages[0].id if messages else source.last_message_id
-        await repo.update_source(
-            source.id,
-            source.owner_user_id,
-            last_checked_at=datetime.utcnow(),
-            last_message_id=last_message_id,
         )
+        result = await session.execute(stmt)
+        rows = result.all()
+    
+    push_sources: dict[int, list[tuple[int, int]]] = {}
+    for row in rows:
+        if row.telegram_id in joined:
+            push_sources.setdefault(row.telegram_id, []).append((row.id, row.owner_user_id))
+    
+    _push_sources = push_sources
+    source_ids = {source_id for targets in push_sources.values() for source_id, _ in targets}
+    _caught_up.intersection_update(source_ids)
+    if source_ids - _caught_up:
+        _schedule_catch_up()
+    
+    count = len(source_ids)
+    logger.info(
+        f"Push ingestion covers {count} of {len(rows)} Telegram sources "
+        f"({len(push_sources)} channels)"
+    )
+    return count
+
+
+async def _store_pushed_group(messages: list[TelethonMessage]):
+    """Store a pushed post (single message or whole album) for every bound source.
+    
+    Once the post is stored, the watermark of sources that were caught up
+    since start moves to it, so safety polls read only what pushes missed.
+    Sources still catching up keep their watermark: it marks history read
+    without gaps, and moving it would skip messages missed while offline.
+    """
+    first = messages[0]
+    channel_id = getattr(first.peer_id, "channel_id", None)
+    targets = _push_sources.get(channel_id)
+    
+    if not targets:
+        return
+    
+    try:
+        row = None
+        if has_text(messages):
+            settings = get_settings()
+            media_storage = settings.media_storage_dir
+            media_storage.mkdir(parents=True, exist_ok=True)
+            
+            # Media is downloaded once and shared by all owners of the channel
+            row = await build_album_row(messages, media_storage)
         
-        logger.info(
-            f"Telegram ingestion complete for source {source.id}: {new_count} new messages"
-        )
-        return new_count
+        last_id = max(message.id for message in messages)
         
+        for source_id, owner_user_id in targets:
+            async with get_session() as session:
+                repo = Repository(session)
+                inserted_ids = []
+                if row is not None:
+                    inserted_ids = await repo.bulk_create_raw_messages(
+                        owner_user_id=owner_user_id,
+                        source_id=source_id,
+                        rows=[row],
+                    )
+                if source_id in _caught_up:
+                    await repo.advance_source_watermark(source_id, owner_user_id, last_id)
+            
+            if inserted_ids:
+                logger.debug(f"Pushed Telegram message {first.id} to source {source_id}")
+    
     except Exception as e:
-        logger.error(f"Error ingesting Telegram source {source.id}: {e}", exc_info=True)
-        return 0
+        logger.error(f"Error handling pushed Telegram message: {e}", exc_info=True)
+
+
+async def _on_new_message(event):
+    """Store a new channel post; album parts are left to `_on_album`."""
+    message = event.message
+    if not isinstance(message, TelethonMessage) or message.grouped_id is not None:
+        return
+    await _store_pushed_group([message])
+
+
+async def _on_album(event):
+    """Store a new channel album as one post (Telethon collects its parts)."""
+    messages = sorted(event.messages, key=lambda message: message.id)
+    if messages:
+        await _store_pushed_group(messages)
+
+
+async def _catch_up_source(source_id: int, owner_user_id: int) -> bool:
+    """Read a source's history from its watermark up to the channel head.
+    
+    Each round reads at most `tg_catchup_max_messages`; rounds repeat until
+    the watermark stops moving.
+    
+    Returns:
+        Whether the source was caught up (False if it is gone or inactive)
+    """
+    while True:
+        async with get_session() as session:
+            repo = Repository(session)
+            source = await repo.get_source(source_id, owner_user_id)
+            if not source or not source.is_active:
+                return False
+            watermark = source.last_message_id
+            await ingest_telegram_source(source, repo, force=True)
+        
+        async with get_session() as session:
+            source = await Repository(session).get_source(source_id, owner_user_id)
+            if not source or source.last_message_id == watermark:
+                return source is not None
+
+
+async def catch_up_push_sources():
+    """Fetch history missed while offline for push-ingested sources."""
+    source_refs = [
+        (source_id, owner_user_id)
+        for targets in _push_sources.values()
+        for source_id, owner_user_id in targets
+        if source_id not in _caught_up
+    ]
+    
+    for source_id, owner_user_id in source_refs:
+        try:
+            if await _catch_up_source(source_id, owner_user_id):
+                _caught_up.add(source_id)
+        except Exception as e:
+            logger.error(f"Error catching up Telegram source {source_id}: {e}", exc_info=True)
+
+
+def _schedule_catch_up():
+    """Catch up push sources in the background unless a catch-up is running."""
+    global _catch_up_task
+    if _catch_up_task is None or _catch_up_task.done():
+        _catch_up_task = asyncio.create_task(catch_up_push_sources())
 
+
+async def start_push_ingestion():
+    """Subscribe to new channel posts and catch up from stored watermarks."""
+    global _push_handler_registered
+    
+    client = get_telethon_client()
+    
+    if not _push_handler_registered:
+        client.add_event_handler(_on_new_message, events.NewMessage())
+        client.add_event_handler(_on_album, events.Album())
+        _push_handler_registered = True
+    
+    # Catches up new push sources in the background, so startup is not delayed
+    await refresh_push_sources()
+    logger.info("Telegram push ingestion started")
+
+
+async def stop_push_ingestion():
+    """Unsubscribe from channel updates."""
+    global _push_handler_registered, _push_sources
+    
+    if _catch_up_task is not None and not _catch_up_task.done():
+        _catch_up_task.cancel()
+    
+    if _push_handler_registered:
+        client = get_telethon_client()
+        client.remove_event_handler(_on_new_message)
+        client.remove_event_handler(_on_album)
+    _push_handler_registered = False
+    _push_sources = {}
+    _caught_up.clear()
@@ -0,0 +1,234 @@
+"""Pool of Telethon accounts that share Telegram polling.
+
+Sources are assigned to accounts by consistent hashing of the channel handle,
+so every channel is read by one account (shared by all tenants polling it)
+and adding or removing an account moves only its share of channels. An
+account that hits a long FloodWait is skipped until the wait expires and one
+that is banned or logged out is skipped for good; its channels fall through to
+the next account on the ring.
+
+The primary account (`tg_session_path`) also receives push updates and is the
+only one whose access hashes are stored on sources, because an access hash is
+valid only for the account that resolved it.
+"""
+
+import bisect
+import hashlib
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+from loguru import logger
+from telethon import TelegramClient
+from telethon.errors import (
+    AuthKeyDuplicatedError,
+    AuthKeyUnregisteredError,
+    SessionRevokedError,
+    UserDeactivatedBanError,
+    UserDeactivatedError,
+)
+
+from app.config import get_settings
+from app.connectors import AccountsUnavailableError
+from app.connectors.telegram_requests import (
+    TelegramRequestScheduler,
+    get_telegram_request_scheduler,
+)
+
+# Errors meaning an account can no longer be used
+ACCOUNT_LOST_ERRORS = (
+    AuthKeyDuplicatedError,
+    AuthKeyUnregisteredError,
+    SessionRevokedError,
+    UserDeactivatedBanError,
+    UserDeactivatedError,
+)
+
+PRIMARY_ACCOUNT = "primary"
+
+
+def _ring_hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hash ring with virtual nodes."""
+
+    def __init__(self, names: list[str], replicas: int = 64):
+        """Place `replicas` points of every name on the ring."""
+        points = sorted(
+            (_ring_hash(f"{name}#{replica}"), name)
+            for name in names
+            for replica in range(replicas)
+        )
+        self._hashes = [point for point, _ in points]
+        self._names = [name for _, name in points]
+        self._count = len(set(names))
+
+    def walk(self, key: str) -> Iterator[str]:
+        """Yield distinct names clockwise from the position of `key`."""
+        if not self._hashes:
+            return
+        start = bisect.bisect(self._hashes, _ring_hash(key))
+        seen: set[str] = set()
+        for offset in range(len(self._names)):
+            name = self._names[(start + offset) % len(self._names)]
+            if name not in seen:
+                seen.add(name)
+                yield name
+                if len(seen) == self._count:
+                    return
+
+
+@dataclass
+class TelegramAccount:
+    """One Telethon session of the pool."""
+
+    name: str
+    client: TelegramClient
+    limited_until: float = 0.0
+    disabled_reason: Optional[str] = None
+    ingests: int = 0
+    messages: int = 0
+    failures: int = 0
+
+    @property
+    def is_primary(self) -> bool:
+        return self.name == PRIMARY_ACCOUNT
+
+    @property
+    def requests(self) -> TelegramRequestScheduler:
+        return get_telegram_request_scheduler(self.client)
+
+    def available(self, now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        return self.disabled_reason is None and self.limited_until <= now
+
+    def stats(self) -> dict:
+        return {
+            "ingests": self.ingests,
+            "messages": self.messages,
+            "failures": self.failures,
+            "limited_seconds": round(max(0.0, self.limited_until - time.monotonic()), 1),
+            "disabled": self.disabled_reason,
+            "requests": self.requests.metrics(),
+        }
+
+
+def create_telethon_client(session_path: Path) -> TelegramClient:
+    """Create a Telethon client for a session file."""
+    settings = get_settings()
+    session_path.parent.mkdir(parents=True, exist_ok=True)
+    return TelegramClient(
+        str(session_path),
+        settings.tg_api_id,
+        settings.tg_api_hash,
+        # FloodWaits are handled per request kind by the request scheduler
+        flood_sleep_threshold=0,
+    )
+
+
+class TelegramAccountPool:
+    """Telethon accounts and the assignment of channels to them."""
+
+    def __init__(self, accounts: list[TelegramAccount], replicas: int = 64):
+        """Initialize pool; the first account is the primary one."""
+        self.accounts = {account.name: account for account in accounts}
+        self.primary = accounts[0]
+        self._ring = HashRing(list(self.accounts), replicas)
+
+    def __len__(self) -> int:
+        return len(self.accounts)
+
+    def candidates(self, key: str) -> list[TelegramAccount]:
+        """Accounts able to read a channel, preferred first."""
+        now = time.monotonic()
+        ordered = [self.accounts[name] for name in self._ring.walk(key.lower())]
+        return [account for account in ordered if account.available(now)]
+
+    def account_for(self, key: str) -> TelegramAccount:
+        """Get the account assigned to a channel.
+
+        Raises:
+            AccountsUnavailableError: Every account is rate-limited or disabled
+        """
+        candidates = self.candidates(key)
+        if not candidates:
+            raise AccountsUnavailableError("No Telegram account is available")
+        return candidates[0]
+
+    def mark_limited(self, account: TelegramAccount, seconds: float):
+        """Skip an account until a FloodWait expires."""
+        account.limited_until = max(account.limited_until, time.monotonic() + seconds)
+        logger.warning(
+            f"Telegram account {account.name} rate-limited for {seconds:.0f}s, "
+            f"its channels move to other accounts"
+        )
+
+    def mark_disabled(self, account: TelegramAccount, reason: str):
+        """Stop using an account (banned, logged out or not authorized)."""
+        account.disabled_reason = reason
+        logger.error(f"Telegram account {account.name} disabled: {reason}")
+
+    async def start(self):
+        """Connect all accounts.
+
+        The primary account may log in interactively; extra accounts must
+        already be authorized and are disabled otherwise.
+        """
+        for account in self.accounts.values():
+            if account.client.is_connected():
+                continue
+            try:
+                if account.is_primary:
+                    await account.client.start()
+                else:
+                    await account.client.connect()
+                    if not await account.client.is_user_authorized():
+                        self.mark_disabled(account, "session is not authorized")
+                        continue
+                logger.info(f"Telethon account {account.name} started")
+            except ACCOUNT_LOST_ERRORS as e:
+                self.mark_disabled(account, e.__class__.__name__)
+            except Exception as e:
+                if account.is_primary:
+                    raise
+                logger.error(f"Failed to start Telethon account {account.name}: {e}")
+
+    async def stop(self):
+        """Disconnect all accounts."""
+        for account in self.accounts.values():
+            if account.client.is_connected():
+                await account.client.disconnect()
+                logger.info(f"Telethon account {account.name} stopped")
+
+    def stats(self) -> dict[str, dict]:
+        """Get per-account load counters."""
+        return {name: account.stats() for name, account in self.accounts.items()}
+
+
+# Global account pool
+_account_pool: Optional[TelegramAccountPool] = None
+
+
+def get_account_pool() -> TelegramAccountPool:
+    """Get or create global account pool from settings."""
+    global _account_pool
+    if _account_pool is None:
+        settings = get_settings()
+        accounts = [
+            TelegramAccount(
+                name=PRIMARY_ACCOUNT,
+                client=create_telethon_client(Path(settings.tg_session_path)),
+            )
+        ]
+        for path in settings.tg_pool_sessions:
+            accounts.append(TelegramAccount(name=path.stem, client=create_telethon_client(path)))
+        _account_pool = TelegramAccountPool(accounts, settings.tg_account_ring_replicas)
+    return _account_pool
+
+
+def get_account_pool_stats() -> dict[str, dict]:
+    """Get per-account load counters of the global pool."""
+    return get_account_pool().stats()
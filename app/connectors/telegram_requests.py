@@ -0,0 +1,244 @@
+"""Request scheduling in front of the Telethon client.
+
+Every Telegram API call goes through `TelegramRequestScheduler.call` with the
+kind of request it makes. Each kind has its own token bucket, so bursts of
+media downloads cannot use up the quota of history polling, and a FloodWait
+pauses only the kind that caused it; the other kinds keep running. Short
+FloodWaits are waited out and retried once, longer ones are raised to the
+caller. Media downloads yield to queued history and resolve calls, which are
+cheap and keep ingestion moving.
+
+Limits are per Telegram account, so every client has its own scheduler. The
+clients are created with `flood_sleep_threshold=0` so FloodWaits reach this
+layer instead of being slept through inside Telethon.
+"""
+
+import asyncio
+import math
+import time
+import weakref
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from loguru import logger
+from telethon.errors import FloodWaitError
+
+from app.config import get_settings
+
+T = TypeVar("T")
+
+# Messages returned by one history request
+HISTORY_PAGE_SIZE = 100
+
+
+class RequestKind(str, Enum):
+    """Class of Telegram API request with its own rate limit."""
+
+    RESOLVE = "resolve"  # get_entity, dialogs
+    HISTORY = "history"  # GetHistory pages behind iter_messages
+    MEDIA = "media"  # File downloads
+
+
+# Kinds that make media downloads wait while any of them is queued
+PRIORITY_KINDS = frozenset({RequestKind.RESOLVE, RequestKind.HISTORY})
+
+
+def history_cost(limit: Optional[int]) -> int:
+    """Number of history requests needed to read `limit` messages."""
+    return max(1, math.ceil((limit or HISTORY_PAGE_SIZE) / HISTORY_PAGE_SIZE))
+
+
+class TokenBucket:
+    """Token bucket that hands out reservations.
+
+    A caller takes its tokens immediately, even into debt, and sleeps for the
+    returned delay; this keeps callers in arrival order without a lock.
+    """
+
+    def __init__(self, rate_per_second: float, capacity: float):
+        """Initialize a full bucket."""
+        self.rate = rate_per_second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, cost: float = 1.0, now: Optional[float] = None) -> float:
+        """Take `cost` tokens and return seconds to wait before using them."""
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= cost
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+@dataclass
+class RequestMetrics:
+    """Counters of one request kind."""
+
+    calls: int = 0
+    throttled: int = 0
+    wait_seconds: float = 0.0
+    flood_waits: int = 0
+    flood_wait_seconds: float = 0.0
+    flood_retries: int = 0
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "calls": self.calls,
+            "throttled": self.throttled,
+            "wait_seconds": round(self.wait_seconds, 1),
+            "flood_waits": self.flood_waits,
+            "flood_wait_seconds": round(self.flood_wait_seconds, 1),
+            "flood_retries": self.flood_retries,
+        }
+
+
+class TelegramRequestScheduler:
+    """Rate limiting, FloodWait handling and priorities for Telegram calls."""
+
+    def __init__(
+        self,
+        per_minute: dict[RequestKind, float],
+        burst: float,
+        max_auto_wait: float,
+    ):
+        """Initialize scheduler.
+
+        Args:
+            per_minute: Sustained request rate per kind
+            burst: Requests a kind may make at once after being idle
+            max_auto_wait: Longest FloodWait that is waited out and retried
+        """
+        self.max_auto_wait = max_auto_wait
+        self._buckets = {
+            kind: TokenBucket(rate / 60.0, max(1.0, burst))
+            for kind, rate in per_minute.items()
+        }
+        self._paused_until: dict[RequestKind, float] = {kind: 0.0 for kind in RequestKind}
+        self._metrics = {kind: RequestMetrics() for kind in RequestKind}
+        self._priority_waiting = 0
+        self._priority_idle = asyncio.Event()
+        self._priority_idle.set()
+
+    def pause(self, kind: RequestKind, seconds: float):
+        """Hold back all requests of a kind for `seconds`."""
+        until = time.monotonic() + seconds
+        if until > self._paused_until[kind]:
+            self._paused_until[kind] = until
+
+    def paused_for(self, kind: RequestKind) -> float:
+        """Seconds until requests of a kind are allowed again."""
+        return max(0.0, self._paused_until[kind] - time.monotonic())
+
+    async def _admit(self, kind: RequestKind, cost: float):
+        """Wait until a request of `kind` may be sent."""
+        metrics = self._metrics[kind]
+        metrics.calls += 1
+        started = time.monotonic()
+
+        if kind in PRIORITY_KINDS:
+            self._priority_waiting += 1
+            self._priority_idle.clear()
+        try:
+            if kind not in PRIORITY_KINDS:
+                await self._priority_idle.wait()
+
+            # Re-check after every sleep: a FloodWait may arrive meanwhile
+            while (pause := self.paused_for(kind)) > 0:
+                await asyncio.sleep(pause)
+
+            bucket = self._buckets.get(kind)
+            if bucket is not None:
+                delay = bucket.reserve(cost)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+        finally:
+            if kind in PRIORITY_KINDS:
+                self._priority_waiting -= 1
+                if self._priority_waiting == 0:
+                    self._priority_idle.set()
+
+        waited = time.monotonic() - started
+        if waited > 0.001:
+            metrics.throttled += 1
+            metrics.wait_seconds += waited
+
+    async def call(
+        self,
+        kind: RequestKind,
+        func: Callable[..., Awaitable[T]],
+        *args: Any,
+        cost: float = 1.0,
+        **kwargs: Any,
+    ) -> T:
+        """Run `func(*args, **kwargs)` as a request of `kind`.
+
+        Raises:
+            FloodWaitError: The wait is longer than `max_auto_wait`, or the
+                retry after waiting was flooded again
+        """
+        retried = False
+        while True:
+            await self._admit(kind, cost)
+            try:
+                return await func(*args, **kwargs)
+            except FloodWaitError as e:
+                metrics = self._metrics[kind]
+                metrics.flood_waits += 1
+                metrics.flood_wait_seconds += e.seconds
+                self.pause(kind, e.seconds)
+                logger.warning(f"Telegram FloodWait of {e.seconds}s, pausing {kind.value} requests")
+                if retried or e.seconds > self.max_auto_wait:
+                    raise
+                metrics.flood_retries += 1
+                retried = True
+
+    def metrics(self) -> dict[str, dict[str, float]]:
+        """Get per-kind counters and remaining pauses."""
+        result = {}
+        for kind in RequestKind:
+            stats = self._metrics[kind].as_dict()
+            stats["paused_seconds"] = round(self.paused_for(kind), 1)
+            result[kind.value] = stats
+        return result
+
+
+def create_request_scheduler() -> TelegramRequestScheduler:
+    """Create a scheduler with the configured limits (one per Telegram account)."""
+    settings = get_settings()
+    return TelegramRequestScheduler(
+        per_minute={
+            RequestKind.RESOLVE: settings.tg_resolve_requests_per_minute,
+            RequestKind.HISTORY: settings.tg_history_requests_per_minute,
+            RequestKind.MEDIA: settings.tg_media_requests_per_minute,
+        },
+        burst=settings.tg_request_burst,
+        max_auto_wait=settings.tg_flood_auto_wait_seconds,
+    )
+
+
+# Scheduler of each client; limits and FloodWaits are per account
+_client_schedulers: "weakref.WeakKeyDictionary[Any, TelegramRequestScheduler]" = (
+    weakref.WeakKeyDictionary()
+)
+_default_scheduler: Optional[TelegramRequestScheduler] = None
+
+
+def get_telegram_request_scheduler(client: Any = None) -> TelegramRequestScheduler:
+    """Get or create the request scheduler of a Telethon client.
+
+    Without a client, a shared scheduler is returned.
+    """
+    global _default_scheduler
+    if client is None:
+        if _default_scheduler is None:
+            _default_scheduler = create_request_scheduler()
+        return _default_scheduler
+
+    scheduler = _client_schedulers.get(client)
+    if scheduler is None:
+        scheduler = _client_schedulers[client] = create_request_scheduler()
+    return scheduler
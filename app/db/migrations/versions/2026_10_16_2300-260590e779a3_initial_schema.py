@@ -0,0 +1,156 @@
+"""Initial schema
+
+Tables as they were before migrations were kept in the repository.
+Databases created then (by `init_db` or a local autogenerated revision) are
+marked with `alembic stamp 260590e779a3` and then upgraded with
+`alembic upgrade head`.
+
+Revision ID: 260590e779a3
+Revises: 
+Create Date: 2026-10-16 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '260590e779a3'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('users',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('telegram_id', sa.BigInteger(), nullable=False),
+    sa.Column('username', sa.String(length=255), nullable=True),
+    sa.Column('first_name', sa.String(length=255), nullable=True),
+    sa.Column('last_name', sa.String(length=255), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('channels',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('owner_user_id', sa.BigInteger(), nullable=False),
+    sa.Column('telegram_id', sa.BigInteger(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('username', sa.String(length=255), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('publish_interval_minutes', sa.Integer(), nullable=False),
+    sa.Column('last_published_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('language', sa.String(length=10), nullable=True),
+    sa.Column('style_prompt', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['owner_user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('owner_user_id', 'telegram_id', name='uq_user_channel')
+    )
+    op.create_table('sources',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('owner_user_id', sa.BigInteger(), nullable=False),
+    sa.Column('source_type', sa.Enum('TELEGRAM', 'RSS', 'WEBSITE', name='sourcetype'), nullable=False),
+    sa.Column('handle', sa.String(length=255), nullable=True),
+    sa.Column('telegram_id', sa.BigInteger(), nullable=True),
+    sa.Column('url', sa.String(length=1024), nullable=True),
+    sa.Column('title', sa.String(length=255), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('check_interval_minutes', sa.Integer(), nullable=False),
+    sa.Column('last_checked_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_message_id', sa.BigInteger(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['owner_user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('bindings',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('source_id', sa.BigInteger(), nullable=False),
+    sa.Column('channel_id', sa.BigInteger(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['channel_id'], ['channels.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['source_id'], ['sources.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('source_id', 'channel_id', name='uq_source_channel')
+    )
+    op.create_table('raw_messages',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('owner_user_id', sa.BigInteger(), nullable=False),
+    sa.Column('source_id', sa.BigInteger(), nullable=False),
+    sa.Column('external_id', sa.String(length=255), nullable=True),
+    sa.Column('text', sa.Text(), nullable=True),
+    sa.Column('media_urls', sa.Text(), nullable=True),
+    sa.Column('media_paths', sa.Text(), nullable=True),
+    sa.Column('content_hash', sa.String(length=64), nullable=True),
+    sa.Column('is_processed', sa.Boolean(), nullable=False),
+    sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('published_at_source', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['owner_user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['source_id'], ['sources.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('posts',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('owner_user_id', sa.BigInteger(), nullable=False),
+    sa.Column('channel_id', sa.BigInteger(), nullable=False),
+    sa.Column('raw_message_id', sa.BigInteger(), nullable=True),
+    sa.Column('text', sa.Text(), nullable=False),
+    sa.Column('media_paths', sa.Text(), nullable=True),
+    sa.Column('status', sa.Enum('RAW', 'PROCESSING', 'READY', 'PUBLISHED', 'FAILED', 'SKIPPED', name='poststatus'), nullable=False),
+    sa.Column('telegram_message_id', sa.BigInteger(), nullable=True),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('retry_count', sa.Integer(), nullable=False),
+    sa.Column('scheduled_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('published_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['channel_id'], ['channels.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['owner_user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['raw_message_id'], ['raw_messages.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(op.f('ix_users_telegram_id'), 'users', ['telegram_id'], unique=True)
+    op.create_index(op.f('ix_channels_id'), 'channels', ['id'], unique=False)
+    op.create_index('ix_channels_owner_active', 'channels', ['owner_user_id', 'is_active'], unique=False)
+    op.create_index(op.f('ix_channels_owner_user_id'), 'channels', ['owner_user_id'], unique=False)
+    op.create_index(op.f('ix_sources_id'), 'sources', ['id'], unique=False)
+    op.create_index('ix_sources_owner_active', 'sources', ['owner_user_id', 'is_active'], unique=False)
+    op.create_index(op.f('ix_sources_owner_user_id'), 'sources', ['owner_user_id'], unique=False)
+    op.create_index('ix_sources_type', 'sources', ['source_type'], unique=False)
+    op.create_index(op.f('ix_bindings_channel_id'), 'bindings', ['channel_id'], unique=False)
+    op.create_index(op.f('ix_bindings_id'), 'bindings', ['id'], unique=False)
+    op.create_index(op.f('ix_bindings_source_id'), 'bindings', ['source_id'], unique=False)
+    op.create_index(op.f('ix_raw_messages_content_hash'), 'raw_messages', ['content_hash'], unique=False)
+    op.create_index(op.f('ix_raw_messages_created_at'), 'raw_messages', ['created_at'], unique=False)
+    op.create_index(op.f('ix_raw_messages_id'), 'raw_messages', ['id'], unique=False)
+    op.create_index(op.f('ix_raw_messages_owner_user_id'), 'raw_messages', ['owner_user_id'], unique=False)
+    op.create_index('ix_raw_messages_processed', 'raw_messages', ['is_processed', 'created_at'], unique=False)
+    op.create_index('ix_raw_messages_source_external', 'raw_messages', ['source_id', 'external_id'], unique=False)
+    op.create_index(op.f('ix_raw_messages_source_id'), 'raw_messages', ['source_id'], unique=False)
+    op.create_index(op.f('ix_posts_channel_id'), 'posts', ['channel_id'], unique=False)
+    op.create_index('ix_posts_channel_status', 'posts', ['channel_id', 'status'], unique=False)
+    op.create_index(op.f('ix_posts_id'), 'posts', ['id'], unique=False)
+    op.create_index(op.f('ix_posts_owner_user_id'), 'posts', ['owner_user_id'], unique=False)
+    op.create_index(op.f('ix_posts_raw_message_id'), 'posts', ['raw_message_id'], unique=False)
+    op.create_index(op.f('ix_posts_status'), 'posts', ['status'], unique=False)
+    op.create_index('ix_posts_status_created', 'posts', ['status', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_table('posts')
+    op.drop_table('raw_messages')
+    op.drop_table('bindings')
+    op.drop_table('sources')
+    op.drop_table('channels')
+    op.drop_table('users')
+    sa.Enum(name='poststatus').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='sourcetype').drop(op.get_bind(), checkfirst=True)
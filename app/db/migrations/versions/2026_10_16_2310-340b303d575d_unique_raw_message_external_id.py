@@ -0,0 +1,45 @@
+"""Unique raw message external ID per source
+
+Bulk inserts skip known entries with ON CONFLICT on this constraint.
+Duplicates stored before it existed are deleted first, keeping the oldest
+row (posts of deleted rows lose their raw message link).
+
+Revision ID: 340b303d575d
+Revises: 260590e779a3
+Create Date: 2026-10-16 23:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '340b303d575d'
+down_revision: Union[str, None] = '260590e779a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        sa.text(
+            "DELETE FROM raw_messages AS duplicate USING raw_messages AS original "
+            "WHERE duplicate.source_id = original.source_id "
+            "AND duplicate.external_id = original.external_id "
+            "AND duplicate.id > original.id"
+        )
+    )
+    op.drop_index('ix_raw_messages_source_external', table_name='raw_messages')
+    op.create_unique_constraint(
+        'uq_raw_message_source_external', 'raw_messages', ['source_id', 'external_id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_raw_message_source_external', 'raw_messages', type_='unique')
+    op.create_index(
+        'ix_raw_messages_source_external', 'raw_messages', ['source_id', 'external_id'],
+        unique=False,
+    )
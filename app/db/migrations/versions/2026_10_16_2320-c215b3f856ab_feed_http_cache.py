@@ -0,0 +1,30 @@
+"""HTTP cache validators and body hash of feed sources
+
+Revision ID: c215b3f856ab
+Revises: 340b303d575d
+Create Date: 2026-10-16 23:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c215b3f856ab'
+down_revision: Union[str, None] = '340b303d575d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('sources', sa.Column('http_etag', sa.String(length=255), nullable=True))
+    op.add_column('sources', sa.Column('http_last_modified', sa.String(length=64), nullable=True))
+    op.add_column('sources', sa.Column('feed_body_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('sources', 'feed_body_hash')
+    op.drop_column('sources', 'http_last_modified')
+    op.drop_column('sources', 'http_etag')
@@ -0,0 +1,26 @@
+"""Stored access hash of Telegram sources
+
+Revision ID: ab780df4513b
+Revises: c215b3f856ab
+Create Date: 2026-10-16 23:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ab780df4513b'
+down_revision: Union[str, None] = 'c215b3f856ab'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('sources', sa.Column('telegram_access_hash', sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('sources', 'telegram_access_hash')
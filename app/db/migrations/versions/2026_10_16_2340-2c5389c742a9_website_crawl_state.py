@@ -0,0 +1,26 @@
+"""Crawl frontier of website sources
+
+Revision ID: 2c5389c742a9
+Revises: ab780df4513b
+Create Date: 2026-10-16 23:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c5389c742a9'
+down_revision: Union[str, None] = 'ab780df4513b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('sources', sa.Column('crawl_state', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('sources', 'crawl_state')
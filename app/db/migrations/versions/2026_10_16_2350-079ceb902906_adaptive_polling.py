@@ -0,0 +1,30 @@
+"""Learned posting rate and check interval of sources
+
+Revision ID: 079ceb902906
+Revises: 2c5389c742a9
+Create Date: 2026-10-16 23:50:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '079ceb902906'
+down_revision: Union[str, None] = '2c5389c742a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('sources', sa.Column('publish_gap_seconds', sa.Integer(), nullable=True))
+    op.add_column('sources', sa.Column('last_published_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('sources', sa.Column('poll_interval_seconds', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('sources', 'poll_interval_seconds')
+    op.drop_column('sources', 'last_published_at')
+    op.drop_column('sources', 'publish_gap_seconds')
@@ -0,0 +1,41 @@
+"""Failure tracking and circuit state of sources
+
+Revision ID: 9d2b0796c957
+Revises: 079ceb902906
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d2b0796c957'
+down_revision: Union[str, None] = '079ceb902906'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+circuit_state = sa.Enum('CLOSED', 'OPEN', 'QUARANTINED', name='circuitstate')
+
+
+def upgrade() -> None:
+    circuit_state.create(op.get_bind(), checkfirst=True)
+    # Existing sources start healthy; the defaults only fill existing rows
+    op.add_column('sources', sa.Column('circuit_state', circuit_state, server_default='CLOSED', nullable=False))
+    op.add_column('sources', sa.Column('failure_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('sources', sa.Column('last_error', sa.Text(), nullable=True))
+    op.add_column('sources', sa.Column('last_failure_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('sources', sa.Column('next_retry_at', sa.DateTime(timezone=True), nullable=True))
+    op.alter_column('sources', 'circuit_state', server_default=None)
+    op.alter_column('sources', 'failure_count', server_default=None)
+
+
+def downgrade() -> None:
+    op.drop_column('sources', 'next_retry_at')
+    op.drop_column('sources', 'last_failure_at')
+    op.drop_column('sources', 'last_error')
+    op.drop_column('sources', 'failure_count')
+    op.drop_column('sources', 'circuit_state')
+    circuit_state.drop(op.get_bind(), checkfirst=True)
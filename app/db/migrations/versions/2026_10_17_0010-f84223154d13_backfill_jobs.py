@@ -0,0 +1,61 @@
+"""Backfill jobs and archive flag of raw messages
+
+Revision ID: f84223154d13
+Revises: 9d2b0796c957
+Create Date: 2026-10-17 00:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f84223154d13'
+down_revision: Union[str, None] = '9d2b0796c957'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('backfill_jobs',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('owner_user_id', sa.BigInteger(), nullable=False),
+    sa.Column('source_id', sa.BigInteger(), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'RUNNING', 'DONE', 'FAILED', name='backfillstatus'), nullable=False),
+    sa.Column('cursor', sa.String(length=1024), nullable=True),
+    sa.Column('max_items', sa.Integer(), nullable=False),
+    sa.Column('items_ingested', sa.Integer(), nullable=False),
+    sa.Column('pages_fetched', sa.Integer(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['owner_user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['source_id'], ['sources.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_backfill_jobs_id'), 'backfill_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_backfill_jobs_owner_user_id'), 'backfill_jobs', ['owner_user_id'], unique=False)
+    op.create_index(op.f('ix_backfill_jobs_source_id'), 'backfill_jobs', ['source_id'], unique=False)
+    op.create_index('ix_backfill_jobs_status', 'backfill_jobs', ['status', 'created_at'], unique=False)
+
+    # Messages stored so far are all live ones
+    op.add_column('raw_messages', sa.Column('is_archive', sa.Boolean(), server_default=sa.false(), nullable=False))
+    op.alter_column('raw_messages', 'is_archive', server_default=None)
+    op.drop_index('ix_raw_messages_processed', table_name='raw_messages')
+    op.create_index('ix_raw_messages_processed', 'raw_messages', ['is_processed', 'is_archive', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_raw_messages_processed', table_name='raw_messages')
+    op.create_index('ix_raw_messages_processed', 'raw_messages', ['is_processed', 'created_at'], unique=False)
+    op.drop_column('raw_messages', 'is_archive')
+
+    op.drop_index('ix_backfill_jobs_status', table_name='backfill_jobs')
+    op.drop_index(op.f('ix_backfill_jobs_source_id'), table_name='backfill_jobs')
+    op.drop_index(op.f('ix_backfill_jobs_owner_user_id'), table_name='backfill_jobs')
+    op.drop_index(op.f('ix_backfill_jobs_id'), table_name='backfill_jobs')
+    op.drop_table('backfill_jobs')
+    sa.Enum(name='backfillstatus').drop(op.get_bind(), checkfirst=True)
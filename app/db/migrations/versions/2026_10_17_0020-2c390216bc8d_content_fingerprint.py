@@ -0,0 +1,28 @@
+"""Content fingerprint of raw messages
+
+Revision ID: 2c390216bc8d
+Revises: f84223154d13
+Create Date: 2026-10-17 00:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c390216bc8d'
+down_revision: Union[str, None] = 'f84223154d13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('raw_messages', sa.Column('content_fingerprint', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_raw_messages_content_fingerprint'), 'raw_messages', ['content_fingerprint'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_raw_messages_content_fingerprint'), table_name='raw_messages')
+    op.drop_column('raw_messages', 'content_fingerprint')
@@ -0,0 +1,26 @@
+"""Cached publish text of posts
+
+Revision ID: a6b3c346fe56
+Revises: 2c390216bc8d
+Create Date: 2026-10-17 00:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6b3c346fe56'
+down_revision: Union[str, None] = '2c390216bc8d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('posts', sa.Column('formatted_text', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('posts', 'formatted_text')
@@ -41,6 +41,23 @@ class PostStatus(str, PyEnum):
     SKIPPED = "skipped"  # Skipped (duplicate, moderation, etc.)
 
 
+class CircuitState(str, PyEnum):
+    """Ingestion health of a source."""
+
+    CLOSED = "closed"  # Healthy, checked on its normal interval
+    OPEN = "open"  # Failing repeatedly, retried with exponential backoff
+    QUARANTINED = "quarantined"  # Deactivated after too many consecutive failures
+
+
+class BackfillStatus(str, PyEnum):
+    """Status of a historical backfill job."""
+
+    PENDING = "pending"  # Waiting for the worker
+    RUNNING = "running"  # Started; resumes from its cursor
+    DONE = "done"
+    FAILED = "failed"
+
+
 class User(Base):
     """Telegram user who owns channels and sources."""
 
@@ -134,6 +151,7 @@ class Source(Base):
     # Source identification
     handle: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)  # @channel or URL
     telegram_id: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    telegram_access_hash: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
     url: Mapped[Optional[str]] = mapped_column(String(1024), nullable=True)
     
     title: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
@@ -146,6 +164,34 @@ class Source(Base):
     )
     last_message_id: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
     
+    # Adaptive polling: learned posting rate and the interval chosen from it
+    publish_gap_seconds: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    last_published_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    poll_interval_seconds: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    
+    # Failure tracking (circuit breaker)
+    circuit_state: Mapped[CircuitState] = mapped_column(
+        Enum(CircuitState), default=CircuitState.CLOSED, nullable=False
+    )
+    failure_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    last_failure_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    next_retry_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    
+    # HTTP caching (RSS/website): validators and hash of the last fetched body
+    http_etag: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    http_last_modified: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    feed_body_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+
+    # Website crawl frontier (JSON): sitemaps, validators, seen and pending URLs
+    crawl_state: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -216,9 +262,15 @@ class RawMessage(Base):
     
     # Content hash for deduplication
     content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, index=True)
+    # Hash of canonical text (links, emoji, signatures removed) for cross-source deduplication
+    content_fingerprint: Mapped[Optional[str]] = mapped_column(
+        String(64), nullable=True, index=True
+    )
     
     # Processing
     is_processed: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    # Backfilled history: stored for reference/deduplication, never rewritten
+    is_archive: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     
     published_at_source: Mapped[Optional[datetime]] = mapped_column(
@@ -236,8 +288,8 @@ class RawMessage(Base):
     )
 
     __table_args__ = (
-        Index("ix_raw_messages_source_external", "source_id", "external_id"),
-        Index("ix_raw_messages_processed", "is_processed", "created_at"),
+        UniqueConstraint("source_id", "external_id", name="uq_raw_message_source_external"),
+        Index("ix_raw_messages_processed", "is_processed", "is_archive", "created_at"),
     )
 
 
@@ -259,6 +311,8 @@ class Post(Base):
     
     # Post content
     text: Mapped[str] = mapped_column(Text, nullable=False)
+    # Publish-ready text (normalized, truncated); reset when text changes
+    formatted_text: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     media_paths: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # JSON array
     
     # Publishing status
@@ -295,3 +349,39 @@ class Post(Base):
         Index("ix_posts_status_created", "status", "created_at"),
     )
 
+
+class BackfillJob(Base):
+    """Resumable historical backfill of one source."""
+
+    __tablename__ = "backfill_jobs"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, index=True)
+    owner_user_id: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    source_id: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey("sources.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    status: Mapped[BackfillStatus] = mapped_column(
+        Enum(BackfillStatus), default=BackfillStatus.PENDING, nullable=False
+    )
+    
+    # Checkpoint: Telegram offset message ID or URL of the next feed page
+    cursor: Mapped[Optional[str]] = mapped_column(String(1024), nullable=True)
+    max_items: Mapped[int] = mapped_column(Integer, nullable=False)
+    items_ingested: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    pages_fetched: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_backfill_jobs_status", "status", "created_at"),
+    )
+
@@ -1,9 +1,10 @@
 """Database repository for CRUD operations."""
 
 from datetime import datetime
-from typing import Optional, Sequence
+from typing import Any, Iterable, Optional, Sequence
 
-from sqlalchemy import select, update, delete, and_, or_
+from sqlalchemy import select, update, delete, and_, or_, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -16,6 +17,8 @@ from app.db.models import (
     Post,
     SourceType,
     PostStatus,
+    BackfillJob,
+    BackfillStatus,
 )
 
 
@@ -175,17 +178,49 @@ class Repository:
         return result.scalars().all()
 
     async def update_source(
-        self, source_id: int, owner_user_id: int, **kwargs
+        self, source_id: int, owner_user_id: int, touch: bool = True, **kwargs
     ) -> Optional[Source]:
-        """Update source fields."""
+        """Update source fields.
+
+        The worker picks up edited sources by `updated_at`; ingestion
+        bookkeeping (check times, cursors, validators) passes `touch=False`
+        to leave it alone.
+        """
         source = await self.get_source(source_id, owner_user_id)
         if source:
             for key, value in kwargs.items():
                 if hasattr(source, key):
                     setattr(source, key, value)
+            if not touch:
+                # An explicit value suppresses the onupdate default
+                source.updated_at = Source.updated_at
             await self.session.flush()
         return source
 
+    async def advance_source_watermark(
+        self, source_id: int, owner_user_id: int, message_id: Optional[int]
+    ):
+        """Raise a source's `last_message_id` to `message_id`, never lowering it.
+
+        Polls and pushed messages of a channel may be stored in any order, so
+        the stored value is the maximum of both. `updated_at` is left alone.
+        """
+        if message_id is None:
+            return
+        stmt = (
+            update(Source)
+            .where(and_(Source.id == source_id, Source.owner_user_id == owner_user_id))
+            .values(
+                last_message_id=func.greatest(
+                    func.coalesce(Source.last_message_id, 0), message_id
+                ),
+                updated_at=Source.updated_at,
+            )
+            # Loaded sources keep their value instead of being expired
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(stmt)
+
     async def delete_source(self, source_id: int, owner_user_id: int) -> bool:
         """Delete a source."""
         stmt = delete(Source).where(
@@ -243,6 +278,7 @@ class Repository:
         media_paths: Optional[str] = None,
         content_hash: Optional[str] = None,
         published_at_source: Optional[datetime] = None,
+        content_fingerprint: Optional[str] = None,
     ) -> RawMessage:
         """Create a raw message."""
         raw_message = RawMessage(
@@ -253,6 +289,7 @@ class Repository:
             media_urls=media_urls,
             media_paths=media_paths,
             content_hash=content_hash,
+            content_fingerprint=content_fingerprint,
             published_at_source=published_at_source,
         )
         self.session.add(raw_message)
@@ -279,6 +316,7 @@ class Repository:
                 and_(
                     RawMessage.owner_user_id == owner_user_id,
                     RawMessage.is_processed == False,
+                    RawMessage.is_archive == False,
                 )
             )
             .order_by(RawMessage.created_at.asc())
@@ -301,6 +339,208 @@ class Repository:
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none() is not None
 
+    async def get_existing_external_ids(
+        self, source_id: int, owner_user_id: int, external_ids: Iterable[str]
+    ) -> set[str]:
+        """Get which of the given external IDs are already stored for a source."""
+        external_ids = list({eid for eid in external_ids if eid})
+        if not external_ids:
+            return set()
+
+        stmt = select(RawMessage.external_id).where(
+            and_(
+                RawMessage.owner_user_id == owner_user_id,
+                RawMessage.source_id == source_id,
+                RawMessage.external_id.in_(external_ids),
+            )
+        )
+        result = await self.session.execute(stmt)
+        return set(result.scalars().all())
+
+    async def get_recent_external_ids(
+        self, source_id: int, owner_user_id: int, limit: int = 100
+    ) -> set[str]:
+        """Get external IDs of the most recently stored messages of a source."""
+        stmt = (
+            select(RawMessage.external_id)
+            .where(
+                and_(
+                    RawMessage.owner_user_id == owner_user_id,
+                    RawMessage.source_id == source_id,
+                    RawMessage.external_id.isnot(None),
+                )
+            )
+            .order_by(RawMessage.id.desc())
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return set(result.scalars().all())
+
+    async def get_recent_publish_times(
+        self, source_id: int, owner_user_id: int, limit: int = 50
+    ) -> list[datetime]:
+        """Get publish times of the newest messages of a source, newest first."""
+        stmt = (
+            select(RawMessage.published_at_source)
+            .where(
+                and_(
+                    RawMessage.owner_user_id == owner_user_id,
+                    RawMessage.source_id == source_id,
+                    RawMessage.published_at_source.isnot(None),
+                )
+            )
+            .order_by(RawMessage.published_at_source.desc())
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def find_earlier_duplicate(
+        self, owner_user_id: int, content_fingerprint: str, before_id: int, since: datetime
+    ) -> Optional[int]:
+        """Get ID of an earlier raw message of the owner with the same content fingerprint.
+
+        Only messages stored since `since` are considered.
+        """
+        stmt = (
+            select(RawMessage.id)
+            .where(
+                and_(
+                    RawMessage.content_fingerprint == content_fingerprint,
+                    RawMessage.owner_user_id == owner_user_id,
+                    RawMessage.id < before_id,
+                    RawMessage.created_at >= since,
+                )
+            )
+            .order_by(RawMessage.id.asc())
+            .limit(1)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def get_recent_content_fingerprints(
+        self, since: datetime, limit: int
+    ) -> list[tuple[int, str]]:
+        """Get (owner_user_id, content_fingerprint) of raw messages created since a time."""
+        stmt = (
+            select(RawMessage.owner_user_id, RawMessage.content_fingerprint)
+            .where(
+                and_(
+                    RawMessage.created_at >= since,
+                    RawMessage.content_fingerprint.isnot(None),
+                )
+            )
+            .order_by(RawMessage.created_at.desc())
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return [(row.owner_user_id, row.content_fingerprint) for row in result]
+
+    async def get_raw_message_texts_after(
+        self, after_id: int, limit: int
+    ) -> list[tuple[int, Optional[str]]]:
+        """Get (id, text) of raw messages without a fingerprint, by ID after `after_id`."""
+        stmt = (
+            select(RawMessage.id, RawMessage.text)
+            .where(
+                and_(
+                    RawMessage.id > after_id,
+                    RawMessage.content_fingerprint.is_(None),
+                )
+            )
+            .order_by(RawMessage.id.asc())
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return [(row.id, row.text) for row in result]
+
+    async def set_content_fingerprints(self, fingerprints: dict[int, str]):
+        """Store content fingerprints of raw messages by ID."""
+        if not fingerprints:
+            return
+        await self.session.execute(
+            update(RawMessage),
+            [
+                {"id": message_id, "content_fingerprint": fingerprint}
+                for message_id, fingerprint in fingerprints.items()
+            ],
+        )
+
+    async def get_recent_processed_texts(
+        self, owner_user_id: int, since: datetime, limit: int
+    ) -> list[tuple[int, str, datetime]]:
+        """Get (id, text, published time) of the owner's processed live messages, oldest first.
+
+        The published time is the source's publish time, capped at the time
+        the message was stored. Backfilled archive rows are not included.
+        """
+        published_at = func.least(RawMessage.published_at_source, RawMessage.created_at)
+        stmt = (
+            select(RawMessage.id, RawMessage.text, published_at.label("published_at"))
+            .where(
+                and_(
+                    RawMessage.owner_user_id == owner_user_id,
+                    RawMessage.created_at >= since,
+                    published_at >= since,
+                    RawMessage.text.isnot(None),
+                    RawMessage.is_processed == True,
+                    RawMessage.is_archive == False,
+                )
+            )
+            .order_by(published_at.desc())
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return [(row.id, row.text, row.published_at) for row in reversed(result.all())]
+
+    async def bulk_create_raw_messages(
+        self, owner_user_id: int, source_id: int, rows: Sequence[dict[str, Any]]
+    ) -> list[int]:
+        """Insert many raw messages in one statement, skipping known ones.
+
+        Rows accept the same keys as `create_raw_message` plus `is_archive`.
+        Conflicts on (source_id, external_id) are ignored.
+
+        Returns:
+            IDs of actually inserted raw messages (PostgreSQL does not
+            guarantee RETURNING order, so they are not matched to `rows`)
+        """
+        if not rows:
+            return []
+
+        values = []
+        seen: set[str] = set()
+        for row in rows:
+            external_id = row.get("external_id")
+            if external_id is not None:
+                if external_id in seen:
+                    continue
+                seen.add(external_id)
+            values.append(
+                {
+                    "owner_user_id": owner_user_id,
+                    "source_id": source_id,
+                    "external_id": external_id,
+                    "text": row.get("text"),
+                    "media_urls": row.get("media_urls"),
+                    "media_paths": row.get("media_paths"),
+                    "content_hash": row.get("content_hash"),
+                    "content_fingerprint": row.get("content_fingerprint"),
+                    "published_at_source": row.get("published_at_source"),
+                    "is_processed": False,
+                    "is_archive": row.get("is_archive", False),
+                }
+            )
+
+        stmt = (
+            pg_insert(RawMessage)
+            .values(values)
+            .on_conflict_do_nothing(constraint="uq_raw_message_source_external")
+            .returning(RawMessage.id)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
     async def mark_message_processed(self, message_id: int, owner_user_id: int) -> bool:
         """Mark raw message as processed."""
         stmt = (
@@ -326,6 +566,8 @@ class Repository:
         raw_message_id: Optional[int] = None,
         media_paths: Optional[str] = None,
         status: PostStatus = PostStatus.READY,
+        error_message: Optional[str] = None,
+        formatted_text: Optional[str] = None,
     ) -> Post:
         """Create a post."""
         post = Post(
@@ -333,8 +575,10 @@ class Repository:
             channel_id=channel_id,
             raw_message_id=raw_message_id,
             text=text,
+            formatted_text=formatted_text,
             media_paths=media_paths,
             status=status,
+            error_message=error_message,
         )
         self.session.add(post)
         await self.session.flush()
@@ -379,9 +623,11 @@ class Repository:
     async def update_post(
         self, post_id: int, owner_user_id: int, **kwargs
     ) -> Optional[Post]:
-        """Update post fields."""
+        """Update post fields (a new text drops the cached formatted text)."""
         post = await self.get_post(post_id, owner_user_id)
         if post:
+            if "text" in kwargs:
+                kwargs.setdefault("formatted_text", None)
             for key, value in kwargs.items():
                 if hasattr(post, key):
                     setattr(post, key, value)
@@ -422,3 +668,48 @@ class Repository:
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
+    # ==================== Backfill Operations ====================
+
+    async def create_backfill_job(
+        self, owner_user_id: int, source_id: int, max_items: int
+    ) -> BackfillJob:
+        """Create a backfill job, or return the unfinished one of the source."""
+        stmt = select(BackfillJob).where(
+            and_(
+                BackfillJob.owner_user_id == owner_user_id,
+                BackfillJob.source_id == source_id,
+                BackfillJob.status.in_([BackfillStatus.PENDING, BackfillStatus.RUNNING]),
+            )
+        )
+        result = await self.session.execute(stmt)
+        job = result.scalars().first()
+        if job is not None:
+            return job
+
+        job = BackfillJob(
+            owner_user_id=owner_user_id,
+            source_id=source_id,
+            max_items=max_items,
+            status=BackfillStatus.PENDING,
+        )
+        self.session.add(job)
+        await self.session.flush()
+        return job
+
+    async def get_next_backfill_job(self) -> Optional[BackfillJob]:
+        """Get the job to work on next (interrupted jobs first, then oldest pending)."""
+        stmt = (
+            select(BackfillJob)
+            .where(BackfillJob.status.in_([BackfillStatus.RUNNING, BackfillStatus.PENDING]))
+            .order_by(
+                (BackfillJob.status == BackfillStatus.RUNNING).desc(),
+                BackfillJob.created_at.asc(),
+            )
+            .limit(1)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def get_backfill_job(self, job_id: int) -> Optional[BackfillJob]:
+        """Get backfill job by ID."""
+        return await self.session.get(BackfillJob, job_id)
@@ -6,6 +6,7 @@ import aiohttp
 from loguru import logger
 
 from app.config import get_settings
+from app.utils.http import get_llm_http_session
 
 
 class LLMClient:
@@ -41,24 +42,24 @@ class LLMClient:
             payload["max_tokens"] = max_tokens
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload, headers=headers) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(
-                            f"OpenAI API error: {response.status} - {error_text}"
-                        )
-                        return None
-
-                    data = await response.json()
-                    
-                    if "choices" in data and len(data["choices"]) > 0:
-                        content = data["choices"][0]["message"]["content"]
-                        return content.strip()
-                    
-                    logger.error(f"Unexpected API response: {data}")
+            session = get_llm_http_session()
+            async with session.post(url, json=payload, headers=headers) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    logger.error(
+                        f"OpenAI API error: {response.status} - {error_text}"
+                    )
                     return None
 
+                data = await response.json()
+                
+                if "choices" in data and len(data["choices"]) > 0:
+                    content = data["choices"][0]["message"]["content"]
+                    return content.strip()
+                
+                logger.error(f"Unexpected API response: {data}")
+                return None
+
         except aiohttp.ClientError as e:
             logger.error(f"HTTP client error: {e}", exc_info=True)
             return None
@@ -70,6 +70,7 @@ async def rewrite_post(
     raw_text: str,
     channel_language: Optional[str] = None,
     channel_style: Optional[str] = None,
+    source_language: Optional[str] = None,
 ) -> Optional[str]:
     """Rewrite a post for a specific channel.
     
@@ -77,6 +78,8 @@ async def rewrite_post(
         raw_text: Original raw text
         channel_language: Target language for the channel
         channel_style: Custom style prompt for the channel
+        source_language: Detected language of the original, kept when the
+            channel has no language of its own
     
     Returns:
         Rewritten text ready for publishing or None
@@ -84,7 +87,7 @@ async def rewrite_post(
     return await rewrite_text(
         text=raw_text,
         style="neutral",
-        language=channel_language,
+        language=channel_language or source_language,
         custom_prompt=channel_style,
         temperature=0.7,
     )
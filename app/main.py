@@ -11,10 +11,11 @@ from loguru import logger
 from app.adminbot.access import EnsureUserMiddleware
 from app.adminbot.router import router as admin_router
 from app.config import get_settings
-from app.connectors.telegram_ingestor import start_telethon_client, stop_telethon_client
 from app.db.base import close_db
 from app.logging_conf import setup_logging
 from app.publisher.scheduler import init_scheduler, shutdown_scheduler
+from app.utils.executor import shutdown_cpu_executor, start_loop_lag_monitor
+from app.utils.http import close_http_client, start_http_client
 
 
 # Global objects
@@ -28,13 +29,12 @@ async def on_startup():
     
     settings = get_settings()
     
-    # Initialize Telethon client for reading channels
-    try:
-        await start_telethon_client()
-        logger.info("Telethon client started")
-    except Exception as e:
-        logger.error(f"Failed to start Telethon client: {e}", exc_info=True)
-        logger.warning("Bot will work without Telegram source ingestion")
+    # Initialize shared HTTP client and event-loop lag monitor
+    await start_http_client()
+    start_loop_lag_monitor()
+    
+    # Telethon sessions are owned by the worker; Telegram reads needed here
+    # go through its gateway (app.connectors.telegram_gateway)
     
     # Initialize publisher scheduler
     try:
@@ -56,11 +56,14 @@ async def on_shutdown():
     except Exception as e:
         logger.error(f"Error shutting down scheduler: {e}")
     
-    # Stop Telethon client
+    # Close shared HTTP client
     try:
-        await stop_telethon_client()
+        await close_http_client()
     except Exception as e:
-        logger.error(f"Error stopping Telethon: {e}")
+        logger.error(f"Error closing HTTP client: {e}")
+    
+    # Shut down CPU executor
+    shutdown_cpu_executor()
     
     # Close database connections
     try:
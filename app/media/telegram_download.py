@@ -0,0 +1,200 @@
+"""Telegram media download pipeline.
+
+Downloads run on a bounded worker pool, oversized files are skipped before
+any byte is transferred, and photos are fetched in the smallest variant that
+is still large enough for publishing. Telethon streams every download straight
+into the target file.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+from loguru import logger
+from telethon.tl.types import Message as TelethonMessage, PhotoSize, PhotoSizeProgressive
+
+from app.config import get_settings
+from app.connectors.telegram_requests import RequestKind, get_telegram_request_scheduler
+
+
+@dataclass
+class MediaDownloadStats:
+    """Counters of the media download pipeline."""
+
+    downloaded: int = 0
+    failed: int = 0
+    skipped_too_large: int = 0
+    bytes_downloaded: int = 0
+    busy_seconds: float = 0.0
+    by_reason: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def throughput_bps(self) -> float:
+        """Average per-download throughput in bytes per second."""
+        return self.bytes_downloaded / self.busy_seconds if self.busy_seconds else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.downloaded} downloaded ({self.bytes_downloaded / 1024 / 1024:.1f} MiB, "
+            f"{self.throughput_bps / 1024:.0f} KiB/s), "
+            f"{self.skipped_too_large} skipped as too large, {self.failed} failed"
+        )
+
+
+def _photo_size_bytes(size) -> int:
+    """Get byte size of a PhotoSize variant (0 if unknown)."""
+    if isinstance(size, PhotoSizeProgressive):
+        return max(size.sizes) if size.sizes else 0
+    if isinstance(size, PhotoSize):
+        return size.size
+    return 0
+
+
+def choose_photo_size(sizes: Iterable, target_px: int):
+    """Pick the smallest photo variant whose longer side reaches `target_px`.
+
+    Falls back to the largest variant when none is big enough. Inline
+    thumbnails (stripped/cached sizes) are never chosen.
+    """
+    candidates = [
+        size for size in sizes if isinstance(size, (PhotoSize, PhotoSizeProgressive))
+    ]
+    if not candidates:
+        return None
+
+    candidates.sort(key=lambda size: max(size.w, size.h))
+    for size in candidates:
+        if max(size.w, size.h) >= target_px:
+            return size
+    return candidates[-1]
+
+
+class MediaDownloader:
+    """Bounded-concurrency, size-aware media downloader."""
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        max_file_bytes: Optional[int] = None,
+        photo_target_px: Optional[int] = None,
+    ):
+        """Initialize downloader from settings (overridable for tests)."""
+        settings = get_settings()
+        self.concurrency = max(1, concurrency or settings.media_download_concurrency)
+        self.max_file_bytes = max_file_bytes or settings.media_max_file_mb * 1024 * 1024
+        self.photo_target_px = photo_target_px or settings.media_photo_target_px
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self.stats = MediaDownloadStats()
+
+    def _skip(self, reason: str):
+        self.stats.skipped_too_large += 1
+        self.stats.by_reason[reason] = self.stats.by_reason.get(reason, 0) + 1
+
+    def plan(self, message: TelethonMessage) -> tuple[bool, Optional[object], int]:
+        """Decide whether and what to download.
+
+        Returns:
+            (should_download, photo thumb variant or None, expected bytes)
+        """
+        if message.photo:
+            size = choose_photo_size(message.photo.sizes, self.photo_target_px)
+            if size is None:
+                return False, None, 0
+            expected = _photo_size_bytes(size)
+            if expected > self.max_file_bytes:
+                self._skip("photo")
+                return False, None, expected
+            return True, size, expected
+
+        expected = message.file.size if message.file and message.file.size else 0
+        if expected > self.max_file_bytes:
+            self._skip("video" if message.video else "document")
+            return False, None, expected
+        return True, None, expected
+
+    async def download(self, message: TelethonMessage, storage_path: Path) -> Optional[str]:
+        """Download media of one message to storage and return local path."""
+        if not message.media:
+            return None
+
+        should_download, thumb, expected = self.plan(message)
+        if not should_download:
+            if expected:
+                logger.info(
+                    f"Skipping media of message {message.id}: "
+                    f"{expected / 1024 / 1024:.1f} MiB exceeds limit"
+                )
+            return None
+
+        # Create unique filename (Telethon appends the proper extension)
+        filename = f"tg_{message.chat_id}_{message.id}_{datetime.utcnow().timestamp()}"
+
+        async with self._semaphore:
+            started = time.monotonic()
+            try:
+                # A file path makes Telethon stream chunks directly to disk
+                kwargs = {"file": str(storage_path / filename)}
+                if thumb is not None:
+                    # Telethon matches sizes by type; it rejects PhotoSizeProgressive objects
+                    kwargs["thumb"] = thumb.type
+                path = await get_telegram_request_scheduler(message.client).call(
+                    RequestKind.MEDIA, message.download_media, **kwargs
+                )
+            except Exception as e:
+                self.stats.failed += 1
+                logger.error(f"Error downloading media: {e}", exc_info=True)
+                return None
+            finally:
+                self.stats.busy_seconds += time.monotonic() - started
+
+        if not path:
+            self.stats.failed += 1
+            return None
+
+        self.stats.downloaded += 1
+        try:
+            self.stats.bytes_downloaded += Path(path).stat().st_size
+        except OSError:
+            self.stats.bytes_downloaded += expected
+
+        logger.debug(f"Downloaded media to {path}")
+        return str(path)
+
+    async def download_many(
+        self, messages: Iterable[TelethonMessage], storage_path: Path
+    ) -> dict[int, Optional[str]]:
+        """Download media of many messages in parallel.
+
+        Returns:
+            Mapping of message ID to local path (None if skipped or failed)
+        """
+        with_media = [message for message in messages if message.media]
+        if not with_media:
+            return {}
+
+        started = time.monotonic()
+        paths = await asyncio.gather(
+            *(self.download(message, storage_path) for message in with_media)
+        )
+        elapsed = time.monotonic() - started
+
+        logger.info(
+            f"Media batch of {len(with_media)} files in {elapsed:.1f}s; "
+            f"totals: {self.stats.summary()}"
+        )
+        return {message.id: path for message, path in zip(with_media, paths)}
+
+
+# Global downloader instance
+_media_downloader: Optional[MediaDownloader] = None
+
+
+def get_media_downloader() -> MediaDownloader:
+    """Get or create global media downloader."""
+    global _media_downloader
+    if _media_downloader is None:
+        _media_downloader = MediaDownloader()
+    return _media_downloader
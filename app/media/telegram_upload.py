@@ -26,7 +26,7 @@ async def upload_media_group(
     try:
         media_group = []
         
-        for i, path in enumerate(media_paths[:10]):  # Telegram limit: 10 media per group
+        for path in media_paths[:10]:  # Telegram limit: 10 media per group
             if not Path(path).exists():
                 logger.warning(f"Media file not found: {path}")
                 continue
@@ -36,8 +36,8 @@ async def upload_media_group(
             # Determine media type by extension
             ext = Path(path).suffix.lower()
             
-            # Add caption only to first media
-            item_caption = caption if i == 0 else None
+            # Add caption only to first media (shown as the album caption)
+            item_caption = caption if not media_group else None
             
             if ext in ['.jpg', '.jpeg', '.png', '.webp']:
                 media_group.append(InputMediaPhoto(media=file, caption=item_caption))
@@ -1,16 +1,224 @@
-"""Deduplication logic."""
+"""Deduplication logic.
 
+Exact duplicates (the same post cross-posted by several sources) are found
+by their content fingerprint, a hash of the canonical text that ignores
+links, emoji, hashtags and source signatures. A Bloom filter of recent
+`(owner, content_fingerprint)` keys is kept in a memory-mapped file, so a
+restarted worker has its index back without reading the database. A filter
+hit is only a "maybe" and is confirmed against the `content_fingerprint`
+index of `raw_messages`; a miss is certain.
+
+The filter has two generations: keys go into the active one, lookups check
+both, and when the active one is full the older one is cleared and takes
+over. The index therefore remembers between one and two generations of
+recent hashes.
+"""
+
+import hashlib
+import math
+import mmap
+import struct
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+from app.config import get_settings
+from app.db.models import RawMessage
 from app.db.repo import Repository
-from app.utils.hash import compute_content_hash
 
+# magic, bits per generation, hash functions, active generation, counts of both generations
+HEADER = struct.Struct("<8sQIIQQ")
+MAGIC = b"NRDEDUP2"
+
+# Adds between explicit flushes of the mapped file
+FLUSH_EVERY = 100
+
+
+def bloom_parameters(capacity: int, error_rate: float) -> tuple[int, int]:
+    """Get (bits, hash functions) of a Bloom filter for `capacity` keys."""
+    bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+    bits = (bits + 7) // 8 * 8
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+
+class ContentHashFilter:
+    """Two-generation Bloom filter stored in a memory-mapped file."""
+
+    def __init__(self, path: Path, capacity: int, error_rate: float):
+        """Open the filter file, creating it if missing or built with other parameters."""
+        self.path = path
+        self.capacity = capacity
+        self.bits, self.hashes = bloom_parameters(capacity, error_rate)
+        self._generation_bytes = self.bits // 8
+        size = HEADER.size + 2 * self._generation_bytes
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.created = not self._matches(path, size)
+        if self.created:
+            with open(path, "wb") as f:
+                f.truncate(size)
+
+        self._file = open(path, "r+b")
+        self._mmap = mmap.mmap(self._file.fileno(), size)
+        self._unflushed = 0
+
+        if self.created:
+            self.active = 0
+            self.counts = [0, 0]
+            self._write_header()
+        else:
+            _, _, _, self.active, count0, count1 = HEADER.unpack_from(self._mmap, 0)
+            self.counts = [count0, count1]
+
+    def _matches(self, path: Path, size: int) -> bool:
+        try:
+            with open(path, "rb") as f:
+                header = f.read(HEADER.size)
+            if path.stat().st_size != size or len(header) != HEADER.size:
+                return False
+        except OSError:
+            return False
+        magic, bits, hashes, active, _, _ = HEADER.unpack(header)
+        return magic == MAGIC and bits == self.bits and hashes == self.hashes and active in (0, 1)
+
+    def _write_header(self):
+        HEADER.pack_into(
+            self._mmap, 0, MAGIC, self.bits, self.hashes, self.active, self.counts[0], self.counts[1]
+        )
+
+    def _positions(self, owner_user_id: int, content_hash: str) -> list[int]:
+        digest = hashlib.blake2b(
+            f"{owner_user_id}:{content_hash}".encode(), digest_size=16
+        ).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def _offset(self, generation: int) -> int:
+        return HEADER.size + generation * self._generation_bytes
+
+    def _generation_has(self, generation: int, positions: list[int]) -> bool:
+        offset = self._offset(generation)
+        return all(self._mmap[offset + (p >> 3)] & (1 << (p & 7)) for p in positions)
+
+    def might_contain(self, owner_user_id: int, content_hash: str) -> bool:
+        """Whether the key may have been added (False is certain)."""
+        positions = self._positions(owner_user_id, content_hash)
+        return self._generation_has(self.active, positions) or self._generation_has(
+            1 - self.active, positions
+        )
+
+    def add(self, owner_user_id: int, content_hash: str):
+        """Add a key to the active generation, rotating generations when full."""
+        if self.counts[self.active] >= self.capacity:
+            self._rotate()
 
-async def is_duplicate(text: str, owner_user_id: int, repo: Repository) -> bool:
-    """Check if content is duplicate based on hash.
-    
-    This is a simple implementation. For production, consider using
-    more sophisticated similarity detection.
+        offset = self._offset(self.active)
+        for p in self._positions(owner_user_id, content_hash):
+            self._mmap[offset + (p >> 3)] |= 1 << (p & 7)
+        self.counts[self.active] += 1
+        self._write_header()
+
+        self._unflushed += 1
+        if self._unflushed >= FLUSH_EVERY:
+            self.flush()
+
+    def _rotate(self):
+        """Clear the older generation and make it the active one."""
+        self.active = 1 - self.active
+        offset = self._offset(self.active)
+        self._mmap[offset:offset + self._generation_bytes] = bytes(self._generation_bytes)
+        self.counts[self.active] = 0
+        self._write_header()
+        logger.info(f"Content hash index rotated, {self.counts[1 - self.active]} hashes kept")
+
+    def flush(self):
+        """Write dirty pages of the mapped file to disk."""
+        self._mmap.flush()
+        self._unflushed = 0
+
+    def close(self):
+        """Flush and unmap the file."""
+        if not self._mmap.closed:
+            self.flush()
+            self._mmap.close()
+            self._file.close()
+
+
+# Global index instance
+_content_hash_filter: Optional[ContentHashFilter] = None
+
+
+async def get_content_hash_filter(repo: Repository) -> ContentHashFilter:
+    """Get or open the global index, loading recent hashes into a new file."""
+    global _content_hash_filter
+    if _content_hash_filter is None:
+        settings = get_settings()
+        index = ContentHashFilter(
+            Path(settings.dedup_index_path),
+            capacity=settings.dedup_index_capacity,
+            error_rate=settings.dedup_index_error_rate,
+        )
+        if index.created:
+            since = datetime.now(timezone.utc) - timedelta(days=settings.dedup_warmup_days)
+            recent = await repo.get_recent_content_fingerprints(
+                since, limit=settings.dedup_index_capacity
+            )
+            for owner_user_id, content_hash in reversed(recent):  # Oldest first
+                index.add(owner_user_id, content_hash)
+            index.flush()
+            logger.info(f"Content hash index created with {len(recent)} recent hashes")
+        _content_hash_filter = index
+    return _content_hash_filter
+
+
+def close_content_hash_filter():
+    """Flush and close the global index."""
+    global _content_hash_filter
+    if _content_hash_filter is not None:
+        _content_hash_filter.close()
+        _content_hash_filter = None
+
+
+async def find_duplicate(raw_message: RawMessage, repo: Repository) -> Optional[int]:
+    """Find an earlier message of the same owner with the same canonical text.
+
+    Only messages stored within `dedup_lookback_days` count, so a text
+    reposted long after the original is published again. The message's fingerprint is added to the index, so later copies are
+    found. Messages without words (media-only posts) have no fingerprint and
+    are never duplicates.
+
+    Returns:
+        ID of the earlier message or None
     """
-    # For now, just return False - full implementation would check
-    # against existing content_hash values in database
-    return False
+    fingerprint = raw_message.content_fingerprint
+    if not fingerprint:
+        return None
+
+    index = await get_content_hash_filter(repo)
+    owner_user_id = raw_message.owner_user_id
+
+    if not index.might_contain(owner_user_id, fingerprint):
+        index.add(owner_user_id, fingerprint)
+        return None
+
+    since = datetime.now(timezone.utc) - timedelta(days=get_settings().dedup_lookback_days)
+    original_id = await repo.find_earlier_duplicate(
+        owner_user_id, fingerprint, raw_message.id, since=since
+    )
+    # Re-add so a hash that is still being reposted stays in the active generation
+    index.add(owner_user_id, fingerprint)
+    if original_id is None:
+        logger.debug(f"Content hash index false positive for message {raw_message.id}")
+        return None
+
+    logger.info(f"Message {raw_message.id} duplicates message {original_id}")
+    return original_id
+
 
+async def is_duplicate(raw_message: RawMessage, repo: Repository) -> bool:
+    """Check if an earlier message of the same owner has the same canonical text."""
+    return await find_duplicate(raw_message, repo) is not None
@@ -1,24 +1,217 @@
-"""Language detection."""
+"""Language detection.
 
-from typing import Optional
+A naive Bayes classifier over character 1-3-grams. The n-gram profiles that
+ship with `langdetect` are loaded once, lowercased and reduced to the
+configured languages, and kept as a sorted key array plus a matrix of log
+probabilities. Every text's n-grams are looked up with one `searchsorted`
+and a whole batch is scored with one reduction over matrix rows, so
+detection is vectorized and deterministic (`langdetect` samples n-grams at
+random and builds a detector for every call).
 
-from langdetect import detect, LangDetectException
+Results are cached by content hash, so reposts and retries are not scored
+again.
+"""
+
+import json
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+from langdetect.detector_factory import PROFILES_DIRECTORY
 from loguru import logger
 
+from app.config import get_settings
+from app.utils.executor import run_cpu
+
+# Texts shorter than this (without surrounding whitespace) are not detected
+MIN_TEXT_CHARS = 10
+
+# Longer texts are detected by their beginning
+MAX_TEXT_CHARS = 2000
+
+# Additive smoothing of n-gram counts
+SMOOTHING = 0.5
+
+_NON_LETTER_RE = re.compile(r"[\W\d_]+")
+
+# Bits per code point in an n-gram key
+_CHAR_BITS = np.uint64(21)
+
+
+def _prepare(text: str) -> str:
+    """Lowercase letters separated by single spaces, padded with spaces."""
+    return f" {_NON_LETTER_RE.sub(' ', text[:MAX_TEXT_CHARS].lower()).strip()} "
+
+
+def ngram_keys(text: str) -> np.ndarray:
+    """Pack all 1-3-grams of prepared text into integer keys.
+
+    Code points take 21 bits each; no code point is zero, so keys of
+    different lengths never collide.
+    """
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    bigrams = (codes[:-1] << _CHAR_BITS) | codes[1:]
+    trigrams = (bigrams[:-1] << _CHAR_BITS) | codes[2:]
+    return np.concatenate([codes, bigrams, trigrams])
+
+
+def _gram_key(gram: str) -> int:
+    key = 0
+    for char in gram:
+        key = (key << int(_CHAR_BITS)) | ord(char)
+    return key
+
+
+class NgramLanguageDetector:
+    """Character n-gram profiles of a set of languages."""
+
+    def __init__(self, languages: list[str], keys: np.ndarray, log_probs: np.ndarray):
+        """Initialize detector.
+
+        Args:
+            languages: Language codes, one per column of `log_probs`
+            keys: Sorted n-gram keys (see `ngram_keys`)
+            log_probs: Log probability of every n-gram (row) in every language
+        """
+        self.languages = languages
+        self.keys = keys
+        self.log_probs = log_probs
+
+    @classmethod
+    def from_profiles(
+        cls, languages: Sequence[str], directory: str = PROFILES_DIRECTORY
+    ) -> "NgramLanguageDetector":
+        """Build detector from `langdetect` profile files."""
+        counts: dict[int, dict[str, float]] = {}
+        totals: dict[str, list[int]] = {}
+        loaded = []
+        for code in languages:
+            path = Path(directory) / code
+            if not path.exists():
+                logger.warning(f"No language profile for {code!r}, skipping it")
+                continue
+            profile = json.loads(path.read_text(encoding="utf-8"))
+            totals[code] = profile["n_words"]
+            loaded.append(code)
+            for gram, freq in profile["freq"].items():
+                # Lowercasing may lengthen a gram ("İ" becomes two code points)
+                gram = gram.lower()
+                if len(gram) > 3:
+                    continue
+                per_language = counts.setdefault(_gram_key(gram), {})
+                per_language[code] = per_language.get(code, 0) + freq
+
+        if not loaded:
+            raise ValueError("No language profiles loaded")
+
+        ordered = sorted(counts)
+        keys = np.array(ordered, dtype=np.uint64)
+        lengths = np.array([(key.bit_length() + 20) // 21 for key in ordered])
+        vocabulary = np.bincount(lengths, minlength=4)
+        log_probs = np.empty((len(keys), len(loaded)), dtype=np.float32)
+        for column, code in enumerate(loaded):
+            freq = np.array([counts[key].get(code, 0) for key in ordered], dtype=np.float64)
+            total = np.array(totals[code], dtype=np.float64)[lengths - 1]
+            log_probs[:, column] = np.log(
+                (freq + SMOOTHING) / (total + SMOOTHING * vocabulary[lengths])
+            )
+        return cls(loaded, keys, log_probs)
+
+    def detect_batch(self, texts: Sequence[str]) -> list[Optional[str]]:
+        """Detect the language of every text (None for short or unknown texts)."""
+        results: list[Optional[str]] = [None] * len(texts)
+        indices = []
+        starts = []
+        positions = []
+        offset = 0
+        for position, text in enumerate(texts):
+            if not text or len(text.strip()) < MIN_TEXT_CHARS:
+                continue
+            grams = ngram_keys(_prepare(text))
+            found = np.minimum(np.searchsorted(self.keys, grams), len(self.keys) - 1)
+            found = found[self.keys[found] == grams]
+            if found.size == 0:
+                continue
+            indices.append(found)
+            starts.append(offset)
+            positions.append(position)
+            offset += found.size
+
+        if not indices:
+            return results
+
+        scores = np.add.reduceat(self.log_probs[np.concatenate(indices)], starts, axis=0)
+        for position, best in zip(positions, scores.argmax(axis=1)):
+            results[position] = self.languages[best]
+        return results
+
+
+# Global detector and cache
+_detector: Optional[NgramLanguageDetector] = None
+_language_cache: OrderedDict[str, Optional[str]] = OrderedDict()
+
+
+def get_language_detector() -> NgramLanguageDetector:
+    """Get or load global detector (once per process)."""
+    global _detector
+    if _detector is None:
+        _detector = NgramLanguageDetector.from_profiles(
+            get_settings().lang_detect_language_codes
+        )
+    return _detector
+
 
 def detect_language(text: str) -> Optional[str]:
     """Detect language of text.
-    
+
     Returns:
         Language code (uk, en, ru, etc.) or None
     """
-    if not text or len(text.strip()) < 10:
-        return None
-    
-    try:
-        lang = detect(text)
-        return lang
-    except LangDetectException as e:
-        logger.debug(f"Language detection failed: {e}")
-        return None
+    return detect_languages([text])[0]
+
+
+def detect_languages(texts: Sequence[str]) -> list[Optional[str]]:
+    """Detect languages of many texts at once."""
+    return get_language_detector().detect_batch(texts)
+
+
+def _remember(content_hash: str, language: Optional[str]):
+    _language_cache[content_hash] = language
+    _language_cache.move_to_end(content_hash)
+    while len(_language_cache) > get_settings().lang_cache_size:
+        _language_cache.popitem(last=False)
+
+
+async def detect_languages_async(
+    texts: Sequence[str], content_hashes: Optional[Sequence[Optional[str]]] = None
+) -> list[Optional[str]]:
+    """Detect languages on the shared CPU executor, using cached results.
+
+    Args:
+        texts: Texts to detect
+        content_hashes: Content hash of every text (None entries are not cached)
+    """
+    content_hashes = content_hashes or [None] * len(texts)
+    results: list[Optional[str]] = [None] * len(texts)
+    pending = []
+    for position, (text, content_hash) in enumerate(zip(texts, content_hashes)):
+        if content_hash is not None and content_hash in _language_cache:
+            _language_cache.move_to_end(content_hash)
+            results[position] = _language_cache[content_hash]
+        elif text and len(text.strip()) >= MIN_TEXT_CHARS:
+            pending.append(position)
+
+    if pending:
+        detected = await run_cpu(detect_languages, [texts[position] for position in pending])
+        for position, language in zip(pending, detected):
+            results[position] = language
+            if content_hashes[position] is not None:
+                _remember(content_hashes[position], language)
+    return results
+
 
+async def detect_language_async(text: str, content_hash: Optional[str] = None) -> Optional[str]:
+    """Detect language of text on the shared CPU executor."""
+    return (await detect_languages_async([text], [content_hash]))[0]
@@ -0,0 +1,301 @@
+"""Near-duplicate detection with MinHash and banded LSH.
+
+Posts are reduced to canonical text (links, mentions, emoji, punctuation and
+source signatures removed, case and Unicode folded, see `canonicalize_text`),
+cut into character shingles and summarized by a MinHash signature computed
+with NumPy over all shingles at once. Signatures are indexed per owner in
+LSH bands over a sliding window of publish time: two posts sharing any band are
+candidates, and a candidate counts as a duplicate when the signatures agree
+on at least `near_dup_threshold` of their positions (an estimate of the
+Jaccard similarity of the shingle sets).
+
+With 64 permutations in 16 bands of 4 rows, pairs above ~0.5 Jaccard become
+candidates with high probability, while the threshold decides.
+"""
+
+import heapq
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import numpy as np
+from loguru import logger
+
+from app.config import get_settings
+from app.db.models import RawMessage
+from app.db.repo import Repository
+from app.utils.executor import run_cpu
+from app.utils.text import canonicalize_text
+
+SHINGLE_SIZE = 5
+
+# Longer texts are compared by their beginning
+MAX_SIGNATURE_CHARS = 20000
+
+# Multiplier of the rolling shingle hash
+_SHINGLE_BASE = np.uint64(1_000_003)
+
+
+def normalize_for_shingles(text: str) -> str:
+    """Reduce text to canonical words separated by single spaces."""
+    return canonicalize_text(text[:MAX_SIGNATURE_CHARS])
+
+
+def shingle_hashes(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """Hash all character shingles of normalized text (unique, uint64)."""
+    normalized = normalize_for_shingles(text)
+    if not normalized:
+        return np.empty(0, dtype=np.uint64)
+
+    codes = np.frombuffer(normalized.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    size = min(size, len(codes))
+    count = len(codes) - size + 1
+
+    hashes = np.zeros(count, dtype=np.uint64)
+    for offset in range(size):
+        hashes = hashes * _SHINGLE_BASE + codes[offset:offset + count]
+    return np.unique(hashes)
+
+
+class MinHasher:
+    """MinHash with multiply-shift hash functions."""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        """Draw `num_perm` hash functions from a fixed seed."""
+        rng = np.random.default_rng(seed)
+        high = np.iinfo(np.uint64).max
+        self.num_perm = num_perm
+        self._a = rng.integers(1, high, size=num_perm, dtype=np.uint64, endpoint=True) | np.uint64(1)
+        self._b = rng.integers(0, high, size=num_perm, dtype=np.uint64, endpoint=True)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """Get MinHash signature of a text (None if it has no words)."""
+        hashes = shingle_hashes(text)
+        if hashes.size == 0:
+            return None
+        # (a * x + b) mod 2^64, upper 32 bits; overflow wraps by design
+        values = (np.multiply.outer(self._a, hashes) + self._b[:, None]) >> np.uint64(32)
+        return values.min(axis=1).astype(np.uint32)
+
+    def signatures(self, texts: list[str]) -> list[Optional[np.ndarray]]:
+        """Get signatures of many texts (one executor round trip)."""
+        return [self.signature(text) for text in texts]
+
+
+def estimate_similarity(first: np.ndarray, second: np.ndarray) -> float:
+    """Estimate Jaccard similarity from two signatures."""
+    return float(np.count_nonzero(first == second)) / len(first)
+
+
+@dataclass(order=True)
+class IndexedSignature:
+    """Signature of a message in an LSH index (ordered by time)."""
+
+    added_at: float
+    message_id: int
+    signature: np.ndarray = field(compare=False)
+
+
+class LshIndex:
+    """Banded LSH index over a sliding time window."""
+
+    def __init__(self, bands: int, window_seconds: float):
+        """Initialize empty index; signatures are split into `bands` equal bands."""
+        self.bands = bands
+        self.window_seconds = window_seconds
+        self._buckets: dict[tuple[int, bytes], list[IndexedSignature]] = {}
+        # Heap by time: backlog messages may arrive older than indexed ones
+        self._entries: list[IndexedSignature] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _band_keys(self, signature: np.ndarray) -> list[tuple[int, bytes]]:
+        rows = len(signature) // self.bands
+        return [
+            (band, signature[band * rows:(band + 1) * rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def expire(self, now: float):
+        """Drop signatures older than the window."""
+        cutoff = now - self.window_seconds
+        while self._entries and self._entries[0].added_at < cutoff:
+            entry = heapq.heappop(self._entries)
+            for key in self._band_keys(entry.signature):
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    continue
+                try:
+                    bucket.remove(entry)
+                except ValueError:
+                    pass
+                if not bucket:
+                    del self._buckets[key]
+
+    def query(
+        self, signature: np.ndarray, threshold: float, before_id: Optional[int] = None
+    ) -> Optional[tuple[int, float]]:
+        """Find the most similar indexed message at or above `threshold`.
+
+        Args:
+            signature: Signature to look up
+            threshold: Minimal estimated similarity
+            before_id: Only consider messages with a lower ID
+
+        Returns:
+            (message ID, similarity) or None
+        """
+        seen: set[int] = set()
+        best: Optional[tuple[int, float]] = None
+        for key in self._band_keys(signature):
+            for entry in self._buckets.get(key, ()):
+                if entry.message_id in seen:
+                    continue
+                seen.add(entry.message_id)
+                if before_id is not None and entry.message_id >= before_id:
+                    continue
+                similarity = estimate_similarity(signature, entry.signature)
+                if similarity >= threshold and (best is None or similarity > best[1]):
+                    best = (entry.message_id, similarity)
+        return best
+
+    def add(self, message_id: int, signature: np.ndarray, added_at: float):
+        """Index a signature at its publish time."""
+        entry = IndexedSignature(added_at, message_id, signature)
+        heapq.heappush(self._entries, entry)
+        for key in self._band_keys(signature):
+            self._buckets.setdefault(key, []).append(entry)
+
+
+class NearDuplicateDetector:
+    """Per-owner LSH indexes of recently processed messages."""
+
+    def __init__(self, num_perm: int, bands: int, threshold: float, window_seconds: float):
+        """Initialize detector."""
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.threshold = threshold
+        self.window_seconds = window_seconds
+        self._indexes: dict[int, LshIndex] = {}
+
+    def is_loaded(self, owner_user_id: int) -> bool:
+        return owner_user_id in self._indexes
+
+    def index_for(self, owner_user_id: int) -> LshIndex:
+        index = self._indexes.get(owner_user_id)
+        if index is None:
+            index = self._indexes[owner_user_id] = LshIndex(self.bands, self.window_seconds)
+        return index
+
+    def check_and_add(
+        self,
+        owner_user_id: int,
+        message_id: int,
+        signature: np.ndarray,
+        at: Optional[float] = None,
+    ) -> Optional[tuple[int, float]]:
+        """Find an earlier near duplicate, then index the message.
+
+        Returns:
+            (ID of the earlier message, similarity) or None
+        """
+        at = time.time() if at is None else at
+        index = self.index_for(owner_user_id)
+        index.expire(at)
+        match = index.query(signature, self.threshold, before_id=message_id)
+        if match is None:
+            # Duplicates are not indexed; the original already covers them
+            index.add(message_id, signature, at)
+        return match
+
+
+def _epoch(dt: Optional[datetime]) -> float:
+    if dt is None:
+        return time.time()
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _published_epoch(raw_message: RawMessage) -> float:
+    """Get publish time of a message, capped at the time it was stored.
+
+    Matches the time key of `Repository.get_recent_processed_texts`.
+    """
+    stored = _epoch(raw_message.created_at)
+    if raw_message.published_at_source is None:
+        return stored
+    return min(_epoch(raw_message.published_at_source), stored)
+
+
+# Global detector instance
+_detector: Optional[NearDuplicateDetector] = None
+
+
+def get_near_duplicate_detector() -> NearDuplicateDetector:
+    """Get or create global detector from settings."""
+    global _detector
+    if _detector is None:
+        settings = get_settings()
+        _detector = NearDuplicateDetector(
+            num_perm=settings.near_dup_num_perm,
+            bands=settings.near_dup_bands,
+            threshold=settings.near_dup_threshold,
+            window_seconds=settings.near_dup_window_hours * 3600,
+        )
+    return _detector
+
+
+async def _load_owner(detector: NearDuplicateDetector, owner_user_id: int, repo: Repository):
+    """Index the owner's live messages published within the window."""
+    settings = get_settings()
+    since = datetime.now(timezone.utc) - timedelta(seconds=detector.window_seconds)
+    rows = await repo.get_recent_processed_texts(
+        owner_user_id, since, limit=settings.near_dup_warmup_limit
+    )
+    signatures = await run_cpu(detector.hasher.signatures, [text for _, text, _ in rows])
+
+    index = detector.index_for(owner_user_id)
+    for (message_id, _, published_at), signature in zip(rows, signatures):
+        if signature is not None:
+            index.add(message_id, signature, _epoch(published_at))
+    logger.debug(f"Near-duplicate index of owner {owner_user_id} loaded with {len(index)} messages")
+
+
+async def find_near_duplicate(raw_message: RawMessage, repo: Repository) -> Optional[int]:
+    """Find an earlier message of the same owner with nearly the same text.
+
+    The message is indexed unless it is a duplicate itself.
+
+    Returns:
+        ID of the earlier message or None
+    """
+    text = raw_message.text or ""
+    if not text.strip():
+        return None
+
+    detector = get_near_duplicate_detector()
+    owner_user_id = raw_message.owner_user_id
+    if not detector.is_loaded(owner_user_id):
+        await _load_owner(detector, owner_user_id, repo)
+
+    signature = await run_cpu(detector.hasher.signature, text)
+    if signature is None:
+        return None
+
+    match = detector.check_and_add(
+        owner_user_id, raw_message.id, signature, _published_epoch(raw_message)
+    )
+    if match is None:
+        return None
+
+    original_id, similarity = match
+    logger.info(
+        f"Message {raw_message.id} is a near duplicate of message {original_id} "
+        f"(similarity {similarity:.2f})"
+    )
+    return original_id
@@ -39,8 +39,8 @@ async def publish_post(post: Post, channel_telegram_id: int) -> tuple[bool, Opti
     bot = get_publish_bot()
     
     try:
-        # Format text
-        text = format_post(post.text)
+        # Format text (cached on the post when it was created)
+        text = post.formatted_text if post.formatted_text is not None else format_post(post.text)
         
         # Parse media paths
         media_paths = []
@@ -0,0 +1,70 @@
+"""Tests for adaptive polling intervals."""
+
+from datetime import datetime, timedelta
+
+from app.worker.adaptive_polling import choose_poll_interval, estimate_publish_rate
+from app.worker.source_scheduler import to_epoch
+
+START = datetime(2024, 1, 1, 8, 0)
+BOUNDS = {"default_seconds": 1800, "min_seconds": 300, "max_seconds": 7200}
+
+
+def posts(count: int, gap_minutes: float) -> list[datetime]:
+    return [START + timedelta(minutes=gap_minutes * i) for i in range(count)]
+
+
+def test_rate_needs_history():
+    """Too few posts fall back to the configured interval."""
+    rate = estimate_publish_rate(posts(3, 10))
+    assert rate is None
+    assert choose_poll_interval(rate, now=0, **BOUNDS) == 1800
+
+
+def test_hot_source_is_polled_often():
+    """A source posting every 10 minutes is checked every 5 minutes."""
+    published = posts(20, 10)
+    rate = estimate_publish_rate(published)
+    assert abs(rate.gap_seconds - 600) < 1
+
+    now = to_epoch(published[-1]) + 60
+    assert choose_poll_interval(rate, now=now, **BOUNDS) == 300
+
+
+def test_recent_gaps_weigh_most():
+    """After a slowdown the estimate moves towards the new gap."""
+    published = posts(10, 10)
+    published += [published[-1] + timedelta(hours=i) for i in range(1, 6)]
+    rate = estimate_publish_rate(published, alpha=0.5)
+    assert rate.gap_seconds > 3000
+
+
+def test_silent_source_backs_off_up_to_max():
+    """Silence longer than the usual gap lengthens the interval, within bounds."""
+    published = posts(20, 10)
+    rate = estimate_publish_rate(published)
+    last = to_epoch(published[-1])
+
+    assert choose_poll_interval(rate, now=last + 3600, **BOUNDS) == 1800
+    assert choose_poll_interval(rate, now=last + 10 * 3600, **BOUNDS) == 7200
+
+
+def test_configured_interval_is_honored_without_history():
+    """Intervals outside the adaptive bounds are kept as configured."""
+    for configured in (60, 24 * 3600):
+        bounds = {**BOUNDS, "default_seconds": configured}
+        assert choose_poll_interval(None, now=0, **bounds) == configured
+
+
+def test_configured_interval_widens_bounds():
+    """Learned intervals may reach the configured interval beyond the bounds."""
+    published = posts(20, 10)
+    rate = estimate_publish_rate(published)
+    last = to_epoch(published[-1])
+
+    daily = {**BOUNDS, "default_seconds": 24 * 3600}
+    assert choose_poll_interval(rate, now=last + 60 * 3600, **daily) == 24 * 3600
+    assert choose_poll_interval(rate, now=last + 60, **daily) == 300
+
+    fast = {**BOUNDS, "default_seconds": 60}
+    busy = estimate_publish_rate(posts(20, 2))
+    assert choose_poll_interval(busy, now=to_epoch(posts(20, 2)[-1]), **fast) == 60
@@ -0,0 +1,37 @@
+"""Tests for historical backfill paging."""
+
+import feedparser
+
+from app.connectors.rss_ingestor import is_probed_feed_page, next_feed_page
+
+ARCHIVED_ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+<title>Feed</title>
+<link rel="self" href="https://example.com/feed"/>
+<link rel="prev-archive" href="/feed/2023"/>
+<link rel="next" href="/feed?page=2"/>
+<entry><id>a</id><title>A</title></entry>
+</feed>"""
+
+PLAIN_RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Feed</title>
+<item><guid>a</guid><title>A</title></item>
+</channel></rss>"""
+
+
+def test_next_page_prefers_archive_link():
+    """RFC 5005 archive links win over paged-feed links and are made absolute."""
+    feed = feedparser.parse(ARCHIVED_ATOM)
+
+    assert next_feed_page(feed, "https://example.com/feed") == "https://example.com/feed/2023"
+
+
+def test_next_page_probes_wordpress_paging():
+    """Feeds without links are paged with ?paged=N, keeping other parameters."""
+    feed = feedparser.parse(PLAIN_RSS)
+
+    first = next_feed_page(feed, "https://example.com/feed/?lang=uk")
+    assert first == "https://example.com/feed/?lang=uk&paged=2"
+    assert is_probed_feed_page(first)
+    assert next_feed_page(feed, first) == "https://example.com/feed/?lang=uk&paged=3"
+    assert not is_probed_feed_page("https://example.com/feed/")
@@ -0,0 +1,84 @@
+"""Tests for the content hash index."""
+
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.processing import dedup
+from app.processing.dedup import ContentHashFilter, find_duplicate
+
+
+def test_index_survives_reopen():
+    """Added hashes are found after the mapped file is reopened."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "index"
+        index = ContentHashFilter(path, capacity=1000, error_rate=0.001)
+        assert index.created
+        index.add(1, "a" * 64)
+        index.close()
+
+        reopened = ContentHashFilter(path, capacity=1000, error_rate=0.001)
+        assert not reopened.created
+        assert reopened.might_contain(1, "a" * 64)
+        assert not reopened.might_contain(2, "a" * 64)  # Other owner
+        reopened.close()
+
+        # Different parameters rebuild the file
+        rebuilt = ContentHashFilter(path, capacity=5000, error_rate=0.001)
+        assert rebuilt.created
+        assert not rebuilt.might_contain(1, "a" * 64)
+        rebuilt.close()
+
+
+def test_old_generation_is_forgotten():
+    """A full generation keeps the previous one; the one before is cleared."""
+    with tempfile.TemporaryDirectory() as tmp:
+        index = ContentHashFilter(Path(tmp) / "index", capacity=10, error_rate=0.01)
+        index.add(1, "first")
+        for i in range(9):
+            index.add(1, f"fill-{i}")
+        for i in range(10):
+            index.add(1, f"second-{i}")
+        assert index.might_contain(1, "first")  # Previous generation
+
+        index.add(1, "third")  # Rotates again, clearing the first generation
+        assert not index.might_contain(1, "first")
+        assert index.might_contain(1, "second-0")
+        index.close()
+
+
+class StoredMessages:
+    """Raw messages of one owner as (id, content fingerprint, created_at)."""
+
+    def __init__(self, rows: list[tuple[int, str, datetime]]):
+        self.rows = rows
+
+    async def find_earlier_duplicate(self, owner_user_id, content_fingerprint, before_id, since):
+        for message_id, fingerprint, created_at in self.rows:
+            if fingerprint == content_fingerprint and message_id < before_id and created_at >= since:
+                return message_id
+        return None
+
+
+@pytest.mark.asyncio
+async def test_duplicates_are_looked_up_within_window(settings, monkeypatch):
+    """A repost of a text stored before the lookback window is not a duplicate."""
+    now = datetime.now(timezone.utc)
+    old = now - timedelta(days=settings.dedup_lookback_days + 1)
+    repo = StoredMessages([(1, "old", old), (2, "recent", now - timedelta(hours=1))])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = ContentHashFilter(Path(tmp) / "index", capacity=100, error_rate=0.01)
+        index.add(1, "old")
+        index.add(1, "recent")
+        monkeypatch.setattr(dedup, "_content_hash_filter", index)
+
+        def message(message_id: int, fingerprint: str):
+            return SimpleNamespace(id=message_id, owner_user_id=1, content_fingerprint=fingerprint)
+
+        assert await find_duplicate(message(3, "recent"), repo) == 2
+        assert await find_duplicate(message(4, "old"), repo) is None
+        index.close()
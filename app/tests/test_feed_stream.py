@@ -0,0 +1,141 @@
+"""Tests for the streaming feed parser."""
+
+import pytest
+
+from app.connectors.feed_stream import (
+    StreamingFeedParser,
+    UnsupportedFeedFormat,
+    parse_json_feed,
+)
+
+RSS = b"""<?xml version="1.0" encoding="utf-8"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+<channel><title>Feed</title>
+<item><guid>new-2</guid><title>Second</title><link>https://example.com/2</link>
+<description><![CDATA[<p>Body 2</p>]]></description>
+<pubDate>Tue, 02 Jan 2024 03:04:05 +0000</pubDate></item>
+<item><guid>new-1</guid><title>First</title><content:encoded><![CDATA[<p>Body 1</p>]]></content:encoded>
+<pubDate>Mon, 01 Jan 2024 12:00:00 +0000</pubDate></item>
+<item><guid>old</guid><title>Known</title><pubDate>Sun, 31 Dec 2023 12:00:00 +0000</pubDate></item>
+<item><guid>older</guid><title>Never reached</title><pubDate>Sat, 30 Dec 2023 12:00:00 +0000</pubDate></item>
+</channel></rss>"""
+
+
+def rss(*items: tuple[str, str]) -> bytes:
+    """Build an RSS body from (guid, day of January 2024) pairs."""
+    body = "".join(
+        f"<item><guid>{guid}</guid><title>{guid}</title>"
+        f"<pubDate>{day} Jan 2024 10:00:00 +0000</pubDate></item>"
+        for guid, day in items
+    )
+    return f'<rss version="2.0"><channel><title>Feed</title>{body}</channel></rss>'.encode()
+
+
+def feed_in_chunks(parser: StreamingFeedParser, body: bytes, size: int = 40):
+    for start in range(0, len(body), size):
+        parser.feed(body[start:start + size])
+        if parser.stopped:
+            return
+    parser.close()
+
+
+def test_rss_stops_at_known_entry():
+    """A newest-first feed stops at the first known entry, newer entries are returned."""
+    parser = StreamingFeedParser(known_ids={"old"})
+    feed_in_chunks(parser, RSS)
+
+    assert parser.format == "rss"
+    assert parser.stopped
+    assert [entry.id for entry in parser.entries] == ["new-2", "new-1"]
+    assert parser.entries[0].summary == "<p>Body 2</p>"
+    assert parser.entries[0].published_parsed.tm_year == 2024
+    assert parser.entries[1].content[0].value == "<p>Body 1</p>"
+
+
+def test_oldest_first_feed_is_read_past_known_entries():
+    """Known entries at the top of an oldest-first feed are skipped, not a stop."""
+    parser = StreamingFeedParser(known_ids={"a", "b"})
+    feed_in_chunks(parser, rss(("a", "01"), ("b", "02"), ("c", "03"), ("d", "04")))
+
+    assert not parser.stopped
+    assert parser.cutoff.newest_first is False
+    assert [entry.id for entry in parser.entries] == ["c", "d"]
+
+
+def test_newest_first_feed_without_new_entries_stops_early():
+    """The order is learned from the entry after a known first entry."""
+    parser = StreamingFeedParser(known_ids={"c", "b"})
+    feed_in_chunks(parser, rss(("c", "03"), ("b", "02"), ("a", "01")))
+
+    assert parser.stopped
+    assert parser.entries == []
+
+
+def test_undated_feed_is_read_whole():
+    """Without dates the order is unknown, so nothing after a known entry is dropped."""
+    body = (
+        b'<rss version="2.0"><channel>'
+        b"<item><guid>old</guid></item><item><guid>new</guid></item>"
+        b"</channel></rss>"
+    )
+    parser = StreamingFeedParser(known_ids={"old"})
+    feed_in_chunks(parser, body)
+
+    assert not parser.stopped
+    assert [entry.id for entry in parser.entries] == ["new"]
+
+
+def test_atom_entries():
+    """Atom entries expose id, alternate link and content."""
+    body = (
+        b'<feed xmlns="http://www.w3.org/2005/Atom"><title>t</title>'
+        b'<entry><id>urn:1</id><title>A</title>'
+        b'<link rel="self" href="https://example.com/self"/>'
+        b'<link href="https://example.com/a"/>'
+        b'<summary type="html">&lt;b&gt;x&lt;/b&gt;</summary>'
+        b"<updated>2024-01-02T03:04:05Z</updated></entry></feed>"
+    )
+    parser = StreamingFeedParser(known_ids=set())
+    feed_in_chunks(parser, body)
+
+    assert parser.format == "atom"
+    assert not parser.stopped
+    entry = parser.entries[0]
+    assert (entry.id, entry.link, entry.summary) == ("urn:1", "https://example.com/a", "<b>x</b>")
+
+
+def test_unsupported_document():
+    """Non-feed documents are rejected so the caller can fall back."""
+    parser = StreamingFeedParser(known_ids=set())
+    with pytest.raises(UnsupportedFeedFormat):
+        parser.feed(b"<html><body>Not a feed</body></html>")
+
+
+def test_json_feed():
+    """JSON Feed items are returned up to the first known one."""
+    body = (
+        b'{"version": "https://jsonfeed.org/version/1.1", "items": ['
+        b'{"id": "2", "url": "https://example.com/2", "content_html": "<p>2</p>",'
+        b' "date_published": "2024-01-02T00:00:00Z"},'
+        b'{"id": "1", "content_text": "one", "date_published": "2024-01-01T00:00:00Z"},'
+        b'{"id": "0", "content_text": "zero", "date_published": "2023-12-31T00:00:00Z"}]}'
+    )
+    entries, stopped = parse_json_feed(body, known_ids={"1"})
+
+    assert stopped
+    assert [entry.id for entry in entries] == ["2"]
+    assert entries[0].content[0].value == "<p>2</p>"
+
+
+def test_oldest_first_json_feed():
+    """Known items of an oldest-first JSON Feed are skipped."""
+    items = ",".join(
+        f'{{"id": "{day}", "content_text": "x", "date_published": "2024-01-0{day}T00:00:00Z"}}'
+        for day in (1, 2, 3)
+    )
+    body = f'{{"version": "https://jsonfeed.org/version/1", "items": [{items}]}}'.encode()
+
+    entries, stopped = parse_json_feed(body, known_ids={"1"})
+
+    assert not stopped
+    assert [entry.id for entry in entries] == ["2", "3"]
@@ -0,0 +1,22 @@
+"""Tests for content fingerprints."""
+
+from app.utils.hash import compute_content_fingerprint, compute_content_hash
+from app.utils.text import canonicalize_text
+
+TELEGRAM = "Уряд затвердив нову програму підтримки бізнесу.\n\nПідписуйтесь: @news_channel"
+RSS = "🔥 Уряд затвердив НОВУ програму підтримки бізнесу! #економіка\n\n🔗 https://example.com/a/1"
+
+
+def test_copies_across_sources_share_fingerprint():
+    """Links, emoji, hashtags, signatures and case do not change the fingerprint."""
+    assert compute_content_hash(TELEGRAM) != compute_content_hash(RSS)
+    assert compute_content_fingerprint(TELEGRAM) == compute_content_fingerprint(RSS)
+    assert compute_content_fingerprint("Уряд скасував програму") != compute_content_fingerprint(RSS)
+
+
+def test_canonical_text():
+    assert canonicalize_text("Café  NAÏVE\n\n@chan") == "cafe naive"
+    # Only trailing lines are treated as signatures
+    assert canonicalize_text("Джерело: МОЗ повідомляє\nНові правила") == "джерело моз повідомляє нові правила"
+    assert compute_content_fingerprint("🔥 https://t.me/x") is None
+    assert compute_content_fingerprint(None) is None
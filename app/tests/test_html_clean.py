@@ -0,0 +1,46 @@
+"""Tests for HTML extraction."""
+
+import pytest
+
+from app.connectors.html_clean import clean_html_tags, extract_html, extract_text_from_html
+
+# (html, former BeautifulSoup extract_text_from_html, former BeautifulSoup clean_html_tags)
+BS4_OUTPUTS = [
+    ("<div>x<!-- c -->y</div>", "x\ny", "xy"),
+    (
+        "<p>Hello <b>world</b></p><script>var a=1;</script>tail<style>p{}</style>"
+        "<template><p>t</p></template>end",
+        "Hello\nworld\ntail\nend",
+        "Hello worldtailend",
+    ),
+    ("Plain &amp; text <br>with<br/>breaks", "Plain & text\nwith\nbreaks", "Plain & text withbreaks"),
+    ("<ul><li>one</li><li>two  three</li></ul><?php echo 1 ?>after", "one\ntwo\nthree\nafter", "onetwo  threeafter"),
+    ("<div>a<script>s</script>b<!--c-->c</div>", "a\nb\nc", "abc"),
+]
+
+
+def test_extract_html_single_pass():
+    """Text, links and images come from one parse."""
+    html = (
+        "<p>Hello <b>world</b> &amp; friends</p><!-- hidden --><script>x = 1</script>"
+        "<a href='https://example.com/a'>A</a><a href='/relative'>R</a>"
+        "<img src='https://example.com/i.png'>"
+    )
+    result = extract_html(html)
+
+    assert result.text == "Hello\nworld\n& friends\nA\nR"
+    assert result.links == ["https://example.com/a"]
+    assert result.images == ["https://example.com/i.png"]
+
+
+def test_extract_text_from_empty_html():
+    """Empty and whitespace-only input yields empty text."""
+    assert extract_text_from_html("") == ""
+    assert extract_text_from_html("   ") == ""
+
+
+@pytest.mark.parametrize("html,text,clean", BS4_OUTPUTS)
+def test_matches_former_bs4_output(html, text, clean):
+    """Scripts, styles, templates and comments are skipped without gluing text."""
+    assert extract_text_from_html(html) == text
+    assert clean_html_tags(html) == clean
@@ -0,0 +1,56 @@
+"""Tests for the pooled HTTP clients."""
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.utils import http
+
+
+async def ok(request: web.Request) -> web.Response:
+    return web.Response(text="ok")
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_connections_and_reports_sizes(settings):
+    """Pool stats come from connector internals; this fails if aiohttp renames them."""
+    app = web.Application()
+    app.router.add_get("/", ok)
+    server = TestServer(app)
+    await server.start_server()
+    before = http.get_http_pool_stats()
+    try:
+        session = http.get_http_session()
+        for _ in range(3):
+            async with session.get(server.make_url("/")) as response:
+                assert await response.text() == "ok"
+
+        stats = http.get_http_pool_stats()
+        assert stats["connections_created"] - before["connections_created"] == 1
+        assert stats["connections_reused"] - before["connections_reused"] == 2
+        assert stats["open_connections"] == 1
+        assert stats["idle_connections"] == 1
+        assert stats["llm_open_connections"] == 0
+    finally:
+        await http.close_http_client()
+        await server.close()
+
+    stats = http.get_http_pool_stats()
+    assert stats["open_connections"] == 0 and stats["idle_connections"] == 0
+
+
+@pytest.mark.asyncio
+async def test_llm_calls_do_not_share_the_feed_pool(settings):
+    settings.http_pool_limit_per_host = 8
+    settings.llm_http_pool_limit = 16
+    try:
+        feeds = http.get_http_session()
+        llm = http.get_llm_http_session()
+
+        assert llm is not feeds
+        assert llm.connector is not feeds.connector
+        assert feeds.connector.limit_per_host == 8
+        assert llm.connector.limit_per_host == 16
+        assert http.get_llm_http_session() is llm
+    finally:
+        await http.close_http_client()
@@ -0,0 +1,92 @@
+"""Tests for the bounded-parallel ingestion engine."""
+
+import asyncio
+from collections import Counter
+
+import pytest
+
+from app.connectors import AccountsUnavailableError, SourceUnavailableError
+from app.db.models import SourceType
+from app.worker.ingest_engine import IngestionEngine, SourceRef
+
+
+class FakeIngest:
+    """Ingest function recording how many sources of each group run at once."""
+
+    def __init__(self, types: dict[int, SourceType], behaviour: dict[int, str]):
+        self.types = types
+        self.behaviour = behaviour
+        self.running: Counter = Counter()
+        self.peak: Counter = Counter()
+        self.finished: list[int] = []
+
+    async def __call__(self, source_id: int, owner_user_id: int) -> int:
+        # RSS and website sources share one limit
+        kind = "telegram" if self.types[source_id] == SourceType.TELEGRAM else "http"
+        self.running[kind] += 1
+        self.peak[kind] = max(self.peak[kind], self.running[kind])
+        try:
+            action = self.behaviour.get(source_id)
+            if action == "hang":
+                await asyncio.sleep(10)
+            await asyncio.sleep(0.02)
+            if action == "unavailable":
+                raise SourceUnavailableError("feed is down")
+            if action == "no_account":
+                raise AccountsUnavailableError("all accounts rate-limited")
+            if action == "crash":
+                raise RuntimeError("boom")
+            self.finished.append(source_id)
+            return source_id % 3
+        finally:
+            self.running[kind] -= 1
+
+
+def refs(types: dict[int, SourceType]) -> list[SourceRef]:
+    return [SourceRef(source_id, 1, kind) for source_id, kind in types.items()]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_limited_per_type():
+    """RSS and website share one limit, Telegram has its own."""
+    types = {i: SourceType.RSS for i in range(6)}
+    types.update({i: SourceType.WEBSITE for i in range(6, 10)})
+    types.update({i: SourceType.TELEGRAM for i in range(10, 16)})
+    ingest = FakeIngest(types, {})
+
+    engine = IngestionEngine(ingest, rss_concurrency=3, telegram_concurrency=2, source_timeout=5)
+    stats = await engine.run(refs(types))
+
+    assert stats.total == 16
+    assert ingest.peak["http"] == 3
+    assert ingest.peak["telegram"] == 2
+    assert sorted(ingest.finished) == list(range(16))
+
+
+@pytest.mark.asyncio
+async def test_failures_are_isolated_and_counted():
+    """A timeout or an error in one source does not cancel the others."""
+    types = {i: SourceType.RSS for i in range(1, 7)}
+    types[7] = SourceType.TELEGRAM
+    behaviour = {2: "hang", 3: "unavailable", 4: "crash", 7: "no_account"}
+    ingest = FakeIngest(types, behaviour)
+
+    engine = IngestionEngine(ingest, rss_concurrency=6, telegram_concurrency=1, source_timeout=0.2)
+    stats = await engine.run(refs(types))
+    results = {result.source_id: result for result in stats.results}
+
+    assert sorted(ingest.finished) == [1, 5, 6]
+    assert results[2].timed_out and not results[2].ok
+    assert results[3].error == "feed is down"
+    assert results[4].error == "boom"
+    assert all(results[i].ok for i in (1, 5, 6))
+    assert results[7].deferred and results[7].error is None and not results[7].ok
+
+    assert stats.total == 7
+    assert stats.timeouts == 1
+    assert stats.errors == 2
+    assert stats.deferred == 1
+    assert stats.new_messages == 1 % 3 + 5 % 3 + 6 % 3
+    assert stats.slowest(1)[0].source_id == 2
+    assert stats.latency_percentile(100) == results[2].elapsed
+    assert stats.wall_time < 1
@@ -0,0 +1,36 @@
+"""Tests for language detection."""
+
+from pathlib import Path
+
+from langdetect.detector_factory import PROFILES_DIRECTORY
+
+from app.processing.lang import NgramLanguageDetector
+
+TEXTS = [
+    "Уряд затвердив нову програму підтримки малого бізнесу",
+    "Правительство утвердило новую программу поддержки бизнеса",
+    "The government approved a new programme for small business",
+    "Rząd zatwierdził nowy program wsparcia małych firm",
+    "ok 👍",
+    "",
+]
+
+
+def test_detects_batch_deterministically():
+    """Short texts are skipped and repeated batches give the same result."""
+    detector = NgramLanguageDetector.from_profiles(["uk", "ru", "en", "pl", "xx"])
+
+    assert detector.languages == ["uk", "ru", "en", "pl"]  # Unknown profile skipped
+    expected = ["uk", "ru", "en", "pl", None, None]
+    assert detector.detect_batch(TEXTS) == expected
+    assert detector.detect_batch(TEXTS) == expected
+    assert [detector.detect_batch([text])[0] for text in TEXTS] == expected
+
+
+def test_loads_every_shipped_profile():
+    """Profiles whose grams grow when lowercased (Turkish "İ") load too."""
+    languages = sorted(path.name for path in Path(PROFILES_DIRECTORY).iterdir())
+    detector = NgramLanguageDetector.from_profiles(languages)
+
+    assert detector.languages == languages
+    assert detector.detect_batch(["Bugün hava çok güzel ve İstanbul'da güneşli"]) == ["tr"]
@@ -0,0 +1,62 @@
+"""Tests for near-duplicate detection."""
+
+from app.processing.near_dup import (
+    MinHasher,
+    NearDuplicateDetector,
+    estimate_similarity,
+    normalize_for_shingles,
+)
+
+STORY = (
+    "Уряд затвердив нову програму підтримки малого бізнесу. Підприємці зможуть "
+    "отримати пільгові кредити під 5% річних на строк до трьох років."
+)
+REPOST = "🔥🔥 " + STORY + "\n\nПідписуйтесь: https://t.me/other_channel @other_channel"
+OTHER = (
+    "У Львові відкрили новий міст через залізницю, рух транспортом "
+    "обмежать на вихідних через фінальні роботи."
+)
+
+
+def test_normalization_drops_links_and_emoji():
+    assert normalize_for_shingles("🔥 Hello, WORLD! https://x.y/z @chan") == "hello world"
+
+
+def test_reposts_are_similar():
+    """Emoji, links and signatures barely change the signature."""
+    hasher = MinHasher(num_perm=128)
+
+    repost = estimate_similarity(hasher.signature(STORY), hasher.signature(REPOST))
+    unrelated = estimate_similarity(hasher.signature(STORY), hasher.signature(OTHER))
+
+    assert repost > 0.8
+    assert unrelated < 0.2
+    assert hasher.signature("🔥 !!!") is None
+
+
+def test_detector_finds_earlier_repost_within_window():
+    """Only earlier messages inside the time window are matched."""
+    detector = NearDuplicateDetector(num_perm=64, bands=16, threshold=0.7, window_seconds=3600)
+    signature = detector.hasher.signature
+
+    assert detector.check_and_add(1, 10, signature(STORY), at=1000) is None
+    assert detector.check_and_add(1, 11, signature(OTHER), at=1001) is None
+    match = detector.check_and_add(1, 12, signature(REPOST), at=1002)
+    assert match is not None and match[0] == 10
+
+    # Other owners and expired messages do not match
+    assert detector.check_and_add(2, 13, signature(REPOST), at=1003) is None
+    assert detector.check_and_add(1, 14, signature(REPOST), at=1000 + 7200) is None
+
+
+def test_backlog_added_out_of_order_expires_on_time():
+    """An older backlog message indexed after newer ones still leaves the window on time."""
+    detector = NearDuplicateDetector(num_perm=64, bands=16, threshold=0.7, window_seconds=3600)
+    signature = detector.hasher.signature
+
+    assert detector.check_and_add(1, 20, signature(OTHER), at=5000) is None
+    assert detector.check_and_add(1, 21, signature(STORY), at=1000) is None  # Backlog
+
+    # The story left the window although a newer message was indexed before it
+    assert detector.check_and_add(1, 22, signature(REPOST), at=1000 + 3700) is None
+    assert len(detector.index_for(1)) == 2
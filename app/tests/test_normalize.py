@@ -0,0 +1,14 @@
+"""Tests for text normalization."""
+
+from app.processing.normalize import normalize_text
+from app.publisher.formatter import format_post
+
+
+def test_whitespace_and_control_characters():
+    assert normalize_text("  Рядок\n\n\n\tдругий\xa0рядок  ") == "Рядок другий рядок"
+    assert normalize_text("a \x00 b​c﻿ d") == "a bc d"
+    assert normalize_text("") == ""
+
+
+def test_format_post_truncates():
+    assert format_post("слово " * 10, max_length=20) == "слово слово слово..."
@@ -0,0 +1,88 @@
+"""Tests for repository statements that need no database."""
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.db.repo import Repository
+
+
+class FakeResult:
+    def __init__(self, ids: list[int]):
+        self.ids = ids
+
+    def scalars(self):
+        return self
+
+    def all(self) -> list[int]:
+        return self.ids
+
+
+class FakeSession:
+    """Applies ON CONFLICT DO NOTHING on (source_id, external_id) in memory."""
+
+    def __init__(self, existing: set[tuple[int, str]]):
+        self.existing = existing
+        self.next_id = 100
+        self.statements: list[str] = []
+
+    async def execute(self, stmt):
+        compiled = stmt.compile(dialect=postgresql.dialect())
+        self.statements.append(str(compiled))
+        params = compiled.params
+        ids = []
+        row = 0
+        while f"source_id_m{row}" in params:
+            key = (params[f"source_id_m{row}"], params[f"external_id_m{row}"])
+            if key not in self.existing:
+                self.existing.add(key)
+                ids.append(self.next_id)
+                self.next_id += 1
+            row += 1
+        return FakeResult(ids)
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_skips_known_and_repeated_entries():
+    session = FakeSession(existing={(7, "a"), (8, "c")})
+    repo = Repository(session)
+
+    rows = [{"external_id": eid, "text": eid} for eid in ("a", "b", "b", "c", "d")]
+    inserted = await repo.bulk_create_raw_messages(owner_user_id=1, source_id=7, rows=rows)
+
+    # "a" exists in the source, "c" only in another source, "b" is sent once
+    assert inserted == [100, 101, 102]
+    [sql] = session.statements
+    assert "ON CONFLICT ON CONSTRAINT uq_raw_message_source_external DO NOTHING" in sql
+    assert "RETURNING raw_messages.id" in sql
+    assert sql.count("%(external_id_m") == 4
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_of_known_entries_returns_nothing():
+    session = FakeSession(existing={(7, "a")})
+    repo = Repository(session)
+
+    assert await repo.bulk_create_raw_messages(1, 7, [{"external_id": "a"}]) == []
+    assert await repo.bulk_create_raw_messages(1, 7, []) == []
+    assert len(session.statements) == 1
+
+
+class RecordingSession:
+    def __init__(self):
+        self.statements: list[str] = []
+
+    async def execute(self, stmt):
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+
+
+@pytest.mark.asyncio
+async def test_watermark_only_moves_forward_and_keeps_updated_at():
+    session = RecordingSession()
+    repo = Repository(session)
+
+    await repo.advance_source_watermark(3, 1, 250)
+    await repo.advance_source_watermark(3, 1, None)
+
+    [sql] = session.statements
+    assert "last_message_id=greatest(coalesce(sources.last_message_id" in sql
+    assert "updated_at=sources.updated_at" in sql
@@ -0,0 +1,126 @@
+"""Tests for feed fetching against a local HTTP server."""
+
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+
+from app.connectors import rss_ingestor
+from app.connectors.rss_ingestor import fetch_rss_feed, ingest_rss_source
+
+RSS = """<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Feed</title>
+{items}
+</channel></rss>"""
+
+
+def rss_items(*guids: str) -> str:
+    return "".join(
+        f"<item><guid>{guid}</guid><title>Item {guid}</title>"
+        f"<description>Text of {guid}</description></item>"
+        for guid in guids
+    )
+
+
+class FixtureFeed:
+    """Feed server that ignores validators, like many real ones."""
+
+    def __init__(self, body: str):
+        self.body = body
+        self.requests = 0
+        self.app = web.Application()
+        self.app.router.add_get("/feed", self.handle)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        return web.Response(text=self.body, content_type="application/rss+xml")
+
+
+@asynccontextmanager
+async def serve(feed: FixtureFeed):
+    server = TestServer(feed.app)
+    await server.start_server()
+    feed.url = str(server.make_url("/feed"))
+    try:
+        async with ClientSession() as session:
+            yield session
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_unchanged_body_is_not_parsed_again(settings):
+    """A body identical to the previous fetch short-circuits before parsing."""
+    feed = FixtureFeed(RSS.format(items=rss_items("b", "a")))
+    async with serve(feed) as session:
+        first = await fetch_rss_feed(feed.url, session=session)
+        assert not first.not_modified
+        assert [entry.id for entry in first.feed.entries] == ["b", "a"]
+
+        second = await fetch_rss_feed(feed.url, previous_hash=first.body_hash, session=session)
+        assert second.not_modified
+        assert second.feed is None
+        assert second.body_hash == first.body_hash
+
+        feed.body = RSS.format(items=rss_items("c", "b", "a"))
+        third = await fetch_rss_feed(feed.url, previous_hash=first.body_hash, session=session)
+        assert not third.not_modified
+        assert third.body_hash != first.body_hash
+        assert len(third.feed.entries) == 3
+
+
+class FeedRepo:
+    """Stored entries and source columns of one feed source."""
+
+    def __init__(self):
+        self.stored: list[str] = []
+        self.inserts = 0
+
+    async def get_recent_external_ids(self, source_id, owner_user_id, limit):
+        return set(self.stored[-limit:])
+
+    async def get_existing_external_ids(self, source_id, owner_user_id, external_ids):
+        return set(external_ids) & set(self.stored)
+
+    async def bulk_create_raw_messages(self, owner_user_id, source_id, rows):
+        self.inserts += 1
+        self.stored.extend(row["external_id"] for row in rows)
+        return list(range(len(rows)))
+
+    async def update_source(self, source_id, owner_user_id, touch=True, **values):
+        for key, value in values.items():
+            setattr(self.source, key, value)
+
+
+@pytest.mark.asyncio
+async def test_streamed_identical_body_short_circuits(settings, monkeypatch):
+    """With streaming, a fully read body is hashed; an identical refetch stores nothing."""
+    settings.rss_streaming_enabled = True
+    feed = FixtureFeed(RSS.format(items=rss_items("b", "a")))
+    repo = FeedRepo()
+
+    async with serve(feed) as session:
+        monkeypatch.setattr(rss_ingestor, "get_http_session", lambda: session)
+        repo.source = source = SimpleNamespace(
+            id=1, owner_user_id=1, url=feed.url,
+            http_etag=None, http_last_modified=None, feed_body_hash=None,
+        )
+
+        assert await ingest_rss_source(source, repo) == 2
+        body_hash = source.feed_body_hash
+        assert body_hash is not None
+
+        assert await ingest_rss_source(source, repo) == 0
+        assert repo.inserts == 1
+
+        # A newest-first body that is abandoned at known entries keeps the stored hash
+        feed.body = RSS.format(items="".join(
+            f"<item><guid>{guid}</guid><title>{guid}</title><description>x</description>"
+            f"<pubDate>0{day} Jan 2024 10:00:00 +0000</pubDate></item>"
+            for guid, day in (("c", 3), ("b", 2), ("a", 1))
+        ))
+        assert await ingest_rss_source(source, repo) == 1
+        assert repo.stored == ["b", "a", "c"]
+        assert source.feed_body_hash == body_hash
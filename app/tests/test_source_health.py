@@ -0,0 +1,73 @@
+"""Tests for source failure backoff and circuit breaking."""
+
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from app.db.models import CircuitState, SourceType
+from app.worker import source_health
+from app.worker.ingest_engine import SourceIngestResult
+from app.worker.source_health import backoff_delay, record_ingest_outcomes
+
+
+def test_backoff_doubles_per_failure():
+    """Each consecutive failure doubles the delay, starting at the interval."""
+    assert [backoff_delay(n, 600, 10**6) for n in (1, 2, 3, 4)] == [600, 1200, 2400, 4800]
+
+
+def test_backoff_is_capped():
+    """The delay never exceeds the configured maximum."""
+    assert backoff_delay(20, 600, 3600) == 3600
+
+
+class HealthSession:
+    """Sources by ID; records the bulk UPDATE statements."""
+
+    def __init__(self, sources: dict[int, SimpleNamespace]):
+        self.sources = sources
+        self.loaded: list[int] = []
+        self.updates = 0
+
+    async def execute(self, stmt):
+        self.updates += 1
+
+    async def get(self, model, source_id: int):
+        self.loaded.append(source_id)
+        return self.sources.get(source_id)
+
+
+def failing_source(source_id: int, failure_count: int = 0) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=source_id, owner_user_id=1, title=f"Source {source_id}", handle=None, url=None,
+        failure_count=failure_count, circuit_state=CircuitState.CLOSED, is_active=True,
+        check_interval_minutes=10, last_error=None, last_failure_at=None,
+        next_retry_at=None, updated_at=None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_deferred_sources_are_not_counted(settings, monkeypatch):
+    """Sources no Telegram account could read keep their failure state."""
+    settings.source_quarantine_failures = 10
+    sources = {2: failing_source(2), 3: failing_source(3, failure_count=9)}
+    session = HealthSession(sources)
+
+    @asynccontextmanager
+    async def fake_session():
+        yield session
+
+    monkeypatch.setattr(source_health, "get_session", fake_session)
+    results = [
+        SourceIngestResult(1, SourceType.RSS),
+        SourceIngestResult(2, SourceType.RSS, error="HTTP 500"),
+        SourceIngestResult(3, SourceType.TELEGRAM, deferred=True),
+    ]
+
+    delays = await record_ingest_outcomes(results, base_intervals={2: 600, 3: 600})
+
+    assert delays == {2: 600}
+    assert session.loaded == [2]
+    assert sources[2].failure_count == 1
+    assert sources[3].failure_count == 9
+    assert sources[3].is_active
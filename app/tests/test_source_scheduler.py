@@ -0,0 +1,122 @@
+"""Tests for the due-time source scheduler."""
+
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from app.db.models import SourceType
+from app.worker.source_scheduler import SourceScheduler
+
+NOW = 1_700_000_000.0
+
+Row = namedtuple(
+    "Row",
+    "id owner_user_id source_type check_interval_minutes last_checked_at "
+    "poll_interval_seconds next_retry_at",
+)
+
+
+def checked(seconds_ago: float) -> datetime:
+    return datetime.fromtimestamp(NOW - seconds_ago, tz=timezone.utc)
+
+
+def add(scheduler: SourceScheduler, source_id: int, minutes: int = 10, **kwargs):
+    scheduler.upsert(source_id, 1, SourceType.RSS, minutes, now=NOW, **kwargs)
+
+
+def due_ids(scheduler: SourceScheduler, now: float = NOW) -> list[int]:
+    return [ref.source_id for ref in scheduler.pop_due(now=now)]
+
+
+def test_sources_come_due_in_order():
+    scheduler = SourceScheduler()
+    add(scheduler, 1, last_checked_at=checked(300))    # due in 5 minutes
+    add(scheduler, 2)                                  # never checked, due now
+    add(scheduler, 3, last_checked_at=checked(900))    # overdue by 5 minutes
+    add(scheduler, 4, last_checked_at=checked(60))     # due in 9 minutes
+
+    assert due_ids(scheduler) == [3, 2]
+    assert scheduler.next_due_at() == NOW + 300
+    assert due_ids(scheduler, NOW + 600) == [1, 4]
+    assert due_ids(scheduler, NOW + 3600) == []  # In flight until completed
+
+
+def test_completed_source_is_rescheduled_by_interval():
+    scheduler = SourceScheduler()
+    add(scheduler, 1, minutes=5)
+    assert due_ids(scheduler) == [1]
+
+    scheduler.complete(1, now=NOW + 10)
+    assert due_ids(scheduler, NOW + 309) == []
+    assert due_ids(scheduler, NOW + 310) == [1]
+
+    scheduler.complete(1, now=NOW + 310, delay=30)
+    assert due_ids(scheduler, NOW + 340) == [1]
+
+
+def test_upsert_replaces_due_time():
+    """The old heap item of an updated source is skipped as stale."""
+    scheduler = SourceScheduler()
+    add(scheduler, 1, last_checked_at=checked(0))
+    add(scheduler, 1, minutes=60, last_checked_at=checked(0))
+
+    assert scheduler.get(1).next_due == NOW + 3600
+    assert due_ids(scheduler, NOW + 600) == []
+    assert due_ids(scheduler, NOW + 3600) == [1]
+
+    scheduler.complete(1, now=NOW + 3600)
+    add(scheduler, 1, last_checked_at=checked(0), retry_at=checked(-7200))
+    assert due_ids(scheduler, NOW + 7199) == []
+    assert due_ids(scheduler, NOW + 7200) == [1]
+
+
+def test_upsert_of_source_in_flight_keeps_it_in_flight():
+    scheduler = SourceScheduler()
+    add(scheduler, 1)
+    assert due_ids(scheduler) == [1]
+
+    add(scheduler, 1, minutes=30, last_checked_at=checked(3600))
+    assert due_ids(scheduler) == []
+
+    scheduler.complete(1, now=NOW)
+    assert due_ids(scheduler, NOW + 1799) == []
+    assert due_ids(scheduler, NOW + 1800) == [1]
+
+
+def test_removed_source_is_never_due():
+    scheduler = SourceScheduler()
+    add(scheduler, 1)
+    add(scheduler, 2)
+    scheduler.remove(1)
+
+    assert 1 not in scheduler
+    assert len(scheduler) == 1
+    assert due_ids(scheduler) == [2]
+
+    # A source deactivated while in flight is not rescheduled
+    scheduler.remove(2)
+    scheduler.complete(2, now=NOW)
+    assert due_ids(scheduler, NOW + 3600) == []
+    assert scheduler.next_due_at() is None
+
+
+def test_rebuild_replaces_all_sources():
+    scheduler = SourceScheduler()
+    add(scheduler, 1)
+    add(scheduler, 2)
+
+    scheduler.rebuild(
+        [
+            Row(2, 1, SourceType.RSS, 10, checked(0), None, None),
+            Row(3, 7, SourceType.TELEGRAM, 10, None, None, None),
+            Row(4, 1, SourceType.WEBSITE, 10, checked(0), 120, None),
+        ],
+        now=NOW,
+    )
+
+    assert len(scheduler) == 3
+    assert 1 not in scheduler
+    assert scheduler.get(3).ref.owner_user_id == 7
+    assert scheduler.get(4).interval_seconds == 120
+    assert due_ids(scheduler) == [3]
+    assert due_ids(scheduler, NOW + 120) == [4]
+    assert due_ids(scheduler, NOW + 600) == [2]
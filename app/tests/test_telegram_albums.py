@@ -0,0 +1,50 @@
+"""Tests for Telegram album aggregation."""
+
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.connectors.telegram_ingestor import (
+    album_to_row,
+    group_albums,
+    hold_back_partial_album,
+)
+
+
+def message(message_id: int, grouped_id=None, text: str = ""):
+    return SimpleNamespace(
+        id=message_id, grouped_id=grouped_id, text=text, date=datetime(2024, 1, 1)
+    )
+
+
+def test_album_parts_are_grouped():
+    """Parts sharing grouped_id form one group, other messages stay single."""
+    messages = [message(1), message(3, 7), message(2, 7, "Caption"), message(4)]
+
+    groups = group_albums(messages)
+
+    assert [[part.id for part in group] for group in groups] == [[1], [2, 3], [4]]
+
+
+def test_album_row_merges_caption_and_media():
+    """An album becomes one row keyed by its first part with all media paths."""
+    album = [message(10, 7), message(11, 7, "Caption"), message(12, 7)]
+    paths = {10: "/m/10.jpg", 11: "/m/11.jpg", 12: None}
+
+    row = album_to_row(album, paths)
+
+    assert row["external_id"] == "10"
+    assert row["text"] == "Caption"
+    assert json.loads(row["media_paths"]) == ["/m/10.jpg", "/m/11.jpg"]
+
+
+def test_partial_album_at_page_end_is_held_back():
+    """A trailing album is left for the next page unless it fills the page."""
+    page = [message(1), message(2, 7), message(3, 7)]
+
+    keep, held = hold_back_partial_album(page)
+    assert [m.id for m in keep] == [1]
+    assert [m.id for m in held] == [2, 3]
+
+    only_album = [message(2, 7), message(3, 7)]
+    assert hold_back_partial_album(only_album) == (only_album, [])
@@ -0,0 +1,72 @@
+"""Tests for the Telegram media downloader."""
+
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from telethon.client.downloads import DownloadMethods
+from telethon.tl.types import PhotoSize, PhotoSizeProgressive, PhotoStrippedSize
+
+from app.media.telegram_download import MediaDownloader, choose_photo_size
+
+
+class FakeClient:
+    pass
+
+
+class PhotoMessage:
+    """Photo message whose download picks the thumb the way Telethon does."""
+
+    def __init__(self, message_id: int, sizes: list):
+        self.id = message_id
+        self.chat_id = -1001
+        self.photo = SimpleNamespace(sizes=sizes)
+        self.media = self.photo
+        self.client = FakeClient()
+        self.thumbs: list = []
+
+    async def download_media(self, file: str, thumb=None):
+        self.thumbs.append(thumb)
+        size = DownloadMethods._get_thumb(self.photo.sizes, thumb)
+        if size is None:
+            return None
+        path = Path(f"{file}.jpg")
+        path.write_bytes(b"\xff" * max(size.sizes))
+        return str(path)
+
+
+PROGRESSIVE_SIZES = [
+    PhotoStrippedSize(type="i", bytes=b"\x01\x02"),
+    PhotoSize(type="m", w=320, h=240, size=15_000),
+    PhotoSizeProgressive(type="x", w=1280, h=960, sizes=[20_000, 60_000, 120_000]),
+    PhotoSizeProgressive(type="y", w=2560, h=1920, sizes=[50_000, 200_000, 400_000]),
+]
+
+
+def test_smallest_adequate_progressive_size_is_chosen():
+    size = choose_photo_size(PROGRESSIVE_SIZES, target_px=1280)
+
+    assert size.type == "x"
+
+
+@pytest.mark.asyncio
+async def test_progressive_photo_is_downloaded(settings, tmp_path):
+    downloader = MediaDownloader(photo_target_px=1280)
+    message = PhotoMessage(7, PROGRESSIVE_SIZES)
+
+    path = await downloader.download(message, tmp_path)
+
+    assert message.thumbs == ["x"]
+    assert path is not None and Path(path).stat().st_size == 120_000
+    assert downloader.stats.downloaded == 1
+    assert downloader.stats.bytes_downloaded == 120_000
+
+
+@pytest.mark.asyncio
+async def test_oversized_photo_is_skipped(settings, tmp_path):
+    downloader = MediaDownloader(max_file_bytes=100_000, photo_target_px=2000)
+    message = PhotoMessage(8, PROGRESSIVE_SIZES)
+
+    assert await downloader.download(message, tmp_path) is None
+    assert message.thumbs == []
+    assert downloader.stats.skipped_too_large == 1
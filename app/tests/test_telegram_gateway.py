@@ -0,0 +1,89 @@
+"""Tests for the Telegram gateway socket protocol."""
+
+import tempfile
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import pytest
+from telethon.errors import FloodWaitError
+
+from app.connectors import SourceUnavailableError
+from app.connectors.telegram_gateway import (
+    ERROR_FLOOD_WAIT,
+    ERROR_INTERNAL,
+    ERROR_UNAVAILABLE,
+    MAX_LINE_BYTES,
+    TelegramGatewayClient,
+    TelegramGatewayError,
+    TelegramGatewayUnavailable,
+)
+from app.worker.gateway_server import TelegramGatewayServer
+
+
+@asynccontextmanager
+async def serve():
+    with tempfile.TemporaryDirectory() as tmp:
+        server = TelegramGatewayServer(Path(tmp) / "gateway.sock")
+
+        async def echo(handle, limit=100):
+            return [{"id": message_id, "text": handle} for message_id in range(limit, 0, -1)]
+
+        async def flooded(handle):
+            raise FloodWaitError(request=None, capture=42)
+
+        async def missing(handle):
+            raise SourceUnavailableError(f"@{handle} not found")
+
+        server.register("echo", echo)
+        server.register("resolve", missing)
+        server.register("flooded", flooded)
+        await server.start()
+        try:
+            yield TelegramGatewayClient(server.socket_path, timeout=5)
+        finally:
+            await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_round_trip():
+    """Results of gateway methods reach the client."""
+    async with serve() as client:
+        messages = await client.call("echo", handle="news", limit=3)
+
+    assert [message["id"] for message in messages] == [3, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_errors_are_mapped():
+    """FloodWait and unknown channels reach the client as typed errors."""
+    async with serve() as client:
+        with pytest.raises(TelegramGatewayError) as flood:
+            await client.call("flooded", handle="news")
+        with pytest.raises(TelegramGatewayError) as missing:
+            await client.resolve("nope")
+
+    assert flood.value.kind == ERROR_FLOOD_WAIT
+    assert flood.value.seconds == 42
+    assert missing.value.kind == ERROR_UNAVAILABLE
+
+
+@pytest.mark.asyncio
+async def test_gateway_not_running():
+    """A missing socket is reported as an unavailable gateway."""
+    client = TelegramGatewayClient(Path("/nonexistent/gateway.sock"), timeout=1)
+
+    with pytest.raises(TelegramGatewayUnavailable):
+        await client.resolve("news")
+
+
+@pytest.mark.asyncio
+async def test_oversized_request_is_rejected():
+    """A request longer than the line limit gets an error instead of killing the handler."""
+    async with serve() as client:
+        with pytest.raises(TelegramGatewayError) as oversized:
+            await client.call("echo", handle="x" * (MAX_LINE_BYTES + 1))
+        # The server keeps serving other connections
+        messages = await client.call("echo", handle="news", limit=1)
+
+    assert oversized.value.kind == ERROR_INTERNAL
+    assert messages == [{"id": 1, "text": "news"}]
@@ -0,0 +1,284 @@
+"""Tests for Telegram history reads and push ingestion."""
+
+from contextlib import asynccontextmanager
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Optional
+
+import pytest
+from telethon.errors import ChannelInvalidError
+from telethon.tl.types import InputPeerChannel, Message, PeerChannel
+
+from app.connectors import telegram_ingestor
+from app.connectors.telegram_ingestor import fetch_new_messages, resolve_source_peer
+from app.connectors.telegram_pool import PRIMARY_ACCOUNT, TelegramAccount
+
+
+def message(message_id: int, grouped_id=None, text: str = "post"):
+    return SimpleNamespace(
+        id=message_id, grouped_id=grouped_id, text=text, date=datetime(2024, 1, 1)
+    )
+
+
+class FakeClient:
+    """Channel history served the way `iter_messages` pages it."""
+
+    def __init__(self, messages: list):
+        self.messages = sorted(messages, key=lambda m: m.id)
+        self.calls: list[dict] = []
+
+    async def iter_messages(
+        self, entity, limit: Optional[int] = None, min_id: int = 0, reverse: bool = False, **kwargs
+    ):
+        self.calls.append({"min_id": min_id, "reverse": reverse, "limit": limit})
+        selected = [m for m in self.messages if m.id > min_id]
+        if not reverse:
+            selected.reverse()
+        for m in selected[:limit]:
+            yield m
+
+
+PEER = InputPeerChannel(channel_id=1, access_hash=2)
+
+
+@pytest.mark.asyncio
+async def test_first_run_reads_latest_messages_oldest_first(settings):
+    client = FakeClient([message(i) for i in range(1, 11)])
+
+    fetched, max_id = await fetch_new_messages(client, PEER, None, limit=3)
+
+    assert [m.id for m in fetched] == [8, 9, 10]
+    assert max_id == 10
+    assert client.calls == [{"min_id": 0, "reverse": False, "limit": 3}]
+
+
+@pytest.mark.asyncio
+async def test_incremental_run_pages_from_watermark(settings):
+    client = FakeClient([message(i) for i in range(1, 11)])
+
+    fetched, max_id = await fetch_new_messages(client, PEER, 4, limit=3, max_catchup=20)
+
+    assert [m.id for m in fetched] == [5, 6, 7, 8, 9, 10]
+    assert max_id == 10
+    assert client.calls == [{"min_id": 4, "reverse": True, "limit": 20}]
+
+
+@pytest.mark.asyncio
+async def test_catch_up_limit_holds_back_partial_album(settings):
+    client = FakeClient(
+        [message(1), message(2), message(3, grouped_id=9), message(4, grouped_id=9), message(5, grouped_id=9)]
+    )
+
+    fetched, max_id = await fetch_new_messages(client, PEER, 1, max_catchup=3)
+
+    # Album 9 may continue past the page; it is read whole next time
+    assert [m.id for m in fetched] == [2]
+    assert max_id == 2
+
+
+@pytest.mark.asyncio
+async def test_empty_result_keeps_watermark(settings):
+    client = FakeClient([message(i) for i in range(1, 6)])
+
+    fetched, max_id = await fetch_new_messages(client, PEER, 5, max_catchup=20)
+    assert fetched == []
+    assert max_id == 5
+
+    fetched, max_id = await fetch_new_messages(FakeClient([]), PEER, None)
+    assert fetched == []
+    assert max_id is None
+
+
+class FakeRepo:
+    """Sources and raw messages of the push path, kept in memory."""
+
+    def __init__(self, sources: dict[int, SimpleNamespace]):
+        self.sources = sources
+        self.stored: set[tuple[int, str]] = set()
+
+    async def get_source(self, source_id: int, owner_user_id: int):
+        return self.sources.get(source_id)
+
+    async def bulk_create_raw_messages(self, owner_user_id: int, source_id: int, rows: list):
+        inserted = []
+        for row in rows:
+            key = (source_id, row["external_id"])
+            if key not in self.stored:
+                self.stored.add(key)
+                inserted.append(len(self.stored))
+        return inserted
+
+    async def advance_source_watermark(self, source_id, owner_user_id, message_id):
+        source = self.sources[source_id]
+        source.last_message_id = max(source.last_message_id or 0, message_id)
+
+
+@pytest.fixture
+def push_repo(monkeypatch):
+    sources = {
+        1: SimpleNamespace(id=1, owner_user_id=10, is_active=True, last_message_id=100),
+        2: SimpleNamespace(id=2, owner_user_id=20, is_active=True, last_message_id=100),
+    }
+    repo = FakeRepo(sources)
+
+    @asynccontextmanager
+    async def fake_session():
+        yield None
+
+    async def fake_build_album_row(messages, media_storage):
+        return {"external_id": str(messages[0].id), "text": messages[0].text}
+
+    monkeypatch.setattr(telegram_ingestor, "get_session", fake_session)
+    monkeypatch.setattr(telegram_ingestor, "Repository", lambda session: repo)
+    monkeypatch.setattr(telegram_ingestor, "build_album_row", fake_build_album_row)
+    monkeypatch.setattr(telegram_ingestor, "_push_sources", {555: [(1, 10), (2, 20)]})
+    monkeypatch.setattr(telegram_ingestor, "_caught_up", set())
+    return repo
+
+
+def pushed(message_id: int, grouped_id=None, text: str = "post") -> Message:
+    pushed_message = Message(
+        id=message_id, peer_id=PeerChannel(555), date=datetime(2024, 1, 1), message="",
+        grouped_id=grouped_id,
+    )
+    pushed_message.text = text
+    return pushed_message
+
+
+@pytest.mark.asyncio
+async def test_pushed_post_advances_watermark_of_caught_up_sources(settings, push_repo):
+    telegram_ingestor._caught_up.add(1)
+
+    await telegram_ingestor._store_pushed_group([pushed(105, 7), pushed(106, 7, "Caption")])
+    await telegram_ingestor._store_pushed_group([pushed(104)])  # Arrived late
+    await telegram_ingestor._store_pushed_group([pushed(107, text="")])  # Not stored
+
+    assert push_repo.stored == {(1, "105"), (1, "104"), (2, "105"), (2, "104")}
+    assert push_repo.sources[1].last_message_id == 107
+    # Still catching up: history before the pushes may be unread
+    assert push_repo.sources[2].last_message_id == 100
+
+
+@pytest.mark.asyncio
+async def test_catch_up_reads_until_watermark_stops(settings, push_repo, monkeypatch):
+    channel_head = 1150
+    rounds = []
+
+    async def fake_ingest(source, repo, force=False):
+        assert force
+        rounds.append(source.last_message_id)
+        await repo.advance_source_watermark(
+            source.id, source.owner_user_id, min(source.last_message_id + 500, channel_head)
+        )
+        return 0
+
+    monkeypatch.setattr(telegram_ingestor, "ingest_telegram_source", fake_ingest)
+    push_repo.sources[2].is_active = False
+
+    await telegram_ingestor.catch_up_push_sources()
+
+    assert rounds == [100, 600, 1100, 1150]
+    assert push_repo.sources[1].last_message_id == channel_head
+    assert telegram_ingestor._caught_up == {1}
+
+    # Caught up sources are not read again by later catch-ups
+    await telegram_ingestor.catch_up_push_sources()
+    assert len(rounds) == 4
+
+
+class PeerClient(FakeClient):
+    """Resolves handles to channel peers; rejects peers with a revoked access hash."""
+
+    def __init__(self, messages: list, access_hash: int):
+        super().__init__(messages)
+        self.access_hash = access_hash
+        self.resolved: list[str] = []
+
+    def is_connected(self) -> bool:
+        return True
+
+    async def get_input_entity(self, handle: str):
+        self.resolved.append(f"input:{handle}")
+        return InputPeerChannel(channel_id=1, access_hash=self.access_hash)
+
+    async def get_entity(self, handle: str):
+        self.resolved.append(f"entity:{handle}")
+        return InputPeerChannel(channel_id=1, access_hash=self.access_hash)
+
+    async def iter_messages(self, entity, **kwargs):
+        if entity.access_hash != self.access_hash:
+            raise ChannelInvalidError(request=None)
+        async for m in super().iter_messages(entity, **kwargs):
+            yield m
+
+
+class SourceRepo:
+    def __init__(self):
+        self.updates: list[dict] = []
+
+    async def update_source(self, source_id, owner_user_id, touch=True, **values):
+        assert not touch
+        self.updates.append(values)
+
+
+def telegram_source(telegram_id=None, access_hash=None, last_message_id=None):
+    return SimpleNamespace(
+        id=3, owner_user_id=10, handle="news", telegram_id=telegram_id,
+        telegram_access_hash=access_hash, last_message_id=last_message_id,
+    )
+
+
+@pytest.fixture
+def peer_cache(monkeypatch):
+    cache = {}
+    monkeypatch.setattr(telegram_ingestor, "_peer_cache", cache)
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_stored_peer_needs_no_network(settings, peer_cache):
+    client = PeerClient([], access_hash=2)
+    account = TelegramAccount(name=PRIMARY_ACCOUNT, client=client)
+    repo = SourceRepo()
+
+    peer = await resolve_source_peer(account, telegram_source(1, 2), repo)
+    cached = await resolve_source_peer(account, telegram_source(1, None), repo)
+
+    assert peer == InputPeerChannel(channel_id=1, access_hash=2)
+    assert cached is peer
+    assert client.resolved == []
+    assert repo.updates == []
+
+
+@pytest.mark.asyncio
+async def test_unknown_peer_is_resolved_and_stored(settings, peer_cache):
+    primary = TelegramAccount(name=PRIMARY_ACCOUNT, client=PeerClient([], access_hash=2))
+    extra = TelegramAccount(name="extra1", client=PeerClient([], access_hash=5))
+    repo = SourceRepo()
+
+    await resolve_source_peer(primary, telegram_source(), repo)
+    # Access hashes are per account; other accounts store only the channel ID
+    peer = await resolve_source_peer(extra, telegram_source(1, 2), repo)
+
+    assert peer.access_hash == 5
+    assert primary.client.resolved == ["input:news"]
+    assert extra.client.resolved == ["input:news"]
+    assert repo.updates == [{"telegram_id": 1, "telegram_access_hash": 2}]
+    assert set(peer_cache) == {(PRIMARY_ACCOUNT, 1), ("extra1", 1)}
+
+
+@pytest.mark.asyncio
+async def test_stale_access_hash_is_resolved_again(settings, peer_cache):
+    client = PeerClient([message(i) for i in range(1, 6)], access_hash=9)
+    account = TelegramAccount(name=PRIMARY_ACCOUNT, client=client)
+    repo = SourceRepo()
+
+    fetched, max_id = await telegram_ingestor._fetch_source_messages(
+        account, telegram_source(1, 2, last_message_id=3), repo, limit=50, max_catchup=20
+    )
+
+    assert [m.id for m in fetched] == [4, 5]
+    assert max_id == 5
+    assert client.resolved == ["entity:news"]
+    assert repo.updates == [{"telegram_id": 1, "telegram_access_hash": 9}]
+    assert peer_cache[(PRIMARY_ACCOUNT, 1)].access_hash == 9
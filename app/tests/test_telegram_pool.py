@@ -0,0 +1,52 @@
+"""Tests for the Telegram account pool."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.connectors import AccountsUnavailableError
+from app.connectors.telegram_pool import HashRing, TelegramAccount, TelegramAccountPool
+
+
+def make_pool(*names: str) -> TelegramAccountPool:
+    accounts = [TelegramAccount(name=name, client=SimpleNamespace()) for name in names]
+    return TelegramAccountPool(accounts, replicas=64)
+
+
+def test_ring_moves_only_removed_accounts_channels():
+    """Removing an account reassigns only the channels it owned."""
+    handles = [f"channel{i}" for i in range(300)]
+    before = HashRing(["a", "b", "c"])
+    after = HashRing(["a", "b"])
+
+    moved = [
+        handle for handle in handles
+        if next(before.walk(handle)) != next(after.walk(handle))
+    ]
+
+    assert moved
+    assert all(next(before.walk(handle)) == "c" for handle in moved)
+    owners = {next(before.walk(handle)) for handle in handles}
+    assert owners == {"a", "b", "c"}
+
+
+def test_limited_account_hands_over_channels():
+    """A rate-limited account's channels go to the next account until it recovers."""
+    pool = make_pool("primary", "extra1", "extra2")
+    owner = pool.account_for("somechannel")
+
+    pool.mark_limited(owner, 300)
+    fallback = pool.account_for("somechannel")
+    assert fallback is not owner
+
+    owner.limited_until = 0
+    assert pool.account_for("SomeChannel") is owner
+
+
+def test_no_available_account():
+    """Raises when every account is disabled."""
+    pool = make_pool("primary")
+    pool.mark_disabled(pool.primary, "banned")
+
+    with pytest.raises(AccountsUnavailableError):
+        pool.account_for("somechannel")
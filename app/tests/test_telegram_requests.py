@@ -0,0 +1,88 @@
+"""Tests for the Telegram request scheduler."""
+
+import asyncio
+
+import pytest
+from telethon.errors import FloodWaitError
+
+from app.connectors.telegram_requests import (
+    RequestKind,
+    TelegramRequestScheduler,
+    TokenBucket,
+    history_cost,
+)
+
+
+def make_scheduler(max_auto_wait: float = 60) -> TelegramRequestScheduler:
+    return TelegramRequestScheduler(
+        per_minute={kind: 6000 for kind in RequestKind},
+        burst=10,
+        max_auto_wait=max_auto_wait,
+    )
+
+
+def test_token_bucket_reservations():
+    """Requests beyond the burst wait in arrival order at the refill rate."""
+    bucket = TokenBucket(rate_per_second=2, capacity=2)
+    now = bucket.updated
+
+    assert bucket.reserve(now=now) == 0
+    assert bucket.reserve(now=now) == 0
+    assert bucket.reserve(now=now) == pytest.approx(0.5)
+    assert bucket.reserve(now=now) == pytest.approx(1.0)
+    assert history_cost(250) == 3
+
+
+@pytest.mark.asyncio
+async def test_short_flood_wait_is_retried():
+    """A FloodWait within the limit pauses the kind and the call is retried."""
+    scheduler = make_scheduler()
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise FloodWaitError(request=None, capture=0)
+        return "ok"
+
+    assert await scheduler.call(RequestKind.HISTORY, flaky) == "ok"
+    metrics = scheduler.metrics()["history"]
+    assert metrics["flood_waits"] == 1
+    assert metrics["flood_retries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_long_flood_wait_pauses_only_its_kind():
+    """A long FloodWait is raised and pauses only the affected request kind."""
+    scheduler = make_scheduler(max_auto_wait=10)
+
+    async def flooded():
+        raise FloodWaitError(request=None, capture=300)
+
+    async def ok():
+        return "ok"
+
+    with pytest.raises(FloodWaitError):
+        await scheduler.call(RequestKind.MEDIA, flooded)
+
+    assert scheduler.paused_for(RequestKind.MEDIA) > 290
+    assert scheduler.paused_for(RequestKind.HISTORY) == 0
+    assert await asyncio.wait_for(scheduler.call(RequestKind.HISTORY, ok), 1) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_media_yields_to_queued_history():
+    """Media downloads wait while history requests are queued."""
+    scheduler = make_scheduler()
+    scheduler.pause(RequestKind.HISTORY, 0.05)
+    order = []
+
+    async def record(name):
+        order.append(name)
+
+    await asyncio.gather(
+        scheduler.call(RequestKind.HISTORY, record, "history"),
+        scheduler.call(RequestKind.MEDIA, record, "media"),
+    )
+
+    assert order == ["history", "media"]
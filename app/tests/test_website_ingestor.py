@@ -0,0 +1,248 @@
+"""Tests for the website crawler against a local HTTP server."""
+
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+
+from app.connectors import SourceUnavailableError
+from app.connectors import website_ingestor
+from app.connectors.website_ingestor import (
+    CrawlState,
+    SitemapEntry,
+    WebsiteCrawler,
+    ingest_website_source,
+    parse_sitemap,
+)
+
+ARTICLE = """<html><head><title>{title}</title>
+<meta property="article:published_time" content="2024-03-0{day}T10:00:00Z"></head>
+<body><nav><a href="/">Home</a></nav><article><p>Text of {title}.</p></article></body></html>"""
+
+
+class FixtureSite:
+    """Tiny website with robots.txt, a sitemap index and article pages."""
+
+    def __init__(self, with_sitemap: bool = True):
+        self.with_sitemap = with_sitemap
+        self.down = False
+        self.posts_down = False
+        self.posts_lastmod = None
+        self.articles = {f"/news/story-{day}": day for day in (1, 2, 3)}
+        self.requests: list[str] = []
+        self.app = web.Application()
+        self.app.router.add_get("/{path:.*}", self.handle)
+
+    def sitemap(self) -> str:
+        urls = "".join(
+            f"<url><loc>{self.base}{path}</loc><lastmod>2024-03-0{day}</lastmod></url>"
+            for path, day in self.articles.items()
+        )
+        return f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>'
+
+    async def handle(self, request: web.Request) -> web.Response:
+        path = request.path
+        self.requests.append(path)
+
+        if self.down:
+            return web.Response(status=503)
+
+        if path == "/robots.txt" and self.with_sitemap:
+            return web.Response(text=f"User-agent: *\nDisallow: /private\nSitemap: {self.base}/index.xml\n")
+        if path == "/index.xml" and self.with_sitemap:
+            lastmod = f"<lastmod>{self.posts_lastmod}</lastmod>" if self.posts_lastmod else ""
+            body = (
+                '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                f"<sitemap><loc>{self.base}/posts.xml</loc>{lastmod}</sitemap></sitemapindex>"
+            )
+            return web.Response(body=body, content_type="application/xml")
+        if path == "/posts.xml" and self.posts_down:
+            return web.Response(status=503)
+        if path == "/posts.xml" and self.with_sitemap:
+            body = self.sitemap()
+            etag = f'"{len(self.articles)}"'
+            if request.headers.get("If-None-Match") == etag:
+                return web.Response(status=304, headers={"ETag": etag})
+            return web.Response(body=body, content_type="application/xml", headers={"ETag": etag})
+        if path == "/" and not self.with_sitemap:
+            links = "".join(f'<a href="{path}">x</a>' for path in self.articles)
+            body = f'<html><body><a href="/about">About</a><a href="/tag/x">Tag</a>{links}</body></html>'
+            return web.Response(text=body, content_type="text/html")
+        if path in self.articles:
+            day = self.articles[path]
+            return web.Response(text=ARTICLE.format(title=f"Story {day}", day=day), content_type="text/html")
+        return web.Response(status=404)
+
+
+async def crawl(site: FixtureSite, state: CrawlState, max_pages: int = 2) -> list[dict]:
+    async with ClientSession() as session:
+        crawler = WebsiteCrawler(
+            site.base + "/",
+            state,
+            session=session,
+            concurrency=2,
+            max_pages=max_pages,
+            max_page_bytes=1024 * 1024,
+            max_sitemaps=5,
+            seen_limit=100,
+            rediscover_seconds=3600,
+            sitemap_limit=10,
+        )
+        return await crawler.crawl()
+
+
+@asynccontextmanager
+async def serve(site: FixtureSite):
+    server = TestServer(site.app)
+    await server.start_server()
+    site.base = str(server.make_url("")).rstrip("/")
+    try:
+        yield site
+    finally:
+        await server.close()
+
+
+def test_parse_sitemap_index():
+    """Sitemap index is recognized and entries keep their lastmod."""
+    body = (
+        b'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        b"<sitemap><loc>https://example.com/a.xml</loc><lastmod>2024-01-01</lastmod></sitemap>"
+        b"</sitemapindex>"
+    )
+    is_index, entries = parse_sitemap(body)
+    assert is_index
+    assert entries[0].loc == "https://example.com/a.xml"
+    assert entries[0].lastmod == "2024-01-01"
+
+
+@pytest.mark.asyncio
+async def test_sitemap_crawl_is_incremental():
+    """First crawl takes the newest pages, later crawls fetch only new URLs."""
+    async with serve(FixtureSite()) as site:
+        state = CrawlState()
+        rows = await crawl(site, state)
+
+        assert [row["external_id"] for row in rows] == [
+            f"{site.base}/news/story-3",
+            f"{site.base}/news/story-2",
+        ]
+        assert rows[0]["text"].startswith("Story 3\n\nText of Story 3.")
+        assert rows[0]["published_at_source"].day == 3
+        assert state.sitemaps == [f"{site.base}/index.xml"]
+
+        # Unchanged sitemap answers 304 and no article is fetched
+        state = CrawlState.from_json(state.to_json())
+        site.requests.clear()
+        assert await crawl(site, state) == []
+        assert site.requests == ["/index.xml", "/posts.xml"]
+
+        # Only the newly published article is downloaded
+        site.articles["/news/story-4"] = 4
+        site.requests.clear()
+        rows = await crawl(site, state)
+        assert [row["external_id"] for row in rows] == [f"{site.base}/news/story-4"]
+        assert "/news/story-1" not in site.requests
+
+
+@pytest.mark.asyncio
+async def test_failed_child_sitemap_is_retried():
+    """A child sitemap that failed is read again although its lastmod is unchanged."""
+    site = FixtureSite()
+    site.posts_lastmod = "2024-03-03"
+    site.posts_down = True
+
+    async with serve(site):
+        state = CrawlState()
+        assert await crawl(site, state) == []
+        assert state.sitemap_lastmod == {}
+
+        site.posts_down = False
+        rows = await crawl(site, state)
+        assert len(rows) == 2
+        assert state.sitemap_lastmod == {f"{site.base}/posts.xml": "2024-03-03"}
+
+
+@pytest.mark.asyncio
+async def test_index_page_fallback():
+    """Without sitemaps, article-like links of the index page are crawled."""
+    state = CrawlState()
+    async with serve(FixtureSite(with_sitemap=False)) as index_site:
+        rows = await crawl(index_site, state, max_pages=10)
+
+    assert state.sitemaps == []
+    assert sorted(row["external_id"] for row in rows) == [
+        f"{index_site.base}/news/story-{day}" for day in (1, 2, 3)
+    ]
+    assert "/about" not in index_site.requests
+
+
+@pytest.mark.asyncio
+async def test_unreachable_site_raises():
+    """A site whose listings cannot be read is reported as unavailable."""
+    site = FixtureSite(with_sitemap=False)
+    site.down = True
+
+    async with serve(site):
+        with pytest.raises(SourceUnavailableError):
+            await crawl(site, CrawlState())
+
+
+def test_crawl_state_forgets_oldest_sitemaps():
+    """Child sitemaps and validators are capped; forgotten sitemaps stay unchanged."""
+    state = CrawlState()
+    for day in range(1, 6):
+        state.sitemap_lastmod[f"https://example.com/{day}.xml"] = f"2024-01-0{day}"
+        state.set_validators(f"https://example.com/{day}.xml", f'"{day}"', None)
+    state.set_validators("https://example.com/index.xml", '"i"', None)
+    state.set_validators("https://example.com/1.xml", '"1"', None)  # Unchanged, stays oldest
+
+    state.prune(3, keep=["https://example.com/index.xml"])
+
+    assert list(state.sitemap_lastmod) == [f"https://example.com/{day}.xml" for day in (3, 4, 5)]
+    assert list(state.validators) == [
+        "https://example.com/4.xml", "https://example.com/5.xml", "https://example.com/index.xml",
+    ]
+    assert not state.sitemap_changed(SitemapEntry("https://example.com/2.xml", "2024-01-02"))
+    assert state.sitemap_changed(SitemapEntry("https://example.com/2.xml", "2024-01-06"))
+    assert state.sitemap_changed(SitemapEntry("https://example.com/3.xml", "2024-01-04"))
+
+    restored = CrawlState.from_json(state.to_json())
+    assert restored.sitemap_lastmod_floor == state.sitemap_lastmod_floor
+
+
+class StateRepo:
+    def __init__(self):
+        self.updates: list[dict] = []
+
+    async def bulk_create_raw_messages(self, owner_user_id, source_id, rows):
+        return list(range(len(rows)))
+
+    async def update_source(self, source_id, owner_user_id, touch=True, **values):
+        self.updates.append(values)
+        for key, value in values.items():
+            setattr(self.source, key, value)
+
+
+@pytest.mark.asyncio
+async def test_unchanged_crawl_state_is_not_rewritten(settings, monkeypatch):
+    """A tick that changes nothing writes only the check time."""
+    settings.website_max_pages_per_tick = 10
+    repo = StateRepo()
+
+    async with serve(FixtureSite()) as site, ClientSession() as session:
+        monkeypatch.setattr(website_ingestor, "get_http_session", lambda: session)
+        repo.source = source = SimpleNamespace(
+            id=1, owner_user_id=1, url=site.base + "/", crawl_state=None
+        )
+
+        assert await ingest_website_source(source, repo) == 3
+        assert "crawl_state" in repo.updates[-1]
+
+        assert await ingest_website_source(source, repo) == 0
+        assert set(repo.updates[-1]) == {"last_checked_at"}
+
+        site.articles["/news/story-4"] = 4
+        assert await ingest_website_source(source, repo) == 1
+        assert "crawl_state" in repo.updates[-1]
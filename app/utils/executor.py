@@ -0,0 +1,144 @@
+"""Shared executor for CPU-bound work.
+
+Feed parsing, HTML extraction, language detection and hashing of large texts
+are submitted here instead of running on the event loop, so a large feed no
+longer freezes the admin bot, Telethon or the publisher. The module also
+measures event-loop lag and executor queue wait to make blocking visible.
+"""
+
+import asyncio
+import functools
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, TypeVar
+
+from loguru import logger
+
+from app.config import get_settings
+
+T = TypeVar("T")
+
+
+@dataclass
+class ExecutorMetrics:
+    """Counters of executor usage and event-loop responsiveness."""
+
+    tasks: int = 0
+    queue_wait_total: float = 0.0
+    queue_wait_max: float = 0.0
+    run_time_total: float = 0.0
+    run_time_max: float = 0.0
+    loop_lag_samples: int = 0
+    loop_lag_total: float = 0.0
+    loop_lag_max: float = 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        tasks = self.tasks or 1
+        samples = self.loop_lag_samples or 1
+        return {
+            "tasks": self.tasks,
+            "queue_wait_avg_ms": round(self.queue_wait_total / tasks * 1000, 2),
+            "queue_wait_max_ms": round(self.queue_wait_max * 1000, 2),
+            "run_time_avg_ms": round(self.run_time_total / tasks * 1000, 2),
+            "run_time_max_ms": round(self.run_time_max * 1000, 2),
+            "loop_lag_avg_ms": round(self.loop_lag_total / samples * 1000, 2),
+            "loop_lag_max_ms": round(self.loop_lag_max * 1000, 2),
+        }
+
+
+# Global executor, metrics and lag monitor
+_cpu_executor: Optional[Executor] = None
+_metrics = ExecutorMetrics()
+_lag_monitor_task: Optional[asyncio.Task] = None
+
+
+def _timed_call(func: Callable[..., T], args: tuple, kwargs: dict) -> tuple[float, float, T]:
+    """Run func in the worker and report its start and end wall-clock time.
+
+    Module-level so it can be pickled for a process pool.
+    """
+    started = time.time()
+    result = func(*args, **kwargs)
+    return started, time.time(), result
+
+
+def get_cpu_executor() -> Executor:
+    """Get or create the shared CPU executor."""
+    global _cpu_executor
+    if _cpu_executor is None:
+        settings = get_settings()
+        workers = settings.cpu_executor_workers or None
+        if settings.cpu_executor_kind == "process":
+            _cpu_executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            _cpu_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cpu")
+        logger.info(
+            f"CPU executor started ({settings.cpu_executor_kind}, "
+            f"workers={workers or 'auto'})"
+        )
+    return _cpu_executor
+
+
+async def run_cpu(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a CPU-bound callable on the shared executor.
+
+    With a process pool, `func`, its arguments and its result must be picklable.
+    """
+    loop = asyncio.get_running_loop()
+    submitted = time.time()
+    started, finished, result = await loop.run_in_executor(
+        get_cpu_executor(), functools.partial(_timed_call, func, args, kwargs)
+    )
+
+    queue_wait = max(0.0, started - submitted)
+    run_time = finished - started
+    _metrics.tasks += 1
+    _metrics.queue_wait_total += queue_wait
+    _metrics.queue_wait_max = max(_metrics.queue_wait_max, queue_wait)
+    _metrics.run_time_total += run_time
+    _metrics.run_time_max = max(_metrics.run_time_max, run_time)
+    return result
+
+
+async def _monitor_loop_lag(interval: float):
+    """Measure how late the event loop wakes up from a fixed sleep."""
+    settings = get_settings()
+    warn_threshold = settings.loop_lag_warn_ms / 1000
+    loop = asyncio.get_running_loop()
+
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - expected)
+
+        _metrics.loop_lag_samples += 1
+        _metrics.loop_lag_total += lag
+        _metrics.loop_lag_max = max(_metrics.loop_lag_max, lag)
+
+        if lag >= warn_threshold:
+            logger.warning(f"Event loop was blocked for {lag * 1000:.0f} ms")
+
+
+def start_loop_lag_monitor(interval: float = 0.5):
+    """Start background event-loop lag monitor (idempotent)."""
+    global _lag_monitor_task
+    if _lag_monitor_task is None or _lag_monitor_task.done():
+        _lag_monitor_task = asyncio.create_task(_monitor_loop_lag(interval))
+
+
+def get_executor_metrics() -> dict[str, float]:
+    """Get executor and event-loop lag metrics."""
+    return _metrics.as_dict()
+
+
+def shutdown_cpu_executor():
+    """Stop lag monitor and shut down the executor."""
+    global _cpu_executor, _lag_monitor_task
+    if _lag_monitor_task is not None:
+        _lag_monitor_task.cancel()
+        _lag_monitor_task = None
+    if _cpu_executor is not None:
+        logger.info(f"Shutting down CPU executor: {get_executor_metrics()}")
+        _cpu_executor.shutdown(wait=False, cancel_futures=True)
+        _cpu_executor = None
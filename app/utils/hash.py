@@ -3,6 +3,8 @@
 import hashlib
 from typing import Optional
 
+from app.utils.text import canonicalize_text
+
 
 def compute_content_hash(text: Optional[str], media_urls: Optional[str] = None) -> str:
     """Compute hash of content for deduplication."""
@@ -10,7 +12,24 @@ def compute_content_hash(text: Optional[str], media_urls: Optional[str] = None)
     return hashlib.sha256(content.encode('utf-8')).hexdigest()
 
 
+def compute_content_fingerprint(text: Optional[str]) -> Optional[str]:
+    """Compute hash of canonical text for cross-source deduplication.
+
+    Unlike `compute_content_hash`, copies of a post with other links, emoji,
+    hashtags, signatures or formatting get the same fingerprint. Texts
+    without words (media-only posts) have no fingerprint.
+    """
+    canonical = canonicalize_text(text)
+    if not canonical:
+        return None
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
 def compute_text_hash(text: str) -> str:
     """Compute hash of text only."""
     return hashlib.sha256(text.encode('utf-8')).hexdigest()
 
+
+def compute_bytes_hash(data: bytes) -> str:
+    """Compute hash of raw bytes (e.g. a fetched feed body)."""
+    return hashlib.sha256(data).hexdigest()
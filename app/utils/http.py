@@ -0,0 +1,190 @@
+"""Process-wide pooled HTTP clients.
+
+One `aiohttp.ClientSession` is shared by all feed and website fetches, so
+connections, DNS lookups and TLS sessions are reused across requests. LLM API
+calls get a session with a connector of their own: they all go to one host,
+and the per-host limit that keeps crawling polite would throttle them.
+"""
+
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Optional
+
+import aiohttp
+from loguru import logger
+
+from app.config import get_settings
+
+try:  # aiohttp decodes brotli only when a brotli package is installed
+    import brotli  # noqa: F401
+
+    HAS_BROTLI = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+
+        HAS_BROTLI = True
+    except ImportError:
+        HAS_BROTLI = False
+
+
+USER_AGENT = "news-relay-bot/0.1 (+https://github.com/estatyq2-dev/posttelegrambot)"
+
+
+@dataclass
+class HttpPoolMetrics:
+    """Counters collected through aiohttp tracing."""
+
+    requests: int = 0
+    connections_created: int = 0
+    connections_reused: int = 0
+    dns_cache_hits: int = 0
+    dns_cache_misses: int = 0
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Share of requests served over an already open connection."""
+        total = self.connections_created + self.connections_reused
+        return self.connections_reused / total if total else 0.0
+
+
+# Global sessions and metrics (shared by both pools)
+_http_session: Optional[aiohttp.ClientSession] = None
+_llm_session: Optional[aiohttp.ClientSession] = None
+_metrics = HttpPoolMetrics()
+
+
+def _build_trace_config() -> aiohttp.TraceConfig:
+    """Create trace config that feeds pool metrics."""
+    trace_config = aiohttp.TraceConfig()
+
+    async def on_request_start(session, ctx: SimpleNamespace, params):
+        _metrics.requests += 1
+
+    async def on_connection_create_end(session, ctx: SimpleNamespace, params):
+        _metrics.connections_created += 1
+
+    async def on_connection_reuseconn(session, ctx: SimpleNamespace, params):
+        _metrics.connections_reused += 1
+
+    async def on_dns_cache_hit(session, ctx: SimpleNamespace, params):
+        _metrics.dns_cache_hits += 1
+
+    async def on_dns_cache_miss(session, ctx: SimpleNamespace, params):
+        _metrics.dns_cache_misses += 1
+
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+    trace_config.on_dns_cache_hit.append(on_dns_cache_hit)
+    trace_config.on_dns_cache_miss.append(on_dns_cache_miss)
+    return trace_config
+
+
+def _create_session(limit: int, limit_per_host: int) -> aiohttp.ClientSession:
+    """Create pooled session from settings."""
+    settings = get_settings()
+
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        use_dns_cache=True,
+        ttl_dns_cache=settings.http_dns_cache_ttl_seconds,
+        keepalive_timeout=settings.http_keepalive_timeout_seconds,
+        enable_cleanup_closed=True,
+    )
+
+    accept_encoding = "gzip, deflate, br" if HAS_BROTLI else "gzip, deflate"
+
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(
+            total=settings.http_default_timeout_seconds,
+            sock_connect=15,
+        ),
+        headers={"User-Agent": USER_AGENT, "Accept-Encoding": accept_encoding},
+        auto_decompress=True,
+        trace_configs=[_build_trace_config()],
+    )
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Get or create the shared HTTP session for feeds and websites.
+
+    Must be called from a running event loop. Callers must not close it.
+    """
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        settings = get_settings()
+        _http_session = _create_session(
+            settings.http_pool_limit, settings.http_pool_limit_per_host
+        )
+    return _http_session
+
+
+def get_llm_http_session() -> aiohttp.ClientSession:
+    """Get or create the HTTP session for LLM API calls.
+
+    Must be called from a running event loop. Callers must not close it.
+    """
+    global _llm_session
+    if _llm_session is None or _llm_session.closed:
+        limit = get_settings().llm_http_pool_limit
+        _llm_session = _create_session(limit, limit)
+    return _llm_session
+
+
+async def start_http_client():
+    """Create shared HTTP session at startup."""
+    get_http_session()
+    logger.info(
+        f"HTTP client started (brotli {'enabled' if HAS_BROTLI else 'unavailable'})"
+    )
+
+
+async def close_http_client():
+    """Close HTTP sessions and their connection pools."""
+    global _http_session, _llm_session
+    sessions = [s for s in (_http_session, _llm_session) if s is not None and not s.closed]
+    if sessions:
+        logger.info(f"Closing HTTP client: {get_http_pool_stats()}")
+    for session in sessions:
+        await session.close()
+    _http_session = None
+    _llm_session = None
+
+
+def _pool_sizes(session: Optional[aiohttp.ClientSession]) -> Optional[tuple[int, int]]:
+    """Get (open, idle) connection counts of a session's pool.
+
+    aiohttp does not expose pool sizes publicly, so this reads connector
+    internals; None means an aiohttp version without them.
+    """
+    if session is None or session.closed:
+        return 0, 0
+    acquired = getattr(session.connector, "_acquired", None)
+    conns = getattr(session.connector, "_conns", None)
+    if acquired is None or not isinstance(conns, dict):
+        return None
+    idle = sum(len(pooled) for pooled in conns.values())
+    return len(acquired) + idle, idle
+
+
+def get_http_pool_stats() -> dict[str, Any]:
+    """Get connection pool metrics.
+
+    Open/idle counts are None when aiohttp internals are not available.
+    """
+    stats: dict[str, Any] = {
+        "requests": _metrics.requests,
+        "connections_created": _metrics.connections_created,
+        "connections_reused": _metrics.connections_reused,
+        "reuse_ratio": round(_metrics.reuse_ratio, 3),
+        "dns_cache_hits": _metrics.dns_cache_hits,
+        "dns_cache_misses": _metrics.dns_cache_misses,
+    }
+    for prefix, session in (("", _http_session), ("llm_", _llm_session)):
+        sizes = _pool_sizes(session)
+        stats[f"{prefix}open_connections"] = sizes[0] if sizes else None
+        stats[f"{prefix}idle_connections"] = sizes[1] if sizes else None
+    return stats
@@ -1,21 +1,88 @@
 """Text processing utilities."""
 
 import re
+import unicodedata
 from typing import Optional
 
+_URL_RE = re.compile(r"(?:https?://|www\.|(?:t|telegram)\.me/)\S+", re.IGNORECASE)
+_TAG_RE = re.compile(r"[@#]\w+")
+_NON_WORD_RE = re.compile(r"[\W_]+")
+
+# Lines that sources append to every post ("Subscribe: @channel", "Source: ...")
+_SIGNATURE_RE = re.compile(
+    r"^\W*(?:підпис\w*|підпиш\w*|джерело|читайте|надіслати новину|"
+    r"subscribe\w*|source|follow us|подпис\w*|источник)\b",
+    re.IGNORECASE,
+)
+# Signature lines are looked for among the last lines only
+SIGNATURE_TAIL_LINES = 3
+SIGNATURE_MAX_CHARS = 100
+
+# Non-printable characters met in real texts: C0/C1 controls, soft hyphen,
+# zero-width and bidi marks, word joiners and the byte order mark. A regex
+# beats `str.translate` here: a translate table is looked up per character
+# in Python, about 3x slower on 4 KiB texts (scripts/bench_normalize.py corpus)
+_COMMON_NON_PRINTABLE_RE = re.compile(
+    "[\x00-\x1f\x7f-\x9f\xad\u200b-\u200f\u202a-\u202e\u2060-\u206f\ufeff]+"
+)
+
 
 def clean_text(text: str) -> str:
-    """Clean and normalize text."""
+    """Clean and normalize text.
+
+    Every run of whitespace (newlines included) becomes a single space and
+    control and other non-printable characters are removed. `split`/`join`
+    fold whitespace and `isprintable` checks the result, both in C; only
+    texts that contain non-printable characters take further passes.
+    """
     if not text:
         return ""
     
-    # Remove excessive whitespace
-    text = re.sub(r'\s+', ' ', text)
-    
-    # Remove control characters
-    text = ''.join(char for char in text if char.isprintable() or char in '\n\r\t')
-    
-    return text.strip()
+    text = " ".join(text.split())
+    if not text.isprintable():
+        text = _COMMON_NON_PRINTABLE_RE.sub("", text)
+        if not text.isprintable():
+            # Private use or unassigned code points
+            text = "".join(char for char in text if char.isprintable())
+        text = " ".join(text.split())
+    return text
+
+
+def _is_signature_line(line: str) -> bool:
+    """Whether a line is a link, a mention or a source signature."""
+    if len(line) > SIGNATURE_MAX_CHARS:
+        return False
+    if _SIGNATURE_RE.match(line):
+        return True
+    # Nothing but links, mentions, hashtags and emoji
+    rest = _TAG_RE.sub(" ", _URL_RE.sub(" ", line))
+    return not _NON_WORD_RE.sub("", rest)
+
+
+def canonicalize_text(text: Optional[str]) -> str:
+    """Reduce text to the words that identify its content.
+
+    Trailing signature lines, links, mentions, hashtags, emoji and
+    punctuation are removed, Unicode is folded (NFKD without combining marks)
+    and case-folded, and words are joined by single spaces. Copies of a post
+    that differ only in these details get the same canonical text.
+    """
+    if not text:
+        return ""
+
+    lines = [line.strip() for line in text.strip().splitlines()]
+    for _ in range(SIGNATURE_TAIL_LINES):
+        while lines and not lines[-1]:
+            lines.pop()
+        if lines and _is_signature_line(lines[-1]):
+            lines.pop()
+        else:
+            break
+
+    text = _TAG_RE.sub(" ", _URL_RE.sub(" ", "\n".join(lines)))
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char)).casefold()
+    return _NON_WORD_RE.sub(" ", text).strip()
 
 
 def truncate_text(text: str, max_length: int = 100, suffix: str = "...") -> str:
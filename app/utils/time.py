@@ -1,6 +1,8 @@
 """Time utilities."""
 
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 from typing import Optional
 
 import pytz
@@ -42,6 +44,26 @@ def format_datetime(dt: Optional[datetime], fmt: str = "%Y-%m-%d %H:%M") -> str:
     return dt_local.strftime(fmt)
 
 
+def parse_feed_date(value: Optional[str]) -> Optional[time.struct_time]:
+    """Parse RFC 822 or RFC 3339 date (feeds, sitemaps) into a UTC struct_time."""
+    if not value:
+        return None
+    value = value.strip()
+
+    dt: Optional[datetime] = None
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).timetuple()
+
+
 def parse_interval(text: str) -> Optional[int]:
     """Parse interval text to minutes (e.g., '1h', '30m', '2h30m')."""
     text = text.lower().strip()
@@ -0,0 +1,147 @@
+"""Adaptive polling intervals.
+
+Each source's posting rate is learned from the publish times of its recent
+messages as an exponentially weighted moving average (EWMA) of the gaps
+between consecutive posts. Sources are polled a few times per expected gap,
+so busy sources are checked often, and the interval grows with the current
+silence, so sources that went quiet (e.g. at night) are left alone until
+they are likely to post again. The result is clamped to configured bounds,
+widened to include the source's own interval, and sources without enough
+history keep their configured interval.
+"""
+
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from loguru import logger
+
+from app.config import get_settings
+from app.db.models import Source
+from app.db.repo import Repository
+from app.worker.source_scheduler import get_source_scheduler, to_epoch
+
+
+@dataclass
+class PublishRate:
+    """Learned posting rate of a source."""
+
+    gap_seconds: float  # EWMA of inter-arrival time
+    last_published: float  # Epoch seconds of the newest post
+    samples: int  # Number of gaps the estimate is based on
+
+
+def estimate_publish_rate(
+    published: Iterable[Optional[datetime]], alpha: float = 0.3, min_samples: int = 3
+) -> Optional[PublishRate]:
+    """Estimate the posting rate from message publish times.
+
+    Gaps are folded oldest to newest, so recent behaviour weighs the most.
+    Messages published in the same second (albums, batches) count as one post.
+
+    Returns:
+        Rate estimate, or None with fewer than `min_samples` gaps
+    """
+    times = sorted({epoch for epoch in (to_epoch(dt) for dt in published) if epoch is not None})
+    if len(times) < min_samples + 1:
+        return None
+
+    gap = times[1] - times[0]
+    for previous, current in zip(times[1:], times[2:]):
+        gap = alpha * (current - previous) + (1 - alpha) * gap
+
+    return PublishRate(gap_seconds=gap, last_published=times[-1], samples=len(times) - 1)
+
+
+def choose_poll_interval(
+    rate: Optional[PublishRate],
+    now: float,
+    default_seconds: float,
+    min_seconds: float,
+    max_seconds: float,
+    polls_per_gap: float = 2.0,
+) -> float:
+    """Pick the delay until the next check of a source.
+
+    Args:
+        rate: Learned posting rate (None: not enough history)
+        now: Current time (epoch seconds)
+        default_seconds: The source's configured interval, used without history
+        min_seconds: Lower bound for busy sources
+        max_seconds: Upper bound for quiet sources
+        polls_per_gap: How many checks fit into one expected gap
+
+    Returns:
+        `default_seconds` without history, otherwise an interval within
+        [min(min_seconds, default_seconds), max(max_seconds, default_seconds)]
+    """
+    if rate is None:
+        return default_seconds
+
+    interval = rate.gap_seconds / polls_per_gap
+    # Silence longer than the usual gap: back off in proportion to it
+    silence = max(0.0, now - rate.last_published)
+    if silence > rate.gap_seconds:
+        interval = max(interval, silence / polls_per_gap)
+
+    # The adaptive bounds never override the source's own interval
+    lower = min(min_seconds, default_seconds)
+    upper = max(max_seconds, default_seconds)
+    return min(max(interval, lower), upper)
+
+
+async def update_poll_interval(source: Source, repo: Repository, new_count: int) -> Optional[float]:
+    """Re-learn the posting rate of a source after ingestion and reschedule it.
+
+    Publish times are only re-read when new messages arrived (or the source
+    was never evaluated); otherwise the stored estimate is reused and only
+    the silence since the last post changes the interval. The chosen interval
+    is stored on the source and applied to the ingestion scheduler.
+
+    Returns:
+        Chosen interval in seconds, or None when adaptive polling is disabled
+    """
+    settings = get_settings()
+    if not settings.adaptive_polling_enabled:
+        return None
+
+    if new_count > 0 or source.poll_interval_seconds is None:
+        published = await repo.get_recent_publish_times(
+            source.id, source.owner_user_id, limit=settings.adaptive_poll_history
+        )
+        rate = estimate_publish_rate(published, alpha=settings.adaptive_poll_alpha)
+    elif source.publish_gap_seconds and source.last_published_at:
+        rate = PublishRate(
+            gap_seconds=source.publish_gap_seconds,
+            last_published=to_epoch(source.last_published_at),
+            samples=0,
+        )
+    else:
+        rate = None
+
+    interval = choose_poll_interval(
+        rate,
+        now=time.time(),
+        default_seconds=source.check_interval_minutes * 60,
+        min_seconds=settings.adaptive_poll_min_minutes * 60,
+        max_seconds=settings.adaptive_poll_max_minutes * 60,
+        polls_per_gap=settings.adaptive_polls_per_gap,
+    )
+
+    changes = {
+        "publish_gap_seconds": round(rate.gap_seconds) if rate else None,
+        "last_published_at": (
+            datetime.fromtimestamp(rate.last_published, tz=timezone.utc) if rate else None
+        ),
+        "poll_interval_seconds": round(interval),
+    }
+    if any(getattr(source, key) != value for key, value in changes.items()):
+        await repo.update_source(source.id, source.owner_user_id, touch=False, **changes)
+
+    get_source_scheduler().set_interval(source.id, interval)
+    logger.debug(
+        f"Source {source.id} poll interval {interval / 60:.1f} min"
+        + (f" (gap {rate.gap_seconds / 60:.1f} min)" if rate else " (no history)")
+    )
+    return interval
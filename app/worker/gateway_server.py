@@ -0,0 +1,144 @@
+"""Telegram gateway server.
+
+Runs inside the worker, which owns the Telethon sessions, and answers
+requests of other processes on a local Unix socket (protocol in
+`app.connectors.telegram_gateway`). Every request goes through the account
+pool and its request schedulers, so calls made on behalf of other processes
+share the same rate limits and FloodWait handling as ingestion.
+"""
+
+import asyncio
+import json
+import os
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+from loguru import logger
+from telethon.errors import FloodWaitError
+from telethon.tl.types import Channel
+
+from app.config import get_settings
+from app.connectors import SourceUnavailableError
+from app.connectors.telegram_gateway import (
+    ERROR_FLOOD_WAIT,
+    ERROR_INTERNAL,
+    ERROR_UNAVAILABLE,
+    MAX_LINE_BYTES,
+    encode_message,
+)
+from app.connectors.telegram_pool import get_account_pool
+from app.connectors.telegram_requests import RequestKind
+
+Method = Callable[..., Awaitable[Any]]
+
+
+async def resolve_channel(handle: str) -> dict:
+    """Resolve a channel handle."""
+    account = get_account_pool().account_for(handle)
+    try:
+        entity = await account.requests.call(RequestKind.RESOLVE, account.client.get_entity, handle)
+    except ValueError as e:
+        raise SourceUnavailableError(f"@{handle} not found") from e
+    if not isinstance(entity, Channel):
+        raise SourceUnavailableError(f"@{handle} is not a channel")
+    return {"telegram_id": entity.id, "title": entity.title, "username": entity.username}
+
+
+class TelegramGatewayServer:
+    """Unix socket server dispatching requests to gateway methods."""
+
+    def __init__(self, socket_path: Path):
+        """Initialize server with the default methods."""
+        self.socket_path = socket_path
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._methods: dict[str, Method] = {
+            "resolve": resolve_channel,
+            "stats": self._stats,
+        }
+
+    def register(self, name: str, method: Method):
+        """Expose an additional method."""
+        self._methods[name] = method
+
+    async def _stats(self) -> dict:
+        return get_account_pool().stats()
+
+    async def start(self):
+        """Listen on the socket, replacing a stale one left by a crash."""
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+        self._server = await asyncio.start_unix_server(
+            self._handle_connection, path=str(self.socket_path), limit=MAX_LINE_BYTES
+        )
+        os.chmod(self.socket_path, 0o660)
+        logger.info(f"Telegram gateway listening on {self.socket_path}")
+
+    async def stop(self):
+        """Stop listening and remove the socket."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    # The rest of an oversized request is still unread and the
+                    # stream cannot be resynchronized: answer and hang up
+                    writer.write(encode_message({"error": {
+                        "kind": ERROR_INTERNAL,
+                        "message": f"Request exceeds {MAX_LINE_BYTES} bytes",
+                    }}))
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                response = await self.dispatch(line)
+                writer.write(encode_message(response))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, line: bytes) -> dict:
+        """Run one request and build its response."""
+        try:
+            request = json.loads(line)
+            method = self._methods.get(request.get("method"))
+            if method is None:
+                raise SourceUnavailableError(f"Unknown gateway method {request.get('method')!r}")
+            return {"result": await method(**(request.get("params") or {}))}
+        except FloodWaitError as e:
+            return {"error": {"kind": ERROR_FLOOD_WAIT, "message": str(e), "seconds": e.seconds}}
+        except SourceUnavailableError as e:
+            return {"error": {"kind": ERROR_UNAVAILABLE, "message": str(e)}}
+        except Exception as e:
+            logger.error(f"Telegram gateway request failed: {e}", exc_info=True)
+            return {"error": {"kind": ERROR_INTERNAL, "message": str(e) or e.__class__.__name__}}
+
+
+# Global server instance
+_gateway_server: Optional[TelegramGatewayServer] = None
+
+
+async def start_gateway_server():
+    """Start the gateway on the configured socket."""
+    global _gateway_server
+    if _gateway_server is None:
+        _gateway_server = TelegramGatewayServer(get_settings().tg_gateway_socket_path)
+        await _gateway_server.start()
+
+
+async def stop_gateway_server():
+    """Stop the gateway."""
+    global _gateway_server
+    if _gateway_server is not None:
+        await _gateway_server.stop()
+        _gateway_server = None
@@ -0,0 +1,194 @@
+"""Bounded-parallel ingestion engine.
+
+Fans a batch of sources out over separate concurrency limits for RSS/website
+and Telegram sources. Every source is ingested by `ingest_source_task`, which
+opens its own short-lived database session, so one slow feed never holds a
+connection (or the whole cycle) hostage.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Iterable, Optional
+
+from loguru import logger
+
+from app.config import get_settings
+from app.connectors import AccountsUnavailableError, SourceUnavailableError
+from app.db.models import SourceType
+
+
+@dataclass(frozen=True)
+class SourceRef:
+    """Lightweight reference to a source scheduled for ingestion."""
+
+    source_id: int
+    owner_user_id: int
+    source_type: SourceType
+
+
+@dataclass
+class SourceIngestResult:
+    """Outcome of ingesting a single source."""
+
+    source_id: int
+    source_type: SourceType
+    new_count: int = 0
+    elapsed: float = 0.0
+    queue_wait: float = 0.0
+    timed_out: bool = False
+    error: Optional[str] = None
+    deferred: bool = False  # Not read for reasons outside the source (no free account)
+
+    @property
+    def ok(self) -> bool:
+        """Whether the source was ingested without timeout or error."""
+        return not self.timed_out and self.error is None and not self.deferred
+
+
+@dataclass
+class IngestCycleStats:
+    """Aggregated metrics for one ingestion cycle."""
+
+    started_at: float = field(default_factory=time.monotonic)
+    wall_time: float = 0.0
+    results: list[SourceIngestResult] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return len(self.results)
+
+    @property
+    def new_messages(self) -> int:
+        return sum(r.new_count for r in self.results)
+
+    @property
+    def timeouts(self) -> int:
+        return sum(1 for r in self.results if r.timed_out)
+
+    @property
+    def errors(self) -> int:
+        return sum(1 for r in self.results if r.error is not None)
+
+    @property
+    def deferred(self) -> int:
+        return sum(1 for r in self.results if r.deferred)
+
+    def latency_percentile(self, pct: float) -> float:
+        """Get per-source latency percentile (0-100) in seconds."""
+        latencies = sorted(r.elapsed for r in self.results)
+        if not latencies:
+            return 0.0
+        index = min(len(latencies) - 1, int(round(pct / 100 * (len(latencies) - 1))))
+        return latencies[index]
+
+    def slowest(self, n: int = 5) -> list[SourceIngestResult]:
+        """Get the N slowest sources of the cycle."""
+        return sorted(self.results, key=lambda r: r.elapsed, reverse=True)[:n]
+
+    def summary(self) -> str:
+        """Human-readable one-line summary for logs."""
+        return (
+            f"{self.total} sources in {self.wall_time:.1f}s, "
+            f"{self.new_messages} new messages, "
+            f"{self.timeouts} timeouts, {self.errors} errors, {self.deferred} deferred, "
+            f"latency p50={self.latency_percentile(50):.2f}s "
+            f"p95={self.latency_percentile(95):.2f}s "
+            f"max={self.latency_percentile(100):.2f}s"
+        )
+
+
+IngestFunc = Callable[[int, int], Awaitable[Optional[int]]]
+
+
+class IngestionEngine:
+    """Run source ingestion with per-type concurrency limits and timeouts."""
+
+    def __init__(
+        self,
+        ingest_func: IngestFunc,
+        rss_concurrency: Optional[int] = None,
+        telegram_concurrency: Optional[int] = None,
+        source_timeout: Optional[float] = None,
+    ):
+        """Initialize engine.
+
+        Args:
+            ingest_func: Coroutine ingesting one source by (source_id, owner_user_id)
+            rss_concurrency: Parallel limit for RSS and website sources
+            telegram_concurrency: Parallel limit for Telegram sources
+            source_timeout: Time limit in seconds for a single source
+        """
+        if not (rss_concurrency and telegram_concurrency and source_timeout):
+            settings = get_settings()
+            rss_concurrency = rss_concurrency or settings.ingest_rss_concurrency
+            telegram_concurrency = telegram_concurrency or settings.ingest_telegram_concurrency
+            source_timeout = source_timeout or settings.ingest_source_timeout_seconds
+        self.ingest_func = ingest_func
+        self.rss_concurrency = max(1, rss_concurrency)
+        self.telegram_concurrency = max(1, telegram_concurrency)
+        self.source_timeout = source_timeout
+
+    def _limit_for(self, source_type: SourceType) -> int:
+        if source_type == SourceType.TELEGRAM:
+            return self.telegram_concurrency
+        return self.rss_concurrency
+
+    async def _run_one(
+        self, ref: SourceRef, semaphore: asyncio.Semaphore
+    ) -> SourceIngestResult:
+        result = SourceIngestResult(source_id=ref.source_id, source_type=ref.source_type)
+        enqueued = time.monotonic()
+
+        async with semaphore:
+            started = time.monotonic()
+            result.queue_wait = started - enqueued
+            try:
+                new_count = await asyncio.wait_for(
+                    self.ingest_func(ref.source_id, ref.owner_user_id),
+                    timeout=self.source_timeout,
+                )
+                result.new_count = new_count or 0
+            except asyncio.TimeoutError:
+                result.timed_out = True
+                logger.warning(
+                    f"Ingestion of source {ref.source_id} timed out "
+                    f"after {self.source_timeout:.0f}s"
+                )
+            except AccountsUnavailableError as e:
+                result.deferred = True
+                logger.warning(f"Source {ref.source_id} deferred: {e}")
+            except SourceUnavailableError as e:
+                result.error = str(e)
+                logger.warning(f"Source {ref.source_id} unavailable: {e}")
+            except Exception as e:
+                result.error = str(e) or e.__class__.__name__
+                logger.error(f"Error ingesting source {ref.source_id}: {e}", exc_info=True)
+            finally:
+                result.elapsed = time.monotonic() - started
+
+        logger.debug(
+            f"Source {ref.source_id} ({ref.source_type.value}) ingested in "
+            f"{result.elapsed:.2f}s (waited {result.queue_wait:.2f}s), "
+            f"{result.new_count} new"
+        )
+        return result
+
+    async def run(self, sources: Iterable[SourceRef]) -> IngestCycleStats:
+        """Ingest all given sources and return cycle metrics."""
+        stats = IngestCycleStats()
+        semaphores: dict[SourceType, asyncio.Semaphore] = {}
+        tasks = []
+
+        for ref in sources:
+            # RSS and website sources share the HTTP limit
+            key = SourceType.TELEGRAM if ref.source_type == SourceType.TELEGRAM else SourceType.RSS
+            if key not in semaphores:
+                semaphores[key] = asyncio.Semaphore(self._limit_for(key))
+            tasks.append(asyncio.create_task(self._run_one(ref, semaphores[key])))
+
+        if tasks:
+            stats.results = list(await asyncio.gather(*tasks))
+
+        stats.wall_time = time.monotonic() - stats.started_at
+        return stats
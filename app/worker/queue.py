@@ -12,9 +12,21 @@ from apscheduler.triggers.interval import IntervalTrigger
 from loguru import logger
 
 from app.config import get_settings
-from app.connectors.telegram_ingestor import start_telethon_client, stop_telethon_client
+from app.connectors.telegram_pool import get_account_pool_stats
+from app.connectors.telegram_ingestor import (
+    refresh_push_sources,
+    start_push_ingestion,
+    start_telethon_client,
+    stop_push_ingestion,
+    stop_telethon_client,
+)
 from app.logging_conf import setup_logging
-from app.worker.tasks_ingest import ingest_all_sources_task
+from app.processing.dedup import close_content_hash_filter
+from app.utils.executor import get_executor_metrics, shutdown_cpu_executor, start_loop_lag_monitor
+from app.utils.http import close_http_client, get_http_pool_stats, start_http_client
+from app.worker.gateway_server import start_gateway_server, stop_gateway_server
+from app.worker.tasks_backfill import run_backfill_jobs_task
+from app.worker.tasks_ingest import ingest_due_sources_task, sync_source_scheduler
 from app.worker.tasks_rewrite import rewrite_all_pending_task
 
 
@@ -34,23 +46,61 @@ async def init_worker():
     """Initialize worker with periodic tasks."""
     logger.info("Initializing background worker...")
     
+    # Start shared HTTP client and event-loop lag monitor
+    await start_http_client()
+    start_loop_lag_monitor()
+    
+    settings = get_settings()
+    
     # Start Telethon client
     try:
         await start_telethon_client()
     except Exception as e:
         logger.error(f"Failed to start Telethon client: {e}", exc_info=True)
     
+    # Serve Telegram requests of other processes (the worker owns the sessions)
+    if settings.tg_gateway_enabled:
+        try:
+            await start_gateway_server()
+        except Exception as e:
+            logger.error(f"Failed to start Telegram gateway: {e}", exc_info=True)
+    
+    # Subscribe to joined source channels (polling stays as fallback)
+    if settings.tg_push_enabled:
+        try:
+            await start_push_ingestion()
+        except Exception as e:
+            logger.error(f"Failed to start Telegram push ingestion: {e}", exc_info=True)
+    
     scheduler = get_worker_scheduler()
     
-    # Schedule periodic ingestion (every 10 minutes)
+    # Build due-time schedule of sources from the database
+    try:
+        await sync_source_scheduler(full=True)
+    except Exception as e:
+        logger.error(f"Failed to build source schedule: {e}", exc_info=True)
+    
+    # Schedule ingestion of due sources (honors Source.check_interval_minutes)
     scheduler.add_job(
-        ingest_all_sources_task,
-        trigger=IntervalTrigger(minutes=10),
-        id="ingest_all_sources",
-        name="Ingest all sources",
+        ingest_due_sources_task,
+        trigger=IntervalTrigger(seconds=settings.ingest_tick_seconds),
+        id="ingest_due_sources",
+        name="Ingest due sources",
         replace_existing=True,
+        max_instances=1,  # Never let cycles overlap
+        coalesce=True,
     )
     
+    # Pick up newly joined/added channels for push ingestion
+    if settings.tg_push_enabled:
+        scheduler.add_job(
+            refresh_push_sources,
+            trigger=IntervalTrigger(minutes=settings.tg_push_refresh_minutes),
+            id="refresh_push_sources",
+            name="Refresh push-ingested Telegram sources",
+            replace_existing=True,
+        )
+    
     # Schedule periodic rewriting (every 2 minutes)
     scheduler.add_job(
         rewrite_all_pending_task,
@@ -60,6 +110,17 @@ async def init_worker():
         replace_existing=True,
     )
     
+    # Advance historical backfill jobs one batch run at a time
+    scheduler.add_job(
+        run_backfill_jobs_task,
+        trigger=IntervalTrigger(minutes=1),
+        id="run_backfill_jobs",
+        name="Run historical backfill jobs",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+    )
+    
     # Start scheduler
     if not scheduler.running:
         scheduler.start()
@@ -80,10 +141,24 @@ async def shutdown_worker():
     
     # Stop Telethon client
     try:
+        await stop_gateway_server()
+        await stop_push_ingestion()
         await stop_telethon_client()
     except Exception as e:
         logger.error(f"Error stopping Telethon client: {e}")
     
+    # Close shared HTTP client
+    try:
+        await close_http_client()
+    except Exception as e:
+        logger.error(f"Error closing HTTP client: {e}")
+    
+    # Persist the duplicate index
+    close_content_hash_filter()
+    
+    # Shut down CPU executor
+    shutdown_cpu_executor()
+    
     logger.info("Background worker shut down")
 
 
@@ -98,6 +173,9 @@ async def run_worker():
         # Keep running
         while True:
             await asyncio.sleep(60)
+            logger.debug(f"HTTP pool: {get_http_pool_stats()}")
+            logger.debug(f"CPU executor: {get_executor_metrics()}")
+            logger.debug(f"Telegram accounts: {get_account_pool_stats()}")
             
     except KeyboardInterrupt:
         logger.info("Received shutdown signal")
@@ -0,0 +1,137 @@
+"""Failure tracking and circuit breaking for sources.
+
+Every failed or timed-out ingestion increments the source's consecutive
+failure counter and pushes its next check out with exponential backoff
+(interval * 2^(failures - 1), capped). After `source_circuit_open_failures`
+failures the circuit is reported open; after `source_quarantine_failures`
+the source is deactivated and its owner is notified through the bot. The
+first successful ingestion closes the circuit again. Deferred sources (no
+Telegram account was free to read them) count as neither.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from loguru import logger
+from sqlalchemy import select, update
+
+from app.adminbot.notify import notify_user
+from app.config import get_settings
+from app.db.base import get_session
+from app.db.models import CircuitState, Source, User
+from app.worker.ingest_engine import SourceIngestResult
+
+# Longest error text stored on the source
+MAX_ERROR_LENGTH = 500
+
+
+def backoff_delay(failures: int, base_seconds: float, max_seconds: float) -> float:
+    """Delay until the next attempt after `failures` consecutive failures."""
+    if failures <= 0:
+        return base_seconds
+    return min(base_seconds * 2 ** (failures - 1), max_seconds)
+
+
+def _failure_reason(result: SourceIngestResult, timeout: Optional[float]) -> str:
+    if result.timed_out:
+        return f"Timed out after {timeout:.0f}s" if timeout else "Timed out"
+    return (result.error or "Unknown error")[:MAX_ERROR_LENGTH]
+
+
+async def record_ingest_outcomes(
+    results: Iterable[SourceIngestResult],
+    base_intervals: dict[int, float],
+    timeout: Optional[float] = None,
+) -> dict[int, Optional[float]]:
+    """Update failure state of ingested sources.
+
+    Args:
+        results: Per-source outcomes of an ingestion cycle
+        base_intervals: Normal check interval (seconds) per source ID
+        timeout: Per-source time limit, for the error message of timeouts
+
+    Returns:
+        Retry delay in seconds for each failed source (None if quarantined)
+    """
+    settings = get_settings()
+    results = list(results)
+    healthy_ids = [result.source_id for result in results if result.ok]
+    failed = [result for result in results if not result.ok and not result.deferred]
+    delays: dict[int, Optional[float]] = {}
+    quarantined: list[tuple[int, str, int, str]] = []
+    now = datetime.now(timezone.utc)
+
+    async with get_session() as session:
+        if healthy_ids:
+            # One statement closes the circuit of every recovered source
+            await session.execute(
+                update(Source)
+                .where(Source.id.in_(healthy_ids), Source.failure_count > 0)
+                .values(
+                    failure_count=0,
+                    circuit_state=CircuitState.CLOSED,
+                    next_retry_at=None,
+                    updated_at=Source.updated_at,
+                )
+            )
+
+        for result in failed:
+            source = await session.get(Source, result.source_id)
+            if source is None:
+                continue
+
+            reason = _failure_reason(result, timeout)
+            # Applied to the scheduler by the caller, so not a user edit
+            source.updated_at = Source.updated_at
+            source.failure_count += 1
+            source.last_error = reason
+            source.last_failure_at = now
+
+            if source.failure_count >= settings.source_quarantine_failures:
+                source.circuit_state = CircuitState.QUARANTINED
+                source.is_active = False
+                source.next_retry_at = None
+                delays[source.id] = None
+                name = source.title or source.handle or source.url or str(source.id)
+                quarantined.append((source.owner_user_id, name, source.failure_count, reason))
+                logger.warning(
+                    f"Source {source.id} quarantined after {source.failure_count} "
+                    f"failures: {reason}"
+                )
+                continue
+
+            delay = backoff_delay(
+                source.failure_count,
+                base_intervals.get(source.id, source.check_interval_minutes * 60),
+                settings.source_backoff_max_minutes * 60,
+            )
+            if source.failure_count >= settings.source_circuit_open_failures:
+                source.circuit_state = CircuitState.OPEN
+            source.next_retry_at = now + timedelta(seconds=delay)
+            delays[source.id] = delay
+            logger.info(
+                f"Source {source.id} failed {source.failure_count}x "
+                f"({source.circuit_state.value}), retry in {delay / 60:.0f} min: {reason}"
+            )
+
+        owner_ids = {owner_user_id for owner_user_id, *_ in quarantined}
+        owners = {}
+        if owner_ids:
+            rows = await session.execute(
+                select(User.id, User.telegram_id).where(User.id.in_(owner_ids))
+            )
+            owners = {row.id: row.telegram_id for row in rows}
+
+    # Notify after commit so a failed delivery never rolls back the state
+    for owner_user_id, name, failures, reason in quarantined:
+        telegram_id = owners.get(owner_user_id)
+        if telegram_id is None:
+            continue
+        await notify_user(
+            telegram_id,
+            f"⚠️ Джерело «{name}» вимкнено після {failures} невдалих перевірок поспіль.\n\n"
+            f"Остання помилка: {reason}\n\n"
+            f"Коли проблему буде виправлено, увімкніть джерело знову в меню «Джерела».",
+        )
+
+    return delays
@@ -0,0 +1,206 @@
+"""Due-time scheduler for source ingestion.
+
+Keeps active sources in a min-heap keyed by the timestamp at which each source
+is next due, so a tick only touches sources whose `check_interval_minutes`
+(or adaptive `poll_interval_seconds`) has elapsed instead of scanning the
+whole table.
+"""
+
+import heapq
+import itertools
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from loguru import logger
+
+from app.db.models import SourceType
+from app.worker.ingest_engine import SourceRef
+
+
+def to_epoch(dt: Optional[datetime]) -> Optional[float]:
+    """Convert (possibly naive UTC) datetime to epoch seconds."""
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+@dataclass
+class ScheduledSource:
+    """Scheduling state of one source."""
+
+    ref: SourceRef
+    interval_seconds: float
+    next_due: float
+
+
+class SourceScheduler:
+    """Min-heap of sources ordered by next due time.
+
+    Stale heap items are discarded lazily: an item is valid only while it
+    matches the `next_due` stored in the entry for its source.
+    """
+
+    def __init__(self):
+        """Initialize empty scheduler."""
+        self._heap: list[tuple[float, int, int]] = []
+        self._entries: dict[int, ScheduledSource] = {}
+        self._in_flight: set[int] = set()
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, source_id: int) -> bool:
+        return source_id in self._entries
+
+    def _push(self, entry: ScheduledSource):
+        heapq.heappush(self._heap, (entry.next_due, next(self._counter), entry.ref.source_id))
+
+    def clear(self):
+        """Remove all sources."""
+        self._heap.clear()
+        self._entries.clear()
+
+    def upsert(
+        self,
+        source_id: int,
+        owner_user_id: int,
+        source_type: SourceType,
+        check_interval_minutes: int,
+        last_checked_at: Optional[datetime] = None,
+        now: Optional[float] = None,
+        interval_seconds: Optional[float] = None,
+        retry_at: Optional[datetime] = None,
+    ):
+        """Add a source or update its interval.
+
+        The next due time is `last_checked_at + interval`; sources that were
+        never checked are due immediately. `interval_seconds` (the adaptive
+        interval) takes precedence over `check_interval_minutes`, and a
+        failing source is never due before its backoff `retry_at`.
+        """
+        now = time.time() if now is None else now
+        if interval_seconds:
+            interval = max(60.0, float(interval_seconds))
+        else:
+            interval = max(1, check_interval_minutes) * 60.0
+        last_checked = to_epoch(last_checked_at)
+        next_due = now if last_checked is None else min(last_checked + interval, now + interval)
+        retry = to_epoch(retry_at)
+        if retry is not None:
+            next_due = max(next_due, retry)
+
+        ref = SourceRef(source_id=source_id, owner_user_id=owner_user_id, source_type=source_type)
+        entry = self._entries.get(source_id)
+
+        if source_id in self._in_flight:
+            # Rescheduled by complete(); only remember the new settings
+            if entry is not None:
+                entry.ref = ref
+                entry.interval_seconds = interval
+            else:
+                self._entries[source_id] = ScheduledSource(ref, interval, next_due)
+            return
+
+        if entry is not None and entry.next_due == next_due and entry.interval_seconds == interval:
+            entry.ref = ref
+            return
+
+        entry = ScheduledSource(ref=ref, interval_seconds=interval, next_due=next_due)
+        self._entries[source_id] = entry
+        self._push(entry)
+
+    def set_interval(self, source_id: int, interval_seconds: float):
+        """Change the interval used when the source is next completed."""
+        entry = self._entries.get(source_id)
+        if entry is not None:
+            entry.interval_seconds = max(60.0, interval_seconds)
+
+    def remove(self, source_id: int):
+        """Remove a source (heap item is discarded lazily)."""
+        self._entries.pop(source_id, None)
+
+    def pop_due(self, now: Optional[float] = None, limit: Optional[int] = None) -> list[SourceRef]:
+        """Pop all sources due at `now` and mark them in flight."""
+        now = time.time() if now is None else now
+        due: list[SourceRef] = []
+
+        while self._heap and self._heap[0][0] <= now:
+            if limit is not None and len(due) >= limit:
+                break
+            next_due, _, source_id = heapq.heappop(self._heap)
+            entry = self._entries.get(source_id)
+            if entry is None or entry.next_due != next_due or source_id in self._in_flight:
+                continue  # Stale item
+            self._in_flight.add(source_id)
+            due.append(entry.ref)
+
+        return due
+
+    def complete(self, source_id: int, now: Optional[float] = None, delay: Optional[float] = None):
+        """Reschedule a source after ingestion.
+
+        Args:
+            source_id: Ingested source
+            now: Completion time (epoch seconds)
+            delay: Override for the delay until next check (defaults to interval)
+        """
+        now = time.time() if now is None else now
+        self._in_flight.discard(source_id)
+        entry = self._entries.get(source_id)
+        if entry is None:
+            return
+        entry.next_due = now + (entry.interval_seconds if delay is None else delay)
+        self._push(entry)
+
+    def next_due_at(self) -> Optional[float]:
+        """Get the earliest due time among scheduled sources."""
+        while self._heap:
+            next_due, _, source_id = self._heap[0]
+            entry = self._entries.get(source_id)
+            if entry is not None and entry.next_due == next_due:
+                return next_due
+            heapq.heappop(self._heap)
+        return None
+
+    def get(self, source_id: int) -> Optional[ScheduledSource]:
+        """Get scheduling state of a source."""
+        return self._entries.get(source_id)
+
+    def rebuild(self, rows: Iterable, now: Optional[float] = None):
+        """Rebuild scheduler from DB rows.
+
+        Each row must expose id, owner_user_id, source_type,
+        check_interval_minutes and last_checked_at, and may expose
+        poll_interval_seconds and next_retry_at.
+        """
+        now = time.time() if now is None else now
+        self.clear()
+        for row in rows:
+            self.upsert(
+                source_id=row.id,
+                owner_user_id=row.owner_user_id,
+                source_type=row.source_type,
+                check_interval_minutes=row.check_interval_minutes,
+                last_checked_at=row.last_checked_at,
+                now=now,
+                interval_seconds=getattr(row, "poll_interval_seconds", None),
+                retry_at=getattr(row, "next_retry_at", None),
+            )
+        logger.info(f"Source scheduler rebuilt with {len(self._entries)} sources")
+
+
+# Global scheduler instance
+_source_scheduler: Optional[SourceScheduler] = None
+
+
+def get_source_scheduler() -> SourceScheduler:
+    """Get or create global source scheduler."""
+    global _source_scheduler
+    if _source_scheduler is None:
+        _source_scheduler = SourceScheduler()
+    return _source_scheduler
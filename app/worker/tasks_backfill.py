@@ -0,0 +1,318 @@
+"""Historical backfill tasks.
+
+A backfill job pages through the history of one source in large batches and
+stores it as archive rows (`RawMessage.is_archive`), which are kept for
+reference and deduplication but never enter the rewrite queue. The job's
+cursor is committed after every batch, so a job interrupted by a restart,
+a time budget or a FloodWait resumes where it stopped.
+
+Telegram history is read backwards from the live watermark; RSS archives are
+followed through RFC 5005 / paged-feed links or WordPress `?paged=N` pages.
+
+Usage:
+    python -m app.worker.tasks_backfill SOURCE_ID [--max-items N]
+
+The command runs RSS jobs in place and queues Telegram jobs for the worker.
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from loguru import logger
+from telethon.errors import FloodWaitError
+
+from app.config import get_settings
+from app.connectors import SourceUnavailableError
+from app.connectors.rss_ingestor import (
+    build_entry_rows,
+    fetch_rss_feed,
+    is_probed_feed_page,
+    next_feed_page,
+)
+from app.connectors.telegram_ingestor import (
+    album_to_row,
+    fetch_history_page,
+    group_albums,
+    has_text,
+    hold_back_partial_album,
+    ingest_telegram_source,
+    resolve_source_peer,
+    start_telethon_client,
+)
+from app.connectors.telegram_pool import get_account_pool
+from app.db.base import get_session
+from app.db.models import BackfillJob, BackfillStatus, Source, SourceType
+from app.db.repo import Repository
+from app.media.telegram_download import get_media_downloader
+from app.utils.executor import run_cpu
+
+# Longest error text stored on the job
+MAX_ERROR_LENGTH = 500
+
+# Backfill is paused until this time when every account is rate-limited (epoch seconds)
+_paused_until: float = 0.0
+
+
+async def _backfill_telegram_batch(job: BackfillJob, source: Source, repo: Repository) -> bool:
+    """Store one batch of older Telegram messages.
+
+    Returns:
+        True when the beginning of the channel was reached
+    """
+    settings = get_settings()
+    if not source.handle:
+        raise SourceUnavailableError(f"Telegram source {source.id} has no handle")
+    pool = get_account_pool()
+    account = pool.account_for(source.handle)
+    if not account.client.is_connected():
+        await start_telethon_client()
+
+    if job.cursor is None:
+        if source.last_message_id is None:
+            # Establish the live watermark first, so recent posts still go
+            # through regular ingestion and the rewrite queue
+            await ingest_telegram_source(source, repo, force=True)
+        if source.last_message_id is None:
+            return True  # Empty channel
+        job.cursor = str(source.last_message_id + 1)
+
+    limit = min(settings.backfill_batch_size, job.max_items - job.items_ingested)
+    try:
+        peer = await resolve_source_peer(account, source, repo)
+        messages = await fetch_history_page(
+            account.client,
+            peer,
+            offset_id=int(job.cursor),
+            limit=limit,
+            wait_time=settings.backfill_request_delay_seconds,
+        )
+    except FloodWaitError as e:
+        pool.mark_limited(account, e.seconds)
+        raise
+    account.messages += len(messages)
+    if not messages:
+        return True
+
+    exhausted = len(messages) < limit
+    if not exhausted:
+        # The oldest album may continue on the next page; fetch it whole there
+        messages, _ = hold_back_partial_album(messages)
+
+    groups = [group for group in group_albums(messages) if has_text(group)]
+
+    media_paths: dict[int, Optional[str]] = {}
+    if settings.backfill_download_media:
+        media_storage = settings.media_storage_dir
+        media_storage.mkdir(parents=True, exist_ok=True)
+        media_paths = await get_media_downloader().download_many(
+            (message for group in groups for message in group), media_storage
+        )
+
+    rows = []
+    for group in groups:
+        row = album_to_row(group, media_paths)
+        row["is_archive"] = True
+        rows.append(row)
+
+    inserted_ids = await repo.bulk_create_raw_messages(
+        owner_user_id=source.owner_user_id,
+        source_id=source.id,
+        rows=rows,
+    )
+    job.items_ingested += len(inserted_ids)
+    job.pages_fetched += 1
+    job.cursor = str(min(message.id for message in messages))
+
+    # A short page means there is nothing older
+    return exhausted
+
+
+async def _backfill_rss_page(job: BackfillJob, source: Source, repo: Repository) -> bool:
+    """Store entries of the next older feed archive page.
+
+    Returns:
+        True when there are no older pages
+    """
+    if not source.url:
+        raise SourceUnavailableError(f"RSS source {source.id} has no URL")
+
+    if job.cursor is None:
+        # The live feed itself belongs to regular ingestion; only find its archive
+        fetched = await fetch_rss_feed(source.url)
+        if fetched is None or fetched.feed is None:
+            raise SourceUnavailableError(f"Failed to fetch RSS feed {source.url}")
+        job.pages_fetched += 1
+        job.cursor = next_feed_page(fetched.feed, source.url)
+        return job.cursor is None
+
+    page_url = job.cursor
+    fetched = await fetch_rss_feed(page_url)
+    if fetched is None or fetched.feed is None:
+        if is_probed_feed_page(page_url):
+            return True  # Past the last WordPress page
+        raise SourceUnavailableError(f"Failed to fetch feed archive page {page_url}")
+
+    entries = list(fetched.feed.entries)[: job.max_items - job.items_ingested]
+    if not entries:
+        return True
+
+    rows = await run_cpu(build_entry_rows, entries, set())
+    for row in rows:
+        row["is_archive"] = True
+
+    inserted_ids = await repo.bulk_create_raw_messages(
+        owner_user_id=source.owner_user_id,
+        source_id=source.id,
+        rows=rows,
+    )
+    job.items_ingested += len(inserted_ids)
+    job.pages_fetched += 1
+
+    if is_probed_feed_page(page_url) and not inserted_ids:
+        return True  # Server ignores ?paged and keeps serving the same entries
+
+    job.cursor = next_feed_page(fetched.feed, page_url)
+    return job.cursor is None
+
+
+def _finish(job: BackfillJob, status: BackfillStatus, error: Optional[str] = None):
+    job.status = status
+    job.error = error[:MAX_ERROR_LENGTH] if error else None
+    job.finished_at = datetime.now(timezone.utc)
+
+
+async def backfill_source_task(job_id: int) -> Optional[BackfillStatus]:
+    """Run a backfill job for up to `backfill_run_budget_seconds`.
+
+    Every batch runs in its own transaction, so the cursor is durable as soon
+    as the batch is stored.
+
+    Returns:
+        Job status after this run (None if the job does not exist)
+    """
+    global _paused_until
+
+    settings = get_settings()
+    deadline = time.monotonic() + settings.backfill_run_budget_seconds
+
+    while True:
+        async with get_session() as session:
+            repo = Repository(session)
+            job = await repo.get_backfill_job(job_id)
+            if job is None:
+                return None
+            if job.status in (BackfillStatus.DONE, BackfillStatus.FAILED):
+                return job.status
+
+            source = await repo.get_source(job.source_id, job.owner_user_id)
+            if source is None:
+                _finish(job, BackfillStatus.FAILED, "Source not found")
+                return job.status
+
+            if job.status == BackfillStatus.PENDING:
+                logger.info(f"Starting backfill job {job.id} for source {source.id}")
+            job.status = BackfillStatus.RUNNING
+
+            try:
+                if source.source_type == SourceType.TELEGRAM:
+                    exhausted = await _backfill_telegram_batch(job, source, repo)
+                elif source.source_type == SourceType.RSS:
+                    exhausted = await _backfill_rss_page(job, source, repo)
+                else:
+                    raise SourceUnavailableError(
+                        f"Backfill is not supported for {source.source_type.value} sources"
+                    )
+            except FloodWaitError as e:
+                # Keep the checkpoint; wait it out unless another account can go on
+                if not get_account_pool().candidates(source.handle or ""):
+                    _paused_until = time.time() + e.seconds
+                logger.warning(f"Backfill job {job.id} hit FloodWait of {e.seconds}s")
+                return job.status
+            except Exception as e:
+                logger.error(f"Backfill job {job.id} failed: {e}", exc_info=True)
+                _finish(job, BackfillStatus.FAILED, str(e) or e.__class__.__name__)
+                return job.status
+
+            if exhausted or job.items_ingested >= job.max_items:
+                _finish(job, BackfillStatus.DONE)
+                logger.info(
+                    f"Backfill job {job.id} done: {job.items_ingested} items "
+                    f"from {job.pages_fetched} pages"
+                )
+                return job.status
+
+            logger.debug(
+                f"Backfill job {job.id}: {job.items_ingested}/{job.max_items} items, "
+                f"cursor {job.cursor}"
+            )
+
+        if time.monotonic() >= deadline:
+            return BackfillStatus.RUNNING  # Resumed on the next run
+
+        await asyncio.sleep(settings.backfill_request_delay_seconds)
+
+
+async def run_backfill_jobs_task():
+    """Task to advance the next unfinished backfill job.
+
+    Scheduled periodically; one job at a time keeps backfill from competing
+    with live ingestion for API quota.
+    """
+    if time.time() < _paused_until:
+        return
+
+    async with get_session() as session:
+        job = await Repository(session).get_next_backfill_job()
+        job_id = job.id if job else None
+
+    if job_id is not None:
+        await backfill_source_task(job_id)
+
+
+async def _run_cli(source_id: int, max_items: Optional[int]):
+    """Create a backfill job for a source and run it to completion.
+
+    Telegram jobs are left to the worker, which owns the Telethon sessions.
+    """
+    settings = get_settings()
+
+    async with get_session() as session:
+        source = await session.get(Source, source_id)
+        if source is None:
+            logger.error(f"Source {source_id} not found")
+            return
+        job = await Repository(session).create_backfill_job(
+            owner_user_id=source.owner_user_id,
+            source_id=source.id,
+            max_items=max_items or settings.backfill_max_items,
+        )
+        job_id = job.id
+        source_type = source.source_type
+
+    if source_type == SourceType.TELEGRAM and settings.tg_gateway_enabled:
+        # Only the worker opens the Telethon sessions; it picks the job up
+        logger.info(f"Backfill job {job_id} queued, the worker will run it")
+        return
+
+    while True:
+        status = await backfill_source_task(job_id)
+        if status != BackfillStatus.RUNNING:
+            break
+        await asyncio.sleep(max(0.0, _paused_until - time.time()))
+
+    logger.info(f"Backfill job {job_id} finished with status {status.value if status else None}")
+
+
+if __name__ == "__main__":
+    from app.logging_conf import setup_logging
+
+    parser = argparse.ArgumentParser(description="Backfill the history of a source")
+    parser.add_argument("source_id", type=int, help="Source ID")
+    parser.add_argument("--max-items", type=int, default=None, help="Maximum items to store")
+    args = parser.parse_args()
+
+    setup_logging()
+    asyncio.run(_run_cli(args.source_id, args.max_items))
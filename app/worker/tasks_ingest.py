@@ -1,89 +1,199 @@
 """Ingestion tasks."""
 
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
 from loguru import logger
+from sqlalchemy import func, select
 
+from app.config import get_settings
 from app.connectors.telegram_ingestor import ingest_telegram_source
 from app.connectors.rss_ingestor import ingest_rss_source
+from app.connectors.website_ingestor import ingest_website_source
 from app.db.base import get_session
 from app.db.models import Source, SourceType
 from app.db.repo import Repository
+from app.worker.adaptive_polling import update_poll_interval
+from app.worker.ingest_engine import IngestionEngine, IngestCycleStats
+from app.worker.source_health import record_ingest_outcomes
+from app.worker.source_scheduler import get_source_scheduler
+
+
+# Columns needed to (re)schedule a source
+_SCHEDULE_COLUMNS = (
+    Source.id,
+    Source.owner_user_id,
+    Source.source_type,
+    Source.check_interval_minutes,
+    Source.last_checked_at,
+    Source.poll_interval_seconds,
+    Source.next_retry_at,
+)
 
+# DB time at which the last successful scheduler sync started
+_last_sync_at: Optional[datetime] = None
+_last_full_sync: float = 0.0
 
-async def ingest_source_task(source_id: int, owner_user_id: int):
+
+async def ingest_source_task(source_id: int, owner_user_id: int) -> int:
     """Task to ingest content from a source.
     
     Args:
         source_id: Source ID to ingest
         owner_user_id: Owner user ID for isolation
+    
+    Returns:
+        Number of new messages ingested
+    
+    Raises:
+        SourceUnavailableError: Source could not be fetched; other errors are
+            propagated as well so the engine records the failure
     """
     logger.info(f"Starting ingestion task for source {source_id}")
     
     async with get_session() as session:
         repo = Repository(session)
         
-        try:
-            # Get source
-            source = await repo.get_source(source_id, owner_user_id)
-            
-            if not source:
-                logger.error(f"Source {source_id} not found for user {owner_user_id}")
-                return
-            
-            if not source.is_active:
-                logger.debug(f"Source {source_id} is inactive, skipping")
-                return
-            
-            # Ingest based on type
-            new_count = 0
-            
-            if source.source_type == SourceType.TELEGRAM:
-                new_count = await ingest_telegram_source(source, repo)
-            elif source.source_type == SourceType.RSS:
-                new_count = await ingest_rss_source(source, repo)
-            elif source.source_type == SourceType.WEBSITE:
-                # Website ingestion not implemented yet
-                logger.warning("Website ingestion not yet implemented")
-            
-            logger.info(
-                f"Ingestion task completed for source {source_id}: {new_count} new messages"
-            )
-            
-        except Exception as e:
-            logger.error(f"Error in ingestion task for source {source_id}: {e}", exc_info=True)
+        # Get source
+        source = await repo.get_source(source_id, owner_user_id)
+        
+        if not source:
+            logger.error(f"Source {source_id} not found for user {owner_user_id}")
+            return 0
+        
+        if not source.is_active:
+            logger.debug(f"Source {source_id} is inactive, skipping")
+            return 0
+        
+        # Ingest based on type
+        new_count = 0
+        
+        if source.source_type == SourceType.TELEGRAM:
+            new_count = await ingest_telegram_source(source, repo)
+        elif source.source_type == SourceType.RSS:
+            new_count = await ingest_rss_source(source, repo)
+        elif source.source_type == SourceType.WEBSITE:
+            new_count = await ingest_website_source(source, repo)
+        
+        await update_poll_interval(source, repo, new_count)
+        
+        logger.info(
+            f"Ingestion task completed for source {source_id}: {new_count} new messages"
+        )
+        return new_count
 
 
-async def ingest_all_sources_task():
-    """Task to ingest all active sources.
+async def sync_source_scheduler(full: bool = False):
+    """Synchronize the due-time scheduler with the database.
     
-    This can be scheduled periodically.
+    A full sync rebuilds the heap from all active sources (also dropping
+    deleted ones). An incremental sync only reads sources updated since the
+    previous sync, so new, edited and deactivated sources are picked up
+    without scanning the whole table. `updated_at` is the start time of the
+    writing transaction, so the window reaches `ingest_sync_overlap_seconds`
+    before the previous sync; re-reading a source is harmless. Ingestion
+    itself does not bump `updated_at` and applies its changes directly.
     """
-    logger.info("Starting ingestion for all active sources")
+    global _last_sync_at, _last_full_sync
+    
+    settings = get_settings()
+    scheduler = get_source_scheduler()
     
     async with get_session() as session:
-        repo = Repository(session)
-        
-        try:
-            # Get all active sources (across all users)
-            from sqlalchemy import select
-            from app.db.models import Source
-            
-            stmt = select(Source).where(Source.is_active == True)
+        synced_at = (await session.execute(select(func.now()))).scalar_one()
+        if full or _last_sync_at is None:
+            stmt = select(*_SCHEDULE_COLUMNS).where(Source.is_active == True)
+            result = await session.execute(stmt)
+            rows = result.all()
+            if not settings.adaptive_polling_enabled:
+                rows = [row._replace(poll_interval_seconds=None) for row in rows]
+            scheduler.rebuild(rows)
+            _last_full_sync = time.monotonic()
+        else:
+            since = _last_sync_at - timedelta(seconds=settings.ingest_sync_overlap_seconds)
+            stmt = select(*_SCHEDULE_COLUMNS, Source.is_active).where(Source.updated_at > since)
             result = await session.execute(stmt)
-            sources = result.scalars().all()
-            
-            logger.info(f"Found {len(sources)} active sources to ingest")
-            
-            for source in sources:
-                try:
-                    await ingest_source_task(source.id, source.owner_user_id)
-                except Exception as e:
-                    logger.error(
-                        f"Error ingesting source {source.id}: {e}",
-                        exc_info=True
+            rows = result.all()
+            for row in rows:
+                if row.is_active:
+                    scheduler.upsert(
+                        source_id=row.id,
+                        owner_user_id=row.owner_user_id,
+                        source_type=row.source_type,
+                        check_interval_minutes=row.check_interval_minutes,
+                        last_checked_at=row.last_checked_at,
+                        interval_seconds=(
+                            row.poll_interval_seconds
+                            if settings.adaptive_polling_enabled else None
+                        ),
+                        retry_at=row.next_retry_at,
                     )
-            
-            logger.info("Completed ingestion for all sources")
-            
-        except Exception as e:
-            logger.error(f"Error in ingest_all_sources_task: {e}", exc_info=True)
+                else:
+                    scheduler.remove(row.id)
+            if rows:
+                logger.debug(f"Source scheduler synced {len(rows)} updated sources")
+    
+    _last_sync_at = synced_at
 
+
+async def ingest_due_sources_task() -> Optional[IngestCycleStats]:
+    """Task to ingest only sources whose check interval has elapsed.
+    
+    This is scheduled every `ingest_tick_seconds` and honors
+    `Source.check_interval_minutes` through the due-time scheduler.
+    
+    Returns:
+        Cycle metrics or None if nothing was due
+    """
+    settings = get_settings()
+    scheduler = get_source_scheduler()
+    
+    try:
+        resync_due = (
+            time.monotonic() - _last_full_sync >= settings.ingest_full_resync_minutes * 60
+        )
+        await sync_source_scheduler(full=resync_due)
+    except Exception as e:
+        logger.error(f"Error syncing source scheduler: {e}", exc_info=True)
+        if len(scheduler) == 0:
+            return None
+    
+    due = scheduler.pop_due()
+    if not due:
+        return None
+    
+    logger.info(f"{len(due)} of {len(scheduler)} sources due for ingestion")
+    
+    engine = IngestionEngine(ingest_source_task)
+    stats: Optional[IngestCycleStats] = None
+    delays: dict[int, Optional[float]] = {}
+    try:
+        stats = await engine.run(due)
+        logger.info(f"Completed ingestion of due sources: {stats.summary()}")
+        for slow in stats.slowest(3):
+            if slow.elapsed >= engine.source_timeout / 2:
+                logger.warning(
+                    f"Slow source {slow.source_id} ({slow.source_type.value}): "
+                    f"{slow.elapsed:.1f}s"
+                )
+        try:
+            delays = await record_ingest_outcomes(
+                stats.results,
+                base_intervals={
+                    ref.source_id: scheduler.get(ref.source_id).interval_seconds
+                    for ref in due if scheduler.get(ref.source_id) is not None
+                },
+                timeout=engine.source_timeout,
+            )
+        except Exception as e:
+            logger.error(f"Error recording source health: {e}", exc_info=True)
+    finally:
+        # Always return popped sources to the heap; failing ones back off
+        finished = time.time()
+        for ref in due:
+            scheduler.complete(ref.source_id, now=finished, delay=delays.get(ref.source_id))
+            if ref.source_id in delays and delays[ref.source_id] is None:
+                scheduler.remove(ref.source_id)  # Quarantined
+    
+    return stats
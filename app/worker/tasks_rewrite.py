@@ -4,11 +4,34 @@ from datetime import datetime
 
 from loguru import logger
 
+from app.config import get_settings
 from app.db.base import get_session
 from app.db.models import PostStatus, RawMessage
 from app.db.repo import Repository
 from app.llm.rewrite import rewrite_post
+from app.processing.dedup import find_duplicate
+from app.processing.lang import detect_language_async, detect_languages_async
 from app.processing.moderation import moderate_content
+from app.processing.near_dup import find_near_duplicate
+from app.publisher.formatter import format_post
+
+
+async def skip_duplicate(raw_message: RawMessage, original_id: int, repo: Repository):
+    """Record a duplicate as skipped posts of its target channels, without rewriting."""
+    bindings = await repo.get_bindings_for_source(raw_message.source_id)
+    for binding in bindings:
+        if not binding.is_active or not binding.channel.is_active:
+            continue
+        await repo.create_post(
+            owner_user_id=raw_message.owner_user_id,
+            channel_id=binding.channel.id,
+            text=raw_message.text or "",
+            raw_message_id=raw_message.id,
+            media_paths=raw_message.media_paths,
+            status=PostStatus.SKIPPED,
+            error_message=f"Duplicate of message {original_id}",
+        )
+    await repo.mark_message_processed(raw_message.id, raw_message.owner_user_id)
 
 
 async def rewrite_message_task(raw_message_id: int, owner_user_id: int):
@@ -35,6 +58,18 @@ async def rewrite_message_task(raw_message_id: int, owner_user_id: int):
                 logger.debug(f"Message {raw_message_id} already processed")
                 return
             
+            if raw_message.is_archive:
+                logger.debug(f"Message {raw_message_id} is backfilled history, not rewriting")
+                return
+            
+            # Copies of recent posts are skipped before any LLM spend
+            original_id = await find_duplicate(raw_message, repo)
+            if original_id is None and get_settings().near_dup_enabled:
+                original_id = await find_near_duplicate(raw_message, repo)
+            if original_id is not None:
+                await skip_duplicate(raw_message, original_id, repo)
+                return
+            
             # Moderate content
             is_ok, reason = moderate_content(raw_message.text or "")
             if not is_ok:
@@ -52,6 +87,11 @@ async def rewrite_message_task(raw_message_id: int, owner_user_id: int):
                 await repo.mark_message_processed(raw_message_id, owner_user_id)
                 return
             
+            source_language = await detect_language_async(
+                raw_message.text or "", raw_message.content_hash
+            )
+            logger.debug(f"Message {raw_message_id} language: {source_language or 'unknown'}")
+            
             # Process for each channel
             for binding in bindings:
                 if not binding.is_active:
@@ -67,6 +107,7 @@ async def rewrite_message_task(raw_message_id: int, owner_user_id: int):
                         raw_text=raw_message.text or "",
                         channel_language=channel.language,
                         channel_style=channel.style_prompt,
+                        source_language=source_language,
                     )
                     
                     if not rewritten:
@@ -84,6 +125,7 @@ async def rewrite_message_task(raw_message_id: int, owner_user_id: int):
                         raw_message_id=raw_message_id,
                         media_paths=raw_message.media_paths,
                         status=PostStatus.READY,
+                        formatted_text=format_post(rewritten),
                     )
                     
                     logger.info(
@@ -125,7 +167,7 @@ async def rewrite_all_pending_task():
             
             stmt = (
                 select(RawMessage)
-                .where(RawMessage.is_processed == False)
+                .where(RawMessage.is_processed == False, RawMessage.is_archive == False)
                 .order_by(RawMessage.created_at.asc())
                 .limit(100)  # Process in batches
             )
@@ -134,6 +176,12 @@ async def rewrite_all_pending_task():
             
             logger.info(f"Found {len(messages)} pending messages to rewrite")
             
+            # Detect languages of the whole batch at once; the tasks hit the cache
+            await detect_languages_async(
+                [message.text or "" for message in messages],
+                [message.content_hash for message in messages],
+            )
+            
             for message in messages:
                 try:
                     await rewrite_message_task(message.id, message.owner_user_id)
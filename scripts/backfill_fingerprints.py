@@ -0,0 +1,74 @@
+"""Fill `raw_messages.content_fingerprint` for rows stored before it existed.
+
+Usage:
+    python scripts/backfill_fingerprints.py [--batch-size N] [--pause SECONDS]
+
+Walks rows without a fingerprint by ID in batches, committing each batch, so
+the script can be interrupted and rerun. Rows without words keep an empty
+fingerprint.
+
+Apply the migrations first (`alembic upgrade head` adds the column and its
+index), then run it before starting an updated worker: the worker builds its
+dedup index from the fingerprints of recent rows the first time it starts.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.db.base import close_db, get_session  # noqa: E402
+from app.db.repo import Repository  # noqa: E402
+from app.utils.hash import compute_content_fingerprint  # noqa: E402
+
+
+async def backfill(batch_size: int, pause: float) -> tuple[int, int]:
+    """Fingerprint all rows; returns (rows scanned, fingerprints stored)."""
+    after_id = scanned = stored = 0
+    started = time.perf_counter()
+
+    while True:
+        async with get_session() as session:
+            repo = Repository(session)
+            rows = await repo.get_raw_message_texts_after(after_id, limit=batch_size)
+            if not rows:
+                break
+            fingerprints = {}
+            for message_id, message_text in rows:
+                fingerprint = compute_content_fingerprint(message_text)
+                if fingerprint:
+                    fingerprints[message_id] = fingerprint
+            await repo.set_content_fingerprints(fingerprints)
+
+        after_id = rows[-1][0]
+        scanned += len(rows)
+        stored += len(fingerprints)
+        rate = scanned / (time.perf_counter() - started)
+        print(f"Up to ID {after_id}: {scanned} rows, {stored} fingerprints ({rate:,.0f} rows/s)")
+        if pause:
+            await asyncio.sleep(pause)
+
+    return scanned, stored
+
+
+async def main_async(args) -> int:
+    try:
+        scanned, stored = await backfill(args.batch_size, args.pause)
+    finally:
+        await close_db()
+    print(f"Done: {stored} of {scanned} rows fingerprinted")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per transaction")
+    parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches")
+    return asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""Benchmark single-pass lxml extraction against the former BeautifulSoup helpers.
+
+Usage:
+    python scripts/bench_html_extract.py FEED [FEED ...] [--repeat N]
+
+FEED is a path to a saved RSS/Atom file or an http(s) URL. Every entry
+summary and content fragment of the feeds is used as the corpus. The baseline
+parses each fragment three times with BeautifulSoup (text, links, images),
+as ingestion did before; the candidate calls `extract_html` once.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+import feedparser
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.connectors.html_clean import extract_html  # noqa: E402
+
+
+def bs4_text(html: str) -> str:
+    soup = BeautifulSoup(html, "lxml")
+    for element in soup(["script", "style", "meta", "link"]):
+        element.decompose()
+    text = soup.get_text(separator="\n")
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return "\n".join(chunk for chunk in chunks if chunk)
+
+
+def bs4_urls(html: str, tag: str, attribute: str) -> list[str]:
+    soup = BeautifulSoup(html, "lxml")
+    urls = []
+    for element in soup.find_all(tag):
+        value = element.get(attribute)
+        if value and value.startswith(("http://", "https://")):
+            urls.append(value)
+    return urls
+
+
+def baseline(html: str) -> tuple[str, list[str], list[str]]:
+    return bs4_text(html), bs4_urls(html, "a", "href"), bs4_urls(html, "img", "src")
+
+
+def candidate(html: str) -> tuple[str, list[str], list[str]]:
+    result = extract_html(html)
+    return result.text, result.links, result.images
+
+
+def load_corpus(feeds: list[str]) -> list[str]:
+    """Collect non-empty HTML fragments from feed files or URLs."""
+    corpus = []
+    for feed_ref in feeds:
+        if feed_ref.startswith(("http://", "https://")):
+            with urllib.request.urlopen(feed_ref, timeout=30) as response:
+                data = response.read()
+        else:
+            data = Path(feed_ref).read_bytes()
+
+        feed = feedparser.parse(data)
+        for entry in feed.entries:
+            if entry.get("summary"):
+                corpus.append(entry.summary)
+            for content in entry.get("content", []):
+                if content.value:
+                    corpus.append(content.value)
+    return corpus
+
+
+def run(func, corpus: list[str], repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for html in corpus:
+            func(html)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("feeds", nargs="+", help="Feed files or URLs")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed rounds per implementation")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.feeds)
+    if not corpus:
+        print("No HTML fragments found in the given feeds")
+        return 1
+
+    total_kb = sum(len(html.encode("utf-8")) for html in corpus) / 1024
+    mismatches = sum(1 for html in corpus if baseline(html) != candidate(html))
+
+    base = run(baseline, corpus, args.repeat)
+    cand = run(candidate, corpus, args.repeat)
+    base_med, cand_med = statistics.median(base), statistics.median(cand)
+
+    print(f"Corpus: {len(corpus)} fragments, {total_kb:.0f} KiB")
+    print(f"bs4 (3 parses):      {base_med * 1000:8.1f} ms/round "
+          f"({base_med / len(corpus) * 1e6:7.1f} us/fragment)")
+    print(f"lxml extract_html:   {cand_med * 1000:8.1f} ms/round "
+          f"({cand_med / len(corpus) * 1e6:7.1f} us/fragment)")
+    print(f"Speedup: {base_med / cand_med:.1f}x, output mismatches: {mismatches}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""Benchmark the n-gram language detector against langdetect.
+
+Usage:
+    python scripts/bench_lang.py CORPUS [--languages uk,ru,en] [--repeat N]
+
+CORPUS is a JSONL file with one `{"text": ..., "lang": ...}` object per line,
+or a plain text file whose blank-line separated paragraphs are used without
+labels. The script reports throughput of both detectors, accuracy against
+the labels (if any) and how often the two detectors agree. langdetect is
+seeded for repeatable results and called per text with all its languages,
+as the former `detect_language` did.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from langdetect import DetectorFactory, LangDetectException, detect
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.processing.lang import NgramLanguageDetector  # noqa: E402
+
+
+def load_corpus(path: Path) -> tuple[list[str], list[str | None]]:
+    content = path.read_text(encoding="utf-8")
+    if path.suffix == ".jsonl":
+        items = [json.loads(line) for line in content.splitlines() if line.strip()]
+        return [item["text"] for item in items], [item.get("lang") for item in items]
+    texts = [p.strip() for p in content.split("\n\n") if p.strip()]
+    return texts, [None] * len(texts)
+
+
+def langdetect_one(text: str) -> str | None:
+    try:
+        return detect(text)
+    except LangDetectException:
+        return None
+
+
+def run(func, repeat: int) -> tuple[list, float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+    return result, statistics.median(timings)
+
+
+def accuracy(predicted: list, labels: list) -> str:
+    labelled = [(p, l) for p, l in zip(predicted, labels) if l]
+    if not labelled:
+        return "n/a"
+    return f"{sum(1 for p, l in labelled if p == l) / len(labelled):.1%}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus", help="JSONL with text/lang or a plain text file")
+    parser.add_argument("--languages", default="uk,ru,en,pl,de,fr,es,it", help="Detector languages")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed rounds per detector")
+    args = parser.parse_args()
+
+    texts, labels = load_corpus(Path(args.corpus))
+    if not texts:
+        print("Empty corpus")
+        return 1
+
+    DetectorFactory.seed = 0
+    started = time.perf_counter()
+    detector = NgramLanguageDetector.from_profiles(args.languages.split(","))
+    load_time = time.perf_counter() - started
+
+    ngram, ngram_time = run(lambda: detector.detect_batch(texts), args.repeat)
+    base, base_time = run(lambda: [langdetect_one(text) for text in texts], args.repeat)
+    agree = sum(1 for a, b in zip(ngram, base) if a == b) / len(texts)
+
+    print(f"Corpus: {len(texts)} texts, profiles loaded in {load_time * 1000:.0f} ms")
+    print(f"langdetect:  {base_time * 1000:8.1f} ms ({base_time / len(texts) * 1e6:7.1f} us/text), "
+          f"accuracy {accuracy(base, labels)}")
+    print(f"n-gram:      {ngram_time * 1000:8.1f} ms ({ngram_time / len(texts) * 1e6:7.1f} us/text), "
+          f"accuracy {accuracy(ngram, labels)}")
+    print(f"Speedup: {base_time / ngram_time:.1f}x, agreement {agree:.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""Measure near-duplicate detection against the exact content hash.
+
+Usage:
+    python scripts/bench_near_dup.py PAIRS.jsonl [--threshold T]
+    python scripts/bench_near_dup.py --synthetic TEXTS.txt [--threshold T]
+
+PAIRS.jsonl holds labelled pairs, one `{"a": ..., "b": ..., "duplicate": bool}`
+per line. With --synthetic, every non-empty paragraph (blank-line separated)
+of TEXTS.txt is paired with a repost of itself (emoji, links, a channel
+signature and changed punctuation added) and with the next paragraph.
+
+For both methods the script reports precision and recall of the duplicate
+label, then the signature throughput of MinHash.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.processing.near_dup import NearDuplicateDetector  # noqa: E402
+from app.utils.hash import compute_content_hash  # noqa: E402
+
+EMOJI = ["🔥", "⚡️", "❗️", "👉", "🇺🇦", "📌"]
+SIGNATURES = [
+    "Підписуйтесь: https://t.me/{channel}",
+    "@{channel}",
+    "Джерело: https://{channel}.com/news/{id}",
+    "👉 {channel} | Надіслати новину",
+]
+
+
+def perturb(text: str, rng: random.Random) -> str:
+    """Make a repost of a text the way channels usually copy each other."""
+    channel = f"channel_{rng.randrange(1000)}"
+    signature = rng.choice(SIGNATURES).format(channel=channel, id=rng.randrange(10**6))
+    body = text.replace(". ", ".\n", rng.randrange(3)).replace(",", " ,", 1)
+    return f"{rng.choice(EMOJI)} {body} {rng.choice(EMOJI)}\n\n{signature}"
+
+
+def load_pairs(path: Path) -> list[tuple[str, str, bool]]:
+    pairs = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                item = json.loads(line)
+                pairs.append((item["a"], item["b"], bool(item["duplicate"])))
+    return pairs
+
+
+def synthetic_pairs(path: Path, seed: int = 1) -> list[tuple[str, str, bool]]:
+    rng = random.Random(seed)
+    texts = [p.strip() for p in path.read_text(encoding="utf-8").split("\n\n") if p.strip()]
+    pairs = []
+    for i, text in enumerate(texts):
+        pairs.append((text, perturb(text, rng), True))
+        if len(texts) > 1:
+            pairs.append((text, texts[(i + 1) % len(texts)], False))
+    return pairs
+
+
+def score(predicted: list[bool], labels: list[bool]) -> tuple[float, float]:
+    true_positive = sum(1 for p, l in zip(predicted, labels) if p and l)
+    precision = true_positive / max(1, sum(predicted))
+    recall = true_positive / max(1, sum(labels))
+    return precision, recall
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus", help="Labelled pairs (JSONL) or a text file with --synthetic")
+    parser.add_argument("--synthetic", action="store_true", help="Generate pairs from paragraphs")
+    parser.add_argument("--threshold", type=float, default=0.8, help="Similarity threshold")
+    parser.add_argument("--num-perm", type=int, default=64, help="MinHash permutations")
+    parser.add_argument("--bands", type=int, default=16, help="LSH bands")
+    args = parser.parse_args()
+
+    path = Path(args.corpus)
+    pairs = synthetic_pairs(path) if args.synthetic else load_pairs(path)
+    if not pairs:
+        print("No pairs in the corpus")
+        return 1
+    labels = [duplicate for _, _, duplicate in pairs]
+
+    exact = [compute_content_hash(a) == compute_content_hash(b) for a, b, _ in pairs]
+
+    detector = NearDuplicateDetector(
+        num_perm=args.num_perm, bands=args.bands, threshold=args.threshold, window_seconds=60
+    )
+    texts = [text for a, b, _ in pairs for text in (a, b)]
+    started = time.perf_counter()
+    signatures = detector.hasher.signatures(texts)
+    elapsed = time.perf_counter() - started
+
+    near = []
+    for owner, (first, second) in enumerate(zip(signatures[::2], signatures[1::2])):
+        if first is None or second is None:
+            near.append(False)
+            continue
+        # One owner per pair keeps pairs independent
+        detector.check_and_add(owner, 1, first, at=0)
+        near.append(detector.check_and_add(owner, 2, second, at=0) is not None)
+
+    print(f"Corpus: {len(pairs)} pairs, {sum(labels)} duplicates")
+    for name, predicted in (("exact hash", exact), ("MinHash LSH", near)):
+        precision, recall = score(predicted, labels)
+        print(f"{name:12} precision {precision:6.1%}  recall {recall:6.1%}")
+    print(f"Signatures: {len(texts) / elapsed:,.0f}/s ({elapsed / len(texts) * 1e6:.0f} us/text)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
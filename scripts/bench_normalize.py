@@ -0,0 +1,110 @@
+"""Benchmark `normalize_text` against the former regex/generator pipeline.
+
+Usage:
+    python scripts/bench_normalize.py [FILE ...] [--size BYTES] [--repeat N]
+
+Texts are cut from the given files (or from a generated Ukrainian news-like
+text with newlines, tabs, non-breaking and zero-width spaces and control
+characters) into chunks of --size bytes (4 KiB by default). The baseline is
+`clean_text` + `normalize_text` as they were before the split/join version:
+a whitespace regex, a per-character `isprintable` generator and two more
+regexes.
+"""
+
+import argparse
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.processing.normalize import normalize_text  # noqa: E402
+
+WORDS = (
+    "уряд затвердив нову програму підтримки малого бізнесу підприємці зможуть "
+    "отримати кредити під відсотків річних Київ Львів новини заява міністр"
+).split()
+NOISE = ["\n", "\n\n\n", "\t", "  ", "\xa0", "​", "\x00", "\r\n", " 🔥 "]
+
+
+def old_clean_text(text: str) -> str:
+    if not text:
+        return ""
+    text = re.sub(r'\s+', ' ', text)
+    text = ''.join(char for char in text if char.isprintable() or char in '\n\r\t')
+    return text.strip()
+
+
+def old_normalize_text(text: str) -> str:
+    if not text:
+        return ""
+    text = old_clean_text(text)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = re.sub(r' {2,}', ' ', text)
+    return text.strip()
+
+
+def generate_text(size: int, seed: int = 1) -> str:
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    while length < size:
+        part = rng.choice(WORDS) + (rng.choice(NOISE) if rng.random() < 0.15 else " ")
+        parts.append(part)
+        length += len(part.encode("utf-8"))
+    return "".join(parts)
+
+
+def chunk(text: str, size: int) -> list[str]:
+    """Split text into pieces of about `size` UTF-8 bytes."""
+    chunks = []
+    data = text.encode("utf-8")
+    for start in range(0, len(data), size):
+        piece = data[start:start + size].decode("utf-8", errors="ignore")
+        if piece.strip():
+            chunks.append(piece)
+    return chunks
+
+
+def run(func, corpus: list[str], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in corpus:
+            func(text)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", help="Text files to use instead of generated text")
+    parser.add_argument("--size", type=int, default=4096, help="Bytes per text")
+    parser.add_argument("--count", type=int, default=500, help="Generated texts")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed rounds per implementation")
+    args = parser.parse_args()
+
+    if args.files:
+        corpus = [c for f in args.files for c in chunk(Path(f).read_text(encoding="utf-8"), args.size)]
+    else:
+        corpus = [generate_text(args.size, seed) for seed in range(args.count)]
+    if not corpus:
+        print("No text in the given files")
+        return 1
+
+    mismatches = sum(1 for text in corpus if old_normalize_text(text) != normalize_text(text))
+    base = run(old_normalize_text, corpus, args.repeat)
+    cand = run(normalize_text, corpus, args.repeat)
+
+    print(f"Corpus: {len(corpus)} texts of ~{args.size} bytes")
+    print(f"regex + generator:  {base / len(corpus) * 1e6:8.1f} us/text")
+    print(f"split/join:         {cand / len(corpus) * 1e6:8.1f} us/text")
+    print(f"Speedup: {base / cand:.1f}x, output mismatches: {mismatches}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())